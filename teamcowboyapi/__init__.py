@@ -1,9 +1,23 @@
-from .tc_api import Teamcowboy
-from .tc_dataadapter import TCDataAdapter, TCResult
-from .exceptions import TheTeamCowboyAPIException
+from .exceptions import (TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException,
+                            TheTeamCowboyAPICircuitOpenException)
 
-from .tc_helpers import createrequestdata
+from .tc_helpers import createrequestdata, lazyattributes
 
-from .objects.events.event import Event
-from .objects.attendances.attendancelist import Attendancelist
-from .objects.users.user import User
\ No newline at end of file
+# Imported on first use, so importing the package does not load requests or the models
+_ATTRIBUTES = {
+    'Teamcowboy': '.tc_api',
+    'TCDataAdapter': '.tc_dataadapter',
+    'TCResult': '.tc_dataadapter',
+    'Deadline': '.tc_deadline',
+    'TCCache': '.tc_cache',
+    'CircuitBreaker': '.tc_circuitbreaker',
+    'HedgePolicy': '.tc_hedge',
+    'RateLimiter': '.tc_ratelimit',
+    'Event': '.objects.events.event',
+    'Attendancelist': '.objects.attendances.attendancelist',
+    'User': '.objects.users.user',
+}
+
+__all__ = [*_ATTRIBUTES, 'TheTeamCowboyAPIException', 'TheTeamCowboyAPIDeadlineException',
+            'TheTeamCowboyAPICircuitOpenException', 'createrequestdata']
+__getattr__, __dir__ = lazyattributes(__name__, _ATTRIBUTES)
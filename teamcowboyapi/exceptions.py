@@ -1,2 +1,22 @@
 class TheTeamCowboyAPIException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class TheTeamCowboyAPIDeadlineException(TheTeamCowboyAPIException):
+    """
+    Raised when a deadline runs out before all of the work under it finished.
+
+    Attributes
+    ----------
+    partial : dict
+        Results that completed before the deadline, keyed by their position
+        in the submitted work.
+    """
+    def __init__(self, message: str, partial: dict = None):
+        super().__init__(message)
+        self.partial = partial if partial is not None else {}
+
+class TheTeamCowboyAPICircuitOpenException(TheTeamCowboyAPIException):
+    """
+    Raised when the circuit breaker is open and no cached result is available.
+    """
+    pass
@@ -1 +1,10 @@
-from .attendancelist import Attendancelist
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Attendancelist': '.attendancelist',
+    'Usersattendancelist': '.attendancelist',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
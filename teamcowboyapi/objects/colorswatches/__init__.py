@@ -1 +1,9 @@
-from .colorswatch import Colorswatch
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Colorswatch': '.colorswatch',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
@@ -1,3 +1,11 @@
-from .event import Event
-from .rsvpinstance import Rsvpinstance
-from . saversvpresponce import Saversvpresponse
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Event': '.event',
+    'Rsvpinstance': '.rsvpinstance',
+    'Saversvpresponse': '.saversvpresponce',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
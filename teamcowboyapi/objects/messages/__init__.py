@@ -1,3 +1,11 @@
-from .message import Message
-from .messagecomment import Messagecomment
-from .postedby import Postedby
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Message': '.message',
+    'Messagecomment': '.messagecomment',
+    'Postedby': '.postedby',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
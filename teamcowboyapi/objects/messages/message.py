@@ -98,4 +98,4 @@ class Message:
         self.team = Simplemessageteam(**self.team)
         self.postedBy = Postedby(**self.postedBy)
         self.userMetaInfo = Usermetainfo(**self.userMetaInfo)
-        self.comments = Messagecomment(**self.comments) if self.comments else None
\ No newline at end of file
+        self.comments = [Messagecomment(**comment) for comment in self.comments] if self.comments is not None else None
\ No newline at end of file
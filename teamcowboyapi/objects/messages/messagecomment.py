@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 from dataclasses import dataclass
 
 from .postedby import Postedby
@@ -32,6 +32,8 @@ class Messagecomment:
         Date/time the comment was posted (UTC).
     dateLastUpdatedUtc : str
         Date/time the comment was last posted(UTC).
+    comment : str
+        The text of the comment.
     """
     commentId: int
     messageId: int
@@ -42,6 +44,7 @@ class Messagecomment:
     dateLastUpdatedLocal: str
     dateCreatedUtc: str
     dateLastUpdatedUtc: str
+    comment: Optional[str] = None
 
     def __post_init__(self):
         self.postedBy = Postedby(**self.postedBy)
\ No newline at end of file
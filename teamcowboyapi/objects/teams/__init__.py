@@ -1,2 +1,10 @@
-from .team import Team
-from .teammembertype import Teammembertype
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Team': '.team',
+    'Teammembertype': '.teammembertype',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
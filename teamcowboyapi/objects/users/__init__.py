@@ -1,3 +1,11 @@
-from .linkeduser import Linkeduser
-from .usermetainfo import Usermetainfo
-from .user import User
\ No newline at end of file
+from teamcowboyapi.tc_helpers import lazyattributes
+
+# Models are imported on first use
+_MODELS = {
+    'Linkeduser': '.linkeduser',
+    'Usermetainfo': '.usermetainfo',
+    'User': '.user',
+}
+
+__all__ = list(_MODELS)
+__getattr__, __dir__ = lazyattributes(__name__, _MODELS)
@@ -0,0 +1,197 @@
+from typing import Dict, List, Optional
+from array import array
+import functools
+
+from teamcowboyapi import tc_deadline, tc_helpers
+from teamcowboyapi.objects.attendances import Attendancelist
+
+
+STATUSES = ('yes', 'maybe', 'available', 'no', 'noresponse')
+
+
+class SeasonAttendance:
+    """
+    RSVP counts for a set of events folded into flat count matrices.
+
+    Each attendance list is folded in as it arrives and then dropped, so
+    memory grows with the number of users and events rather than with the
+    attendance lists themselves. Counts are stored row-major in
+    array('I') matrices: one row per user and one row per event, with one
+    column per status in STATUSES. Gender and member type are stored once
+    per user as small integer codes.
+
+    Attributes:
+    -----------
+    teamId : int
+        Id of the team the events belong to
+    """
+
+    def __init__(self, teamId: int = None):
+        self.teamId = teamId
+        self.userIds = []
+        self.eventIds = []
+        self.user_counts = array('I')
+        self.event_counts = array('I')
+        self._rows = {}
+        self._events = {}
+        self._gender = array('H')
+        self._type = array('H')
+        self._genders = []
+        self._types = []
+
+    def __len__(self) -> int:
+        return len(self.eventIds)
+
+    def fold(self, eventId: int, attendancelist: Attendancelist) -> None:
+        """
+        Add one event's attendance list to the counts
+        """
+        width = len(STATUSES)
+        base = len(self.event_counts)
+        self._events[eventId] = len(self.eventIds)
+        self.eventIds.append(eventId)
+        self.event_counts.extend([0] * width)
+
+        for entry in attendancelist.users:
+            try:
+                column = STATUSES.index(entry.rsvpInfo.status)
+            except ValueError:
+                continue
+
+            row = self._row(entry.user)
+            self.user_counts[row * width + column] += 1
+            self.event_counts[base + column] += 1
+
+    def counts(self, userId: int) -> Dict[str, int]:
+        """
+        Return a user's number of RSVPs by status
+        """
+        row = self._rows.get(userId)
+
+        if row is None:
+            return dict.fromkeys(STATUSES, 0)
+
+        width = len(STATUSES)
+        return dict(zip(STATUSES, self.user_counts[row * width:(row + 1) * width]))
+
+    def rate(self, userId: int, status: str = 'yes') -> float:
+        """
+        Return the share of the user's listed events with the given status
+        """
+        counts = self.counts(userId)
+        total = sum(counts.values())
+        return counts[status] / total if total else 0.0
+
+    def rates(self, status: str = 'yes') -> Dict[int, float]:
+        """
+        Return every user's rate for status, by userId
+        """
+        return {userId: self.rate(userId, status) for userId in self.userIds}
+
+    def event(self, eventId: int) -> Dict[str, int]:
+        """
+        Return an event's number of RSVPs by status
+        """
+        width = len(STATUSES)
+        index = self._events[eventId]
+        return dict(zip(STATUSES, self.event_counts[index * width:(index + 1) * width]))
+
+    def by_gender(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return RSVP counts by status for each gender
+        """
+        return self._group(self._gender, self._genders)
+
+    def by_member_type(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return RSVP counts by status for each team member type
+        """
+        return self._group(self._type, self._types)
+
+    def totals(self) -> Dict[str, int]:
+        width = len(STATUSES)
+        return {status: sum(self.event_counts[column::width]) for column, status in enumerate(STATUSES)}
+
+    def _group(self, codes: array, names: List[str]) -> Dict[str, Dict[str, int]]:
+        width = len(STATUSES)
+        sums = [[0] * width for _ in names]
+
+        for row, code in enumerate(codes):
+            group = sums[code]
+
+            for column in range(width):
+                group[column] += self.user_counts[row * width + column]
+
+        return {name: dict(zip(STATUSES, group)) for name, group in zip(names, sums)}
+
+    def _row(self, user) -> int:
+        row = self._rows.get(user.userId)
+
+        if row is None:
+            row = len(self.userIds)
+            self._rows[user.userId] = row
+            self.userIds.append(user.userId)
+            self.user_counts.extend([0] * len(STATUSES))
+
+            membertype = user.teamMeta.teamMemberType.name if user.teamMeta else None
+            self._gender.append(_code(self._genders, user.gender))
+            self._type.append(_code(self._types, membertype))
+
+        return row
+
+
+def _code(names: List, name) -> int:
+    if name not in names:
+        names.append(name)
+    return names.index(name)
+
+
+def aggregate_season(tc, teamId: int, seasonId: int = None, max_workers: int = 4,
+                        page_size: int = 50, **params) -> SeasonAttendance:
+    """
+    Fetch attendance for a season's events concurrently and fold it into a
+    SeasonAttendance
+
+    >>> stats = aggregate_season(Teamcowboy, teamid, seasonid)
+    >>> stats.rate(userid), stats.by_gender()
+
+    Parameters:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    teamId : int
+        Id of the team
+    seasonId : int
+        Id of the season. If not provided, params select the events.
+    max_workers : int
+        Number of attendance lists fetched at once
+    page_size : int
+        Number of events requested per Team_GetEvents page
+    params : dict
+        Extra Team_GetEvents params, e.g. filter, startDateTime, endDateTime.
+        filter defaults to past, so events that have not happened yet are
+        left out of the rates.
+
+    Returns:
+    --------
+    SeasonAttendance
+    """
+    if seasonId is not None:
+        params["seasonId"] = seasonId
+
+    params.setdefault("filter", "past")
+
+    fetch = functools.partial(tc.Team_GetEvents, teamId)
+    eventIds = [event.eventId for event in tc_helpers.paginate(fetch, qty=page_size, **params)]
+
+    stats = SeasonAttendance(teamId)
+
+    def attendance(eventId: int) -> Optional[Attendancelist]:
+        return tc.Event_GetAttendanceList(teamId, eventId)
+
+    # Fold in completion order so only the lists in flight are held at once
+    for index, attendancelist in tc_deadline.stream(attendance, eventIds, max_workers=max_workers):
+        if attendancelist is not None:
+            stats.fold(eventIds[index], attendancelist)
+
+    return stats
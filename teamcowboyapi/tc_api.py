@@ -1,20 +1,68 @@
+from __future__ import annotations
+
 import time
-from typing import List, Union
+from typing import TYPE_CHECKING, Callable, Iterator, List, Sequence, Tuple, Union
+import functools
+import inspect
 import logging
 
 from .exceptions import TheTeamCowboyAPIException
-from .tc_dataadapter import TCDataAdapter
+from .tc_dataadapter import TCDataAdapter, TCResult
+from .tc_cache import TCCache
+from .tc_circuitbreaker import CircuitBreaker
+from .tc_hedge import HedgePolicy
+from .tc_ratelimit import RateLimiter
 
 from teamcowboyapi import tc_helpers
 
-from teamcowboyapi.objects.authuser import Authuser
-from teamcowboyapi.objects.events import Event, Saversvpresponse
-from teamcowboyapi.objects.attendances import Attendancelist
-from teamcowboyapi.objects.messages import Message, Messagecomment
-from teamcowboyapi.objects.teams import Team
-from teamcowboyapi.objects.users import User
-from teamcowboyapi.objects.seasons import Season
-from teamcowboyapi.objects.tests import Tresponce
+# Model modules are imported by the first call that returns one of their objects
+from teamcowboyapi.objects import (attendances, authuser, events, messages, seasons, teams,
+                                    tests, users)
+
+if TYPE_CHECKING:
+    from teamcowboyapi.objects.authuser import Authuser
+    from teamcowboyapi.objects.events import Event, Saversvpresponse
+    from teamcowboyapi.objects.attendances import Attendancelist
+    from teamcowboyapi.objects.messages import Message, Messagecomment
+    from teamcowboyapi.objects.teams import Team
+    from teamcowboyapi.objects.users import User
+    from teamcowboyapi.objects.seasons import Season
+    from teamcowboyapi.objects.tests import Tresponce
+    from .tc_profile import Profiler
+
+
+def _observed(func: Callable) -> Callable:
+    """
+    Decorator for api methods that reports every completed call to the 
+    listeners registered with Teamcowboy.add_listener, as 
+    listener(method, params, result), and runs it under Teamcowboy.profiler 
+    if one is set.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is not None:
+            result = self.profiler.call(func.__name__, func, self, *args, **kwargs)
+        else:
+            result = func(self, *args, **kwargs)
+
+        if self._listeners:
+            bound = signature.bind(self, *args, **kwargs)
+            params = {name: value for name, value in bound.arguments.items() 
+                        if name not in ('self', 'params')}
+            params |= bound.arguments.get('params', {})
+
+            for listener in list(self._listeners):
+                try:
+                    listener(func.__name__, params, result)
+
+                except Exception as e:
+                    self._logger.error(msg=f'Listener failed for {func.__name__}: {e}')
+
+        return result
+
+    return wrapper
 
 
 class Teamcowboy:
@@ -35,26 +83,202 @@ class Teamcowboy:
         hostname of api.teamcowboy.com
     logger : logging.Loger
         logger
+    timeout : Tuple[float, float]
+        connect and read timeouts in seconds for every request
+    breaker : CircuitBreaker
+        optional circuit breaker around the Team Cowboy endpoint
+    cache : TCCache
+        optional cache of read results, also used as the stale fallback while 
+        the breaker is open
+    hedge : HedgePolicy
+        optional hedging policy for slow idempotent GET methods
+    ratelimiter : RateLimiter
+        optional limit on how fast requests are sent
+    adapter : TCDataAdapter
+        optional adapter to send requests through, shared with other 
+        clients. timeout, breaker, cache, hedge and ratelimiter are ignored 
+        when it is given.
+    token : Authuser
+        optional token from an earlier Auth_GetUserToken call, to skip 
+        authenticating again
+    profiler : Profiler
+        optional tc_profile.Profiler sampling api method calls. Can be set 
+        or cleared later through the profiler attribute.
     """
     def __init__(self, privateapikey, publicapikey,
                     username, password,
                     hostname: str = 'api.teamcowboy.com',
-                    logger: logging.Logger = None):
-        self._tc_adapter_v1 = TCDataAdapter(hostname, 'v1', logger)
+                    logger: logging.Logger = None,
+                    timeout: Tuple[float, float] = (3.05, 30),
+                    breaker: CircuitBreaker = None,
+                    cache: TCCache = None,
+                    hedge: HedgePolicy = None,
+                    ratelimiter: RateLimiter = None,
+                    adapter: TCDataAdapter = None,
+                    token: Authuser = None,
+                    profiler: Profiler = None):
+        self._tc_adapter_v1 = adapter or TCDataAdapter(hostname, 'v1', logger, timeout=timeout,
+                                                        breaker=breaker, cache=cache,
+                                                        hedge=hedge, resign=self._resign,
+                                                        ratelimiter=ratelimiter)
         self._logger = logger or logging.getLogger(__name__)
         self._logger.setLevel(logging.DEBUG)
+        self._listeners = []
+        self.profiler = profiler
 
         self.privatekey = privateapikey
         self.publickey = publicapikey
         # self.usertoken = self.Auth_GetUserToken(username, password).token
 
-        token = self.Auth_GetUserToken(username, password)
+        token = token or self.Auth_GetUserToken(username, password)
 
         if token:
             self.usertoken = token.token
+            self.userid = token.userId
         else:
             raise TheTeamCowboyAPIException(f"Failed to create usertoken")
 
+    def add_listener(self, listener: Callable) -> None:
+        """
+        Register a callback that is called after every api method (other 
+        than Auth_GetUserToken) returns.
+
+        Parameters:
+        -----------
+        listener : Callable
+            Called as listener(method, params, result) where method is the 
+            Team Cowboy method name, params the arguments it was called with 
+            and result the value it returned. Exceptions raised by a listener 
+            are logged and do not affect the call.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable) -> None:
+        """
+        Unregister a callback added with add_listener
+        """
+        self._listeners.remove(listener)
+
+    def _resign(self, request_data: dict, request_type: str = "GET") -> dict:
+        """
+        Return a copy of signed request data with a fresh timestamp, nonce 
+        and signature, so the same request can be sent again.
+
+        Parameters:
+        -----------
+        request_data : dict
+            Request data as returned by tc_helpers.createrequestdata
+        request_type : str
+            GET or POST
+
+        Returns:
+        --------
+        dict
+        """
+        return tc_helpers.resignrequestdata(request_data, self.privatekey, request_type)
+
+    def raw(self, method: str, **params) -> bytes:
+        """
+        Call a GET method and return the undecoded response body, for
+        decoding elsewhere (see tc_decode). Listeners are not called and the
+        cache is not used.
+
+        Parameters:
+        -----------
+        method : str
+            Team Cowboy method name, e.g. Team_GetEvents
+        params : dict
+            The method's parameters, e.g. teamId
+
+        Returns:
+        --------
+        bytes
+        """
+        rdata = {
+            "request_type": "GET",
+            "private_key":self.privatekey,
+            "api_key":self.publickey,
+            "method":method,
+            "timestamp":int(time.time()),
+            "nonce":tc_helpers.createnonce(),
+            "responce_type":"json",
+            "userToken": self.usertoken,
+        }
+
+        rdata |= params
+        request_data = tc_helpers.createrequestdata(rdata)
+
+        return self._tc_adapter_v1.get_raw(endpoint=f'', ep_params = request_data)
+
+    def stream(self, method: str, path: Sequence[str] = ('body',), **params) -> Iterator[dict]:
+        """
+        Call a GET method and yield the elements of the list in its response 
+        as they are parsed, without waiting for the whole body (see 
+        tc_stream). Listeners are not called and the cache is not used.
+
+        Parameters:
+        -----------
+        method : str
+            Team Cowboy method name, e.g. Team_GetEvents
+        path : Sequence[str]
+            Keys leading to the list in the response, e.g. ('body', 'users')
+            for Event_GetAttendanceList
+        params : dict
+            The method's parameters, e.g. teamId
+
+        Returns:
+        --------
+        Iterator of dict
+        """
+        rdata = {
+            "request_type": "GET",
+            "private_key":self.privatekey,
+            "api_key":self.publickey,
+            "method":method,
+            "timestamp":int(time.time()),
+            "nonce":tc_helpers.createnonce(),
+            "responce_type":"json",
+            "userToken": self.usertoken,
+        }
+
+        rdata |= params
+        request_data = tc_helpers.createrequestdata(rdata)
+
+        return self._tc_adapter_v1.get_stream(endpoint=f'', ep_params = request_data, path = path)
+
+    def request(self, method: str, **params) -> TCResult:
+        """
+        Call a GET method and return the adapter's TCResult without building
+        objects from it (see tc_gateway). The cache, rate limiter and breaker
+        apply as for the typed methods; listeners are not called.
+
+        Parameters:
+        -----------
+        method : str
+            Team Cowboy method name, e.g. Team_GetEvents
+        params : dict
+            The method's parameters, e.g. teamId
+
+        Returns:
+        --------
+        TCResult
+        """
+        rdata = {
+            "request_type": "GET",
+            "private_key":self.privatekey,
+            "api_key":self.publickey,
+            "method":method,
+            "timestamp":int(time.time()),
+            "nonce":tc_helpers.createnonce(),
+            "responce_type":"json",
+            "userToken": self.usertoken,
+        }
+
+        rdata |= params
+        request_data = tc_helpers.createrequestdata(rdata)
+
+        return self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
+
 
     """
     Authentication Methods
@@ -86,7 +310,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Auth_GetUserToken",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "username":username,
             "password":password,
@@ -97,12 +321,13 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.post(endpoint=f'', data = request_data)
 
         if "token" in tc_data.data and tc_data.data["token"]:
-            return Authuser(**tc_data.data)
+            return authuser.Authuser(**tc_data.data)
 
     """
     Event Methods
     """
 
+    @_observed
     def Event_Get(self, teamId: int, eventId: int, **params) -> Event:
         """
         Retrieves details for a specific event. User must be an active team 
@@ -138,7 +363,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Event_Get",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -151,8 +376,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "eventId" in tc_data.data and tc_data.data["eventId"]:
-            return Event(**tc_data.data)
+            return events.Event(**tc_data.data)
 
+    @_observed
     def Event_GetAttendanceList(self, teamId: int, eventId: int) -> Attendancelist:
         """
         Retrieves attendance list information for a specific event. This 
@@ -181,7 +407,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Event_GetAttendanceList",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -193,8 +419,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "users" in tc_data.data and tc_data.data["users"]:
-            return Attendancelist(**tc_data.data)
+            return attendances.Attendancelist(**tc_data.data)
 
+    @_observed
     def Event_SaveRSVP(self, teamId: int, eventId: int, status: str, 
                         **params) -> Saversvpresponse:
         """
@@ -261,7 +488,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Event_SaveRSVP",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -275,13 +502,14 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.post(endpoint=f'', data = request_data)
 
         if "rsvpSaved" in tc_data.data and tc_data.data["rsvpSaved"]:
-            return Saversvpresponse(**tc_data.data)
+            return events.Saversvpresponse(**tc_data.data)
 
 
     """
     Message Methods
     """
 
+    @_observed
     def Message_Get(self, teamId: int, messageId: int, **params) -> Message:
         """
         Retrieves information about a team message.
@@ -314,7 +542,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Message_Get",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -327,8 +555,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "messageId" in tc_data.data and tc_data.data["messageId"]:
-            return Message(**tc_data.data)
+            return messages.Message(**tc_data.data)
 
+    @_observed
     def Message_Delete(self, teamId: int, messageId: int) -> bool:
         """
         Deletes a team message. The user attempting to delete the message must 
@@ -357,7 +586,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Message_Delete",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -371,6 +600,7 @@ class Teamcowboy:
         # Responce is a bool, so just return responce?
         return tc_data.data
 
+    @_observed
     def Message_Save(self, teamId: int, title: str, body: str, **params) -> Message:
         """
         Saves (adds or updates) a team message.
@@ -423,7 +653,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Message_Save",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -437,9 +667,10 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.post(endpoint=f'', data = request_data)
 
         if "messageId" in tc_data.data and tc_data.data["messageId"]:
-            return Message(**tc_data.data)
+            return messages.Message(**tc_data.data)
 
 
+    @_observed
     def MessageComment_Delete(self, teamId: int, messageId: int, commentId: int) -> bool:
         """
         Deletes a comment for a message. The user attempting to delete the 
@@ -470,7 +701,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"MessageComment_Delete",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -486,6 +717,7 @@ class Teamcowboy:
         return tc_data.data
 
 
+    @_observed
     def MessageComment_Add(self, teamId: int, messageId: int, comment: str) -> Messagecomment:
         """
         Adds a new comment for a message. The message must allow comments to 
@@ -515,7 +747,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"MessageComment_Add",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,
@@ -528,7 +760,7 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.post(endpoint=f'', ep_params = request_data)
 
         if "commentId" in tc_data.data and tc_data.data["commentId"]:
-            return Messagecomment(**tc_data.data)
+            return messages.Messagecomment(**tc_data.data)
 
 
 
@@ -536,6 +768,7 @@ class Teamcowboy:
     Team Methods
     """
     
+    @_observed
     def Team_Get(self, teamId: int) -> Team:
         """
         Retrieves information about a team. The team requested must be 
@@ -563,7 +796,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Team_Get",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,            
@@ -574,8 +807,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "teamId" in tc_data.data and tc_data.data["teamId"]:
-            return Team(**tc_data.data)
+            return teams.Team(**tc_data.data)
 
+    @_observed
     def Team_GetEvents(self, teamId: int, **params) -> List[Event]:
         """
         Retrieves an array of events for a team's season.The team requested 
@@ -653,7 +887,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Team_GetEvents",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,            
@@ -665,8 +899,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Event(**event) for event in tc_data.data]
+            return [events.Event(**event) for event in tc_data.data]
 
+    @_observed
     def Team_GetMessages(self, teamId: int, **params) -> List[Message]:
         """
         This function makes an API call to retrieve a list of messages for a 
@@ -726,7 +961,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Team_GetMessages",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,            
@@ -738,8 +973,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Message(**msg) for msg in tc_data.data]
+            return [messages.Message(**msg) for msg in tc_data.data]
 
+    @_observed
     def Team_GetRoster(self, teamId: int, **params) -> List[User]:
         """
         Retrieves roster members for a given team.
@@ -790,7 +1026,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Team_GetRoster",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,            
@@ -802,8 +1038,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [User(**user) for user in tc_data.data]
+            return [users.User(**user) for user in tc_data.data]
 
+    @_observed
     def Team_GetSeasons(self, teamId: int) -> List[Season]:
         """
         Retrieves schedule seasons for a team. The team requested must be 
@@ -831,7 +1068,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Team_GetSeasons",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,
             "teamId": teamId,            
@@ -842,13 +1079,14 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Season(**season) for season in tc_data.data]
+            return [seasons.Season(**season) for season in tc_data.data]
 
 
     """
     Test Methods
     """
 
+    @_observed
     def Test_GetRequest(self, **params) -> Tresponce:
         """
         This is a very basic testing method for checking that you are able to 
@@ -876,7 +1114,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Test_GetRequest",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json"    
         }
 
@@ -886,9 +1124,10 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "helloWorld" in tc_data.data and tc_data.data["helloWorld"]:
-            return Tresponce(**tc_data.data)
+            return tests.Tresponce(**tc_data.data)
         
 
+    @_observed
     def Test_PostRequest(self, **params) -> Tresponce:
         """
         This is a very basic testing method for checking that you are able to 
@@ -916,7 +1155,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"Test_PostRequest",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json"    
         }
 
@@ -926,13 +1165,14 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.post(endpoint=f'', data = request_data)
 
         if "helloWorld" in tc_data.data and tc_data.data["helloWorld"]:
-            return Tresponce(**tc_data.data)
+            return tests.Tresponce(**tc_data.data)
         
 
     """
     User Methods
     """
 
+    @_observed
     def User_Get(self) -> User:
         """
         Retrieves user details.
@@ -952,7 +1192,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"User_Get",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken,          
         }
@@ -962,8 +1202,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "userId" in tc_data.data and tc_data.data["userId"]:
-            return User(**tc_data.data)
+            return users.User(**tc_data.data)
 
+    @_observed
     def User_GetNextTeamEvent(self, **params) -> Event:
         """
         Retrieves the next event on the user's event schedule. By default, the 
@@ -998,7 +1239,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"User_GetNextTeamEvent",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken        
         }
@@ -1009,8 +1250,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if "eventId" in tc_data.data and tc_data.data["eventId"]:
-            return Event(**tc_data.data)
+            return events.Event(**tc_data.data)
 
+    @_observed
     def User_GetTeamEvents(self, **params) -> List[Event]:
         """
         Retrieves an array of events for the teams that the user is an active 
@@ -1057,7 +1299,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"User_GetTeamEvents",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken        
         }
@@ -1068,8 +1310,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Event(**event) for event in tc_data.data]
+            return [events.Event(**event) for event in tc_data.data]
     
+    @_observed
     def User_GetTeamMessages(self, **params) -> List[Message]:
         """
         Retrieves an array of Message Board posts for the teams that the user 
@@ -1129,7 +1372,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"User_GetTeamMessages",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken        
         }
@@ -1140,8 +1383,9 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Message(**messsage) for messsage in tc_data.data]
+            return [messages.Message(**messsage) for messsage in tc_data.data]
 
+    @_observed
     def User_GetTeams(self, **params) -> List[Team]:
         """
         This function makes an API call to retrieve a list of teams for a user.
@@ -1168,7 +1412,7 @@ class Teamcowboy:
             "api_key":self.publickey,
             "method":"User_GetTeams",
             "timestamp":int(time.time()),
-            "nonce":"{:.4f}".format(time.time()),
+            "nonce":tc_helpers.createnonce(),
             "responce_type":"json",
             "userToken": self.usertoken        
         }
@@ -1179,4 +1423,4 @@ class Teamcowboy:
         tc_data = self._tc_adapter_v1.get(endpoint=f'', ep_params = request_data)
 
         if tc_data.data:
-            return [Team(**team) for team in tc_data.data]
\ No newline at end of file
+            return [teams.Team(**team) for team in tc_data.data]
\ No newline at end of file
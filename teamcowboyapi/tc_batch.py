@@ -0,0 +1,240 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import date
+import concurrent.futures
+import threading
+import time
+
+from teamcowboyapi import tc_deadline
+from teamcowboyapi.exceptions import TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.objects.events import Event
+
+
+@dataclass
+class Fetch:
+    """
+    One call in an EventBatcher plan.
+
+    Attributes:
+    -----------
+    teamId : int
+        Id of the team
+    eventIds : List[int]
+        Requested events the call covers
+    startDate : str
+        First local date (YYYY-MM-DD) of a Team_GetEvents range, None for
+        an Event_Get call
+    endDate : str
+        Last local date of the range, None for an Event_Get call
+    """
+    teamId: int
+    eventIds: List[int] = field(default_factory=list)
+    startDate: Optional[str] = None
+    endDate: Optional[str] = None
+
+    @property
+    def is_range(self) -> bool:
+        return self.startDate is not None
+
+
+class EventBatcher:
+    """
+    Collapses concurrent Event_Get calls into Team_GetEvents range calls.
+
+    Calls to get are collected for window seconds, grouped by team, and
+    events whose date is known are covered by as few specificDates ranges
+    as possible. Events in a range that would only cover one of them, events
+    the batcher has not seen yet and events missing from a range result
+    (e.g. because they moved) are fetched with Event_Get. Attach the batcher
+    to the client and it learns event dates from every event fetch.
+
+    >>> batcher = EventBatcher(Teamcowboy)
+    >>> batcher.attach(Teamcowboy)
+    >>> Teamcowboy.Team_GetEvents(teamid, seasonId=seasonid)
+    >>> tc_deadline.fanout(lambda eventid: batcher.get(teamid, eventid), eventids)
+
+    Attributes:
+    -----------
+    window : float
+        Seconds calls are collected before they are sent
+    max_gap_days : int
+        Largest gap in days between requested events covered by one range
+    min_range : int
+        Fewest requested events a range call must cover
+    page_size : int
+        qty requested for each range call
+    max_workers : int
+        Number of calls of a batch sent at once
+    """
+
+    def __init__(self, tc, window: float = 0.005, max_gap_days: int = 14, min_range: int = 2,
+                    page_size: int = 100, max_workers: int = 4):
+        self.window = window
+        self.max_gap_days = max_gap_days
+        self.min_range = min_range
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self._tc = tc
+        self._dates = {}
+        self._pending = {}
+        self._collecting = False
+        self._lock = threading.Lock()
+
+    def attach(self, tc) -> None:
+        """
+        Learn event dates from every event fetched through a Teamcowboy client
+        """
+        tc.add_listener(self.on_call)
+
+    def detach(self, tc) -> None:
+        tc.remove_listener(self.on_call)
+
+    def on_call(self, method: str, params: Dict, result: Any) -> None:
+        """
+        Teamcowboy listener that records the local date of fetched events
+        """
+        if result and method in ('Event_Get', 'Team_GetEvents', 'User_GetNextTeamEvent', 'User_GetTeamEvents'):
+            self.learn(result if isinstance(result, list) else [result])
+
+    def learn(self, events: Iterable[Event]) -> None:
+        with self._lock:
+            for event in events:
+                if event.dateTimeInfo.startDateLocal:
+                    self._dates[event.eventId] = (event.team.teamId, event.dateTimeInfo.startDateLocal)
+
+    """
+    Fetching
+    """
+
+    def get(self, teamId: int, eventId: int) -> Optional[Event]:
+        """
+        Return the event like Teamcowboy.Event_Get(teamId, eventId), sent
+        together with the other calls made within window
+
+        The caller's deadline, if any, bounds the wait for the batch.
+        """
+        key = (int(teamId), int(eventId))
+
+        with self._lock:
+            future = self._pending.get(key)
+
+            if future is None:
+                future = self._pending[key] = concurrent.futures.Future()
+
+            # The first caller of a window sends the batch once it closes
+            lead = not self._collecting
+            self._collecting = True
+
+        if lead:
+            time.sleep(self.window)
+
+            with self._lock:
+                batch, self._pending, self._collecting = self._pending, {}, False
+
+            self._send(batch)
+
+        deadline = tc_deadline.current()
+
+        try:
+            return future.result(timeout=deadline.remaining() if deadline is not None else None)
+
+        except concurrent.futures.TimeoutError:
+            raise TheTeamCowboyAPIDeadlineException(f'Deadline exceeded waiting for event {eventId}')
+
+    def get_many(self, teamId: int, eventIds: Iterable[int]) -> Dict[int, Optional[Event]]:
+        """
+        Fetch a known set of events at once without waiting for a window
+
+        Returns:
+        --------
+        Dict of Event (None if not found) by eventId
+        """
+        batch = {(int(teamId), int(eventId)): concurrent.futures.Future() for eventId in eventIds}
+        self._send(batch)
+        return {eventId: future.result() for (_, eventId), future in batch.items()}
+
+    def plan(self, requests: Iterable[Tuple[int, int]]) -> List[Fetch]:
+        """
+        Return the calls that cover the requested (teamId, eventId) pairs
+
+        Events with a known date are sorted by date and split wherever two
+        neighbours are more than max_gap_days apart; each piece with at
+        least min_range events becomes one range call. Everything else gets
+        an Event_Get call.
+        """
+        byteam = {}
+
+        for teamId, eventId in requests:
+            byteam.setdefault(teamId, set()).add(eventId)
+
+        fetches = []
+
+        with self._lock:
+            dates = dict(self._dates)
+
+        for teamId, eventIds in byteam.items():
+            dated = sorted((dates[eventId][1], eventId) for eventId in eventIds
+                            if dates.get(eventId, (None,))[0] == teamId)
+            singles = eventIds - {eventId for _, eventId in dated}
+            groups = []
+
+            for day, eventId in dated:
+                if groups and (date.fromisoformat(day) - date.fromisoformat(groups[-1][-1][0])).days <= self.max_gap_days:
+                    groups[-1].append((day, eventId))
+                else:
+                    groups.append([(day, eventId)])
+
+            for group in groups:
+                if len(group) >= self.min_range:
+                    fetches.append(Fetch(teamId, [eventId for _, eventId in group], group[0][0], group[-1][0]))
+                else:
+                    singles.update(eventId for _, eventId in group)
+
+            fetches.extend(Fetch(teamId, [eventId]) for eventId in sorted(singles))
+
+        return fetches
+
+    def _send(self, batch: Dict[Tuple[int, int], concurrent.futures.Future]) -> None:
+        try:
+            fetches = self.plan(batch)
+            results = tc_deadline.fanout(self._fetch, fetches, max_workers=self.max_workers,
+                                            return_exceptions=True)
+            missing = []
+
+            for fetch, result in zip(fetches, results):
+                for eventId in fetch.eventIds:
+                    future = batch[(fetch.teamId, eventId)]
+
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    elif eventId in result or not fetch.is_range:
+                        future.set_result(result.get(eventId))
+                    else:
+                        missing.append(Fetch(fetch.teamId, [eventId]))
+
+            # Events a range did not return are fetched one by one
+            for fetch, result in zip(missing, tc_deadline.fanout(self._fetch, missing,
+                                                                    max_workers=self.max_workers,
+                                                                    return_exceptions=True)):
+                future = batch[(fetch.teamId, fetch.eventIds[0])]
+
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result.get(fetch.eventIds[0]))
+
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+
+    def _fetch(self, fetch: Fetch) -> Dict[int, Event]:
+        if not fetch.is_range:
+            event = self._tc.Event_Get(fetch.teamId, fetch.eventIds[0])
+            return {fetch.eventIds[0]: event} if event is not None else {}
+
+        events = self._tc.Team_GetEvents(fetch.teamId, filter='specificDates',
+                                            startDateTime=f'{fetch.startDate} 00:00:00',
+                                            endDateTime=f'{fetch.endDate} 23:59:59', qty=self.page_size)
+
+        return {event.eventId: event for event in events or []}
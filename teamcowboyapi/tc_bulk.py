@@ -0,0 +1,178 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from teamcowboyapi import tc_decode, tc_deadline
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.objects.attendances.attendancelist import Attendancelistuserinfo
+from teamcowboyapi.objects.events.saversvpresponce import Saversvpresponse
+
+
+@dataclass
+class Rsvpentry:
+    """
+    One RSVP to save.
+
+    Attributes:
+    -----------
+    teamId : int
+        Id of the team that the event is associated with.
+    eventId : int
+        Id of the event to RSVP to.
+    status : str
+        The RSVP status to save.
+        Valid values:  yes, maybe, available, no, noresponse
+    options : dict
+        Optional Event_SaveRSVP params: addlMale, addlFemale, comments,
+        rsvpAsUserId
+    """
+    teamId: int
+    eventId: int
+    status: str
+    options: Dict = field(default_factory=dict)
+
+
+@dataclass
+class Rsvpresult:
+    """
+    Outcome of one Rsvpentry.
+
+    Attributes:
+    -----------
+    entry : Rsvpentry
+        The entry this result is for
+    response : Saversvpresponse
+        Response of Event_SaveRSVP if the RSVP was saved
+    skipped : bool
+        True if the RSVP was not sent because it would not change anything,
+        or because a later entry for the same user and event replaced it
+    error : Exception
+        Error raised while checking attendance or saving the RSVP
+    """
+    entry: Rsvpentry
+    response: Optional[Saversvpresponse] = None
+    skipped: bool = False
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def save_rsvps(tc, entries: Iterable[Rsvpentry], max_workers: int = 4,
+                skip_unchanged: bool = True) -> List[Rsvpresult]:
+    """
+    Save many RSVPs concurrently
+
+    Entries for the same user and event are collapsed to the last one. When
+    skip_unchanged is True the attendance list of each event is fetched
+    once, past tc's cache, and entries that match the user's current RSVP
+    are not sent. Requests share tc's rate limiter and the active Deadline,
+    if any; entries that did not finish before the deadline are reported
+    with the deadline error.
+
+    >>> results = save_rsvps(Teamcowboy, [Rsvpentry(teamid, eventid, "yes"), ...])
+    >>> [result.entry.eventId for result in results if not result.ok]
+
+    Parameters:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    entries : Iterable[Rsvpentry]
+        RSVPs to save
+    max_workers : int
+        Number of requests in flight at once
+    skip_unchanged : bool
+        Check current attendance first and skip RSVPs that change nothing
+
+    Returns:
+    --------
+    List of Rsvpresult, in the same order as entries
+    """
+    results = [Rsvpresult(entry) for entry in entries]
+    latest = {}
+
+    for result in results:
+        key = _key(tc, result.entry)
+
+        if key in latest:
+            latest[key].skipped = True
+
+        latest[key] = result
+
+    pending = list(latest.values())
+
+    if skip_unchanged:
+        events = sorted({(result.entry.teamId, result.entry.eventId) for result in pending})
+        current = dict(zip(events, _run(lambda event: _attendance(tc, *event), events, max_workers)))
+        send = []
+
+        for result in pending:
+            rsvps = current[(result.entry.teamId, result.entry.eventId)]
+
+            if isinstance(rsvps, Exception):
+                result.error = rsvps
+            elif _unchanged(result.entry, rsvps.get(_key(tc, result.entry)[2])):
+                result.skipped = True
+            else:
+                send.append(result)
+
+        pending = send
+
+    for result, outcome in zip(pending, _run(lambda result: _save(tc, result.entry), pending, max_workers)):
+        if isinstance(outcome, Exception):
+            result.error = outcome
+        else:
+            result.response = outcome
+
+    return results
+
+
+def _run(fn, items: List, max_workers: int) -> List:
+    """
+    fanout that reports unfinished items with the deadline error
+    """
+    try:
+        return tc_deadline.fanout(fn, items, max_workers=max_workers, return_exceptions=True)
+
+    except TheTeamCowboyAPIDeadlineException as e:
+        return [e.partial.get(index, e) for index in range(len(items))]
+
+
+def _key(tc, entry: Rsvpentry) -> Tuple[int, int, int]:
+    return (entry.teamId, entry.eventId, int(entry.options.get("rsvpAsUserId", tc.userid)))
+
+
+def _attendance(tc, teamId: int, eventId: int) -> Dict[int, Attendancelistuserinfo]:
+    # Read past the client's cache: skipping an RSVP on a stale list would
+    # drop a change that is needed
+    attendancelist = tc_decode.decode('Event_GetAttendanceList',
+                                        tc.raw('Event_GetAttendanceList', teamId=teamId, eventId=eventId))
+
+    if attendancelist is None:
+        return {}
+
+    return {entry.user.userId: entry.rsvpInfo for entry in attendancelist.users}
+
+
+def _unchanged(entry: Rsvpentry, rsvpinfo: Optional[Attendancelistuserinfo]) -> bool:
+    """
+    True if saving entry would leave rsvpinfo as it is
+    """
+    if rsvpinfo is None or entry.status != rsvpinfo.status:
+        return False
+
+    # Omitted addl counts are left alone by the api but omitted comments are cleared
+    for name in ("addlMale", "addlFemale"):
+        if name in entry.options and int(entry.options[name]) != int(getattr(rsvpinfo, name) or 0):
+            return False
+
+    return entry.options.get("comments", "") == (rsvpinfo.comments or "")
+
+
+def _save(tc, entry: Rsvpentry) -> Saversvpresponse:
+    response = tc.Event_SaveRSVP(entry.teamId, entry.eventId, entry.status, **entry.options)
+
+    if response is None:
+        raise TheTeamCowboyAPIException(f'RSVP for event {entry.eventId} was not saved')
+
+    return response
@@ -0,0 +1,242 @@
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+if TYPE_CHECKING:
+    from .tc_dataadapter import TCResult
+
+
+# Request params that change on every call and so never belong in a cache key
+VOLATILE_PARAMS = ('timestamp', 'nonce', 'sig')
+
+# Params that identify the calling user, dropped from keys of shared methods
+USER_PARAMS = ('userToken',)
+
+# Methods that change data on the api, and so make cached reads stale
+WRITE_METHODS = ('Event_SaveRSVP', 'Message_Save', 'Message_Delete', 'MessageComment_Add',
+                    'MessageComment_Delete')
+
+# Status codes that mean the object is missing or off limits rather than a
+# passing failure, and so may be cached as negative results
+NEGATIVE_STATUSES = (403, 404, 410)
+
+
+class TCCache:
+    """
+    A thread-safe, size-bounded cache of TCResults for read (GET) requests.
+
+    Entries younger than ttl are fresh and are served instead of calling the
+    api. With stale_while_revalidate, entries up to that many seconds past 
+    ttl are still served at once while the adapter refreshes them in the 
+    background. Older entries are kept (until evicted) so they can be served 
+    stale, e.g. while the circuit breaker is open. With negative_ttl, 
+    not-found and forbidden results (NEGATIVE_STATUSES) are cached for that 
+    long so repeated lookups of missing ids are answered locally; they are 
+    never served stale.
+
+    Attributes
+    ----------
+    ttl : float
+        seconds an entry is served as fresh. 0 keeps entries for stale
+        fallback only.
+    max_entries : int
+        maximum number of entries, least recently used entries are evicted
+        first
+    shared_methods : Iterable[str]
+        api methods whose entries are shared by every user token using the 
+        cache, none by default. A shared entry is served without the api's 
+        per-user access check, and even Team_Get varies by caller (e.g. 
+        managerUser and captainUser follow the caller's permissions and 
+        privacy settings), so only list methods when every token using the 
+        cache may see the same data, e.g. accounts of one team's admins.
+    stale_while_revalidate : float
+        seconds after ttl during which an entry is served while it is 
+        refreshed in the background, bounding served data to 
+        ttl + stale_while_revalidate old. 0 turns this off.
+    negative_ttl : float
+        seconds a not-found or forbidden result is served. 0 turns negative 
+        caching off.
+    """
+
+    def __init__(self, ttl: float = 0.0, max_entries: int = 1024, shared_methods: Iterable[str] = (),
+                    stale_while_revalidate: float = 0.0, negative_ttl: float = 0.0):
+        self.ttl = float(ttl)
+        self.max_entries = max_entries
+        self.shared_methods = frozenset(shared_methods)
+        self.stale_while_revalidate = float(stale_while_revalidate)
+        self.negative_ttl = float(negative_ttl)
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def key(self, ep_params: Dict) -> Tuple:
+        """
+        Return the cache key for a set of signed request params
+
+        Parameters
+        ----------
+        ep_params : dict
+            request params as sent to the api
+
+        Returns
+        -------
+        Tuple
+        """
+        ep_params = ep_params or {}
+        ignored = VOLATILE_PARAMS
+
+        if ep_params.get('method') in self.shared_methods:
+            ignored += USER_PARAMS
+
+        return tuple(sorted((k, str(v)) for k, v in ep_params.items() if k not in ignored))
+
+    def get(self, key: Hashable) -> Optional['TCResult']:
+        """
+        Return the entry for key if it is still fresh
+        """
+        entry = self._lookup(key)
+
+        if entry is None:
+            return None
+
+        ttl = self.negative_ttl if self.is_negative(entry[1]) else self.ttl
+
+        if time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+    def get_revalidating(self, key: Hashable) -> Optional['TCResult']:
+        """
+        Return the entry for key if it is expired but may still be served 
+        while it is refreshed
+        """
+        entry = self._lookup(key)
+
+        if (entry is not None and not self.is_negative(entry[1])
+                and time.monotonic() - entry[0] < self.ttl + self.stale_while_revalidate):
+            return entry[1]
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """
+        Mark key as being refreshed, False if a refresh is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+
+            self._refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def get_stale(self, key: Hashable) -> Optional['TCResult']:
+        """
+        Return the entry for key regardless of its age
+        """
+        entry = self._lookup(key)
+
+        if entry is not None and not self.is_negative(entry[1]):
+            return entry[1]
+
+    def is_negative(self, result: 'TCResult') -> bool:
+        """
+        Return True if result is a not-found or forbidden answer to cache
+        """
+        return self.negative_ttl > 0 and result.status_code in NEGATIVE_STATUSES and not result.data
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """
+        Return the age of the entry for key in seconds
+        """
+        entry = self._lookup(key)
+
+        if entry is not None:
+            return time.monotonic() - entry[0]
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter bumped by invalidate_written, passed back to set so a read 
+        that started before a write does not store what it fetched
+        """
+        return self._generation
+
+    def set(self, key: Hashable, result: 'TCResult', generation: int = None) -> None:
+        """
+        Store result under key, unless generation is given and a write has 
+        invalidated entries since it was read
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_written(self, params: Dict) -> None:
+        """
+        Drop the entries a successful write may have made stale: every entry 
+        for the written team and every entry without a teamId (user-wide 
+        lists such as User_GetTeamEvents). A write without a teamId drops 
+        everything. Requests for methods not in WRITE_METHODS, e.g. 
+        Auth_GetUserToken, drop nothing.
+
+        Parameters
+        ----------
+        params : dict
+            request params of the write as sent to the api
+        """
+        params = params or {}
+
+        if params.get('method') not in WRITE_METHODS:
+            return
+
+        teamId = params.get('teamId')
+
+        with self._lock:
+            self._generation += 1
+
+            if teamId is None:
+                self._entries.clear()
+                return
+
+            stale = [key for key in self._entries if _param(key, 'teamId') in (None, str(teamId))]
+
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[float, 'TCResult']]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+
+def _param(key: Hashable, name: str) -> Optional[str]:
+    """
+    Return a param from a key made by TCCache.key, None for other keys
+    """
+    try:
+        return dict(key).get(name)
+    except (TypeError, ValueError):
+        return None
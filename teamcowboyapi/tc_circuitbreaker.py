@@ -0,0 +1,166 @@
+from typing import Callable, Dict
+from collections import deque
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding calls to the Team Cowboy endpoint.
+
+    The breaker starts closed. When the share of failed calls within the
+    rolling window reaches failure_rate (and at least minimum_calls were
+    made) it opens and calls are refused for cooldown seconds. After the
+    cooldown it goes half-open and lets half_open_calls trial calls through:
+    once that many have succeeded it closes again, if one fails it reopens.
+
+    Attributes
+    ----------
+    failure_rate : float
+        share of failed calls (0 - 1) in the window that opens the breaker
+    minimum_calls : int
+        calls needed in the window before the failure rate is considered
+    window : float
+        length of the rolling window in seconds
+    cooldown : float
+        seconds the breaker stays open before allowing trial calls
+    half_open_calls : int
+        number of trial calls allowed at a time while half-open, and of
+        successful trials needed to close
+    on_state_change : Callable
+        optional callback called with (old_state, new_state)
+    """
+
+    CLOSED = 'closed'
+    HALF_OPEN = 'half_open'
+    OPEN = 'open'
+
+    # Gauge values for metrics
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_rate: float = 0.5, minimum_calls: int = 10,
+                    window: float = 60.0, cooldown: float = 30.0,
+                    half_open_calls: int = 1, on_state_change: Callable = None):
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.half_open_calls = half_open_calls
+        self.on_state_change = on_state_change
+
+        self._state = self.CLOSED
+        self._calls = deque()
+        self._opened_at = 0.0
+        self._trials = 0
+        self._successes = 0
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Return True if a call may be made now. Every allowed call must be
+        followed by record_success, record_failure or release.
+        """
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+                self._successes += 1
+
+                if self._successes >= self.half_open_calls:
+                    self._calls.clear()
+                    self._transition(self.CLOSED)
+                return
+
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+                self._open()
+                return
+
+            self._record(False)
+
+            if len(self._calls) >= self.minimum_calls:
+                failures = sum(1 for _, ok in self._calls if not ok)
+
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open()
+
+    def release(self) -> None:
+        """
+        Give back an allowed call that ended without telling us anything
+        about the endpoint (e.g. the caller's deadline ran out first)
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+
+    def metrics(self) -> Dict:
+        """
+        Return the breaker state and counters as a flat dict of metrics
+
+        Returns
+        -------
+        dict
+            state, state_value (0 closed, 1 half-open, 2 open), calls and
+            failures in the current window, and times_opened
+        """
+        with self._lock:
+            self._maybe_half_open()
+            self._trim(time.monotonic())
+
+            return {
+                "state": self._state,
+                "state_value": self.STATE_VALUES[self._state],
+                "calls": len(self._calls),
+                "failures": sum(1 for _, ok in self._calls if not ok),
+                "times_opened": self._times_opened,
+            }
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._calls.append((now, ok))
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        self._calls.clear()
+        self._transition(self.OPEN)
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._trials = 0
+            self._successes = 0
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, state: str) -> None:
+        old, self._state = self._state, state
+
+        if old != state and self.on_state_change is not None:
+            self.on_state_change(old, state)
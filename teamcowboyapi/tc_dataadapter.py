@@ -1,11 +1,25 @@
-from typing import Dict, List
-from .exceptions import TheTeamCowboyAPIException
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+from .exceptions import (TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException,
+                            TheTeamCowboyAPICircuitOpenException)
+from . import tc_deadline, tc_stream
+from .tc_cache import TCCache
+from .tc_circuitbreaker import CircuitBreaker
+from .tc_hedge import HedgePolicy
+from .tc_ratelimit import RateLimiter
+import concurrent.futures
+import contextvars
+import threading
+import time
 import requests
 import logging
 
 from teamcowboyapi.objects.errors import Error
 
 
+# Connections kept open per host, and threads available for hedged requests
+POOL_SIZE = 16
+
+
 class TCResult:
     """
     A class that holds data, status_code, and message returned 
@@ -40,19 +54,87 @@ class TCDataAdapter:
         api version
     logger : logging.Logger
         instance of logger class
+    timeout : Tuple[float, float]
+        connect and read timeouts in seconds applied to every request. Both 
+        are clamped to the time left on an active tc_deadline.Deadline.
+    breaker : CircuitBreaker
+        optional circuit breaker. While it is open requests are refused 
+        without calling the api.
+    cache : TCCache
+        optional cache of GET results. Fresh entries are served instead of 
+        calling the api, and any entry is served stale while the breaker is 
+        open. Entries within the cache's stale_while_revalidate window are 
+        served at once and refreshed in the background (requires resign). 
+        Not-found and forbidden results are cached for the cache's 
+        negative_ttl. A successful POST drops the entries of the team it 
+        wrote to (see TCCache.invalidate_written).
+    hedge : HedgePolicy
+        optional hedging policy for slow GET methods. Requires resign.
+    resign : Callable
+        function that takes signed request params and returns a copy signed 
+        with a fresh nonce. Teamcowboy provides this.
+    ratelimiter : RateLimiter
+        optional limit on how fast requests are sent, shared by every thread 
+        using this adapter
     """
 
     
 
-    def __init__(self, hostname: str = 'api.teamcowboy.com', ver: str = 'v1', logger: logging.Logger = None):
+    def __init__(self, hostname: str = 'api.teamcowboy.com', ver: str = 'v1', logger: logging.Logger = None,
+                    timeout: Tuple[float, float] = (3.05, 30), breaker: CircuitBreaker = None,
+                    cache: TCCache = None, hedge: HedgePolicy = None, resign: Callable = None,
+                    ratelimiter: RateLimiter = None):
         self.url = f'https://{hostname}/{ver}/'
+        self.timeout = timeout
+        self.breaker = breaker
+        self.cache = cache
+        self.hedge = hedge
+        self.resign = resign
+        self.ratelimiter = ratelimiter
+        self._executor = None
+        self._executor_lock = threading.Lock()
         self._logger = logger or logging.getLogger(__name__)
         self._logger.setLevel(logging.DEBUG)
 
+        # One pooled session per adapter so concurrent callers reuse connections
+        self._session = requests.Session()
+        self._session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+        self._session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+
+    def close(self) -> None:
+        """
+        Close pooled connections and stop the hedging threads
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+        self._session.close()
+
     def post(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> TCResult:
         """
         return a TCResult from endpoint
 
+        Parameters
+        ----------
+        endpoint : str
+            rest api endpoint
+        ep_params : dict
+            params
+        data : dict
+            data to send with requests
+
+        Returns
+        -------
+        TCResult
+        """
+        return self._request('POST', endpoint, ep_params=ep_params, data=data)
+
+    def get(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> TCResult:
+        """
+        return a TCResult from endpoint
+
         Parameters
         ----------
         endpoint : str
@@ -66,74 +148,195 @@ class TCDataAdapter:
         -------
         TCResult
         """
-        full_url = self.url + endpoint
-        logline_pre = f'url={full_url}'
-        logline_post = " ,".join((logline_pre, 'success={}, status_code={}, message={}, url={}'))
+        return self._request('GET', endpoint, ep_params=ep_params, data=data)
 
-        try:
-            self._logger.debug(logline_post)
-            response = requests.post(url=full_url, data=data)
+    def _request(self, httpmethod: str, endpoint: str, ep_params: Dict = None, data: Dict = None) -> TCResult:
+        """
+        Send a request to endpoint through the cache and circuit breaker
+
+        Raises
+        ------
+        TheTeamCowboyAPICircuitOpenException
+            if the breaker is open and no cached result can be served
+        TheTeamCowboyAPIDeadlineException
+            if the active deadline ran out before or during the request
+        TheTeamCowboyAPIException
+            if the request failed or the api returned a server error
+        """
+        cachekey = None
 
-        except requests.exceptions.RequestException as e:
-            self._logger.error(msg=(str(e)))
-            raise TheTeamCowboyAPIException('Request failed') from e
+        if httpmethod == 'GET' and self.cache is not None:
+            cachekey = self.cache.key(ep_params)
+            cached = self.cache.get(cachekey)
+
+            if cached is not None:
+                return cached
+
+            if self.cache.stale_while_revalidate and self.resign is not None:
+                cached = self.cache.get_revalidating(cachekey)
+
+                if cached is not None:
+                    if self.cache.claim_refresh(cachekey):
+                        self._get_executor().submit(self._revalidate, endpoint, ep_params, cachekey)
+                    return cached
+
+        result = self._fetch(httpmethod, endpoint, ep_params, data, cachekey)
+
+        if httpmethod != 'GET' and self.cache is not None and 200 <= result.status_code <= 299:
+            # Reads cached before the write no longer reflect it
+            self.cache.invalidate_written(data or ep_params)
 
+        return result
+
+    def _revalidate(self, endpoint: str, ep_params: Dict, cachekey: Tuple) -> None:
+        """
+        Refresh a cache entry that was served stale. Runs on the adapter's 
+        threads, outside the deadline of the caller that was served.
+        """
         try:
-            data = response.json()
+            # Nobody waits on a refresh, so it is never hedged
+            result = self._fetch('GET', endpoint, self.resign(ep_params), None, cachekey, hedge=False)
 
-        except (ValueError, requests.JSONDecodeError) as e: 
-            self._logger.error(msg=(str(e)))
-            raise TheTeamCowboyAPIException('Bad JSON in response') from e
+            if not result.data and not self.cache.is_negative(result):
+                # The entry is gone upstream, stop serving it
+                self.cache.invalidate(cachekey)
 
-        # Responce code is OK
-        if response.status_code <= 200 and response.status_code <= 299:
-            self._logger.debug(msg=logline_post.format('success',
-            response.status_code, response.reason, response.url))
+        except TheTeamCowboyAPIException as e:
+            self._logger.warning(msg=f'Background refresh of {endpoint} failed: {e}')
 
-            if data['success'] == False:
-                
-                errorobject = Error(**data["body"])
+        finally:
+            self.cache.release_refresh(cachekey)
 
-                if errorobject.httpResponce >= 400 and errorobject.httpResponce <= 499:
-                    self._logger.error(msg=logline_post.format(errorobject.errorCode,
-                    errorobject.httpResponce, errorobject.message, response.url))
+    def _fetch(self, httpmethod: str, endpoint: str, ep_params: Dict, data: Dict, cachekey: Tuple,
+                hedge: bool = True) -> TCResult:
+        """
+        Send a request through the circuit breaker and store the result in the cache
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            stale = self.cache.get_stale(cachekey) if cachekey is not None else None
 
-                    # return TCResult with 404 and empty data
-                    return TCResult(errorobject.httpResponce, message=errorobject.message, data={})
+            if stale is not None:
+                self._logger.warning(msg=f'Circuit open, serving stale result for {endpoint}')
+                return stale
 
-                elif errorobject.httpResponce >= 500 and errorobject.httpResponce <= 599:
-                    self._logger.error(msg=logline_post.format(errorobject.errorCode, 
-                    errorobject.httpResponce, errorobject.message, response.url))
+            raise TheTeamCowboyAPICircuitOpenException('Circuit open, request not sent')
 
-                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponce}: {errorobject.message}")
+        generation = self.cache.generation if cachekey is not None else None
 
-                else:
-                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponce}: {errorobject.message}")
-                
+        try:
+            if hedge and self._hedgeable(httpmethod, ep_params):
+                result = self._send_hedged(endpoint, ep_params)
             else:
-                # Everything is juicy, send the data over
-                return TCResult(response.status_code, message=response.reason, data=data['body'])
+                result = self._send(httpmethod, endpoint, ep_params=ep_params, data=data)
 
-        elif response.status_code >= 400 and response.status_code <= 499:  
-            self._logger.error(msg=logline_post.format('Invalid Request',
-            response.status_code, response.reason, response.url))
+        except TheTeamCowboyAPIDeadlineException:
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
 
-            # return MlbResult with 404 and empty data
-            return TCResult(response.status_code, message=response.reason, data={})
+        except TheTeamCowboyAPIException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
 
-        elif response.status_code >= 500 and response.status_code <= 599:
+        except BaseException:
+            # Anything else, e.g. a malformed body, still has to give back
+            # the breaker slot or a half-open breaker would never close
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
 
-            self._logger.error(msg=logline_post.format('Internal error occurred', 
-            response.status_code, response.reason, response.url))
+        if self.breaker is not None:
+            self.breaker.record_success()
 
-            raise TheTeamCowboyAPIException(f"{response.status_code}: {response.reason}")
+        if cachekey is not None and (result.data or self.cache.is_negative(result)):
+            self.cache.set(cachekey, result, generation=generation)
 
-        else:
-            raise TheTeamCowboyAPIException(f"{response.status_code}: {response.reason}")
+        return result
 
-    def get(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> TCResult:
+    def _hedgeable(self, httpmethod: str, ep_params: Dict) -> bool:
+        return (httpmethod == 'GET' and self.hedge is not None and self.resign is not None
+                and ep_params is not None and self.hedge.applies(ep_params.get('method')))
+
+    def _send_hedged(self, endpoint: str, ep_params: Dict) -> TCResult:
         """
-        return a TCResult from endpoint
+        Send a GET and, if it is slower than the hedge delay and the budget 
+        allows, a duplicate signed with a fresh nonce. The first successful 
+        answer wins. The loser is cancelled if it has not started; one that is 
+        already in flight is left to finish and its answer is dropped.
+        """
+        method = ep_params.get('method')
+        self.hedge.note_request()
+
+        def send(params):
+            sent = time.monotonic()
+            result = self._send('GET', endpoint, ep_params=params)
+            self.hedge.record(method, time.monotonic() - sent)
+            return result
+
+        executor = self._get_executor()
+        futures = [executor.submit(contextvars.copy_context().run, send, ep_params)]
+
+        done, _ = concurrent.futures.wait(futures, timeout=self._wait_timeout(self.hedge.delay(method)))
+
+        deadline = tc_deadline.current()
+
+        if not done and (deadline is None or not deadline.expired) and self.hedge.try_hedge():
+            self._logger.debug(msg=f'Hedging {method} after {self.hedge.delay(method):.3f}s')
+            futures.append(executor.submit(contextvars.copy_context().run, send, self.resign(ep_params)))
+
+        pending = set(futures)
+        error = None
+
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=self._wait_timeout(),
+                                return_when=concurrent.futures.FIRST_COMPLETED)
+
+            if not done:
+                for future in pending:
+                    future.cancel()
+                raise TheTeamCowboyAPIDeadlineException('Deadline exceeded during request')
+
+            for future in done:
+                try:
+                    result = future.result()
+
+                except TheTeamCowboyAPIException as e:
+                    error = error or e
+                    continue
+
+                for other in pending:
+                    other.cancel()
+
+                return result
+
+        raise error
+
+    def _wait_timeout(self, timeout: float = None) -> float:
+        """
+        Return timeout shortened to the active deadline, None waits forever
+        """
+        deadline = tc_deadline.current()
+
+        if deadline is None:
+            return timeout
+
+        return deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=POOL_SIZE,
+                                    thread_name_prefix='teamcowboyapi')
+            return self._executor
+
+    def get_raw(self, endpoint: str, ep_params: Dict = None) -> bytes:
+        """
+        return the undecoded response body from endpoint
+
+        For decoding in another process, see tc_decode.DecodePool. The 
+        cache and hedging are skipped; the breaker, rate limiter and 
+        deadline still apply.
 
         Parameters
         ----------
@@ -141,26 +344,172 @@ class TCDataAdapter:
             rest api endpoint
         ep_params : dict
             params
-        data : dict
-            data to send with requests (we aren't using this)
 
         Returns
         -------
-        TCResult
+        bytes
         """
+        if self.breaker is not None and not self.breaker.allow():
+            raise TheTeamCowboyAPICircuitOpenException('Circuit open, request not sent')
+
+        try:
+            response = self._transmit('GET', endpoint, ep_params=ep_params)
+
+            if response.status_code >= 500:
+                raise TheTeamCowboyAPIException(f"{response.status_code}: {response.reason}")
+
+        except TheTeamCowboyAPIDeadlineException:
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+
+        except TheTeamCowboyAPIException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        if self.breaker is not None:
+            self.breaker.record_success()
 
+        return response.content
+
+    def get_stream(self, endpoint: str, ep_params: Dict = None, path: Sequence[str] = ('body',),
+                    chunk_size: int = 65536) -> Iterator:
+        """
+        yield the elements of a list in the response from endpoint as they 
+        are parsed, see tc_stream.iterarray
+
+        The body is read chunk_size bytes at a time, so only the element 
+        being parsed is held in memory. The cache and hedging are skipped; 
+        the breaker, rate limiter and deadline (up to the response headers) 
+        apply. Like get, a 4xx error yields nothing.
+
+        Parameters
+        ----------
+        endpoint : str
+            rest api endpoint
+        ep_params : dict
+            params
+        path : Sequence[str]
+            keys leading to the list, e.g. ('body', 'users')
+        chunk_size : int
+            bytes read at a time
+
+        Returns
+        -------
+        Iterator
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            raise TheTeamCowboyAPICircuitOpenException('Circuit open, request not sent')
+
+        response = None
+
+        try:
+            response = self._transmit('GET', endpoint, ep_params=ep_params, stream=True)
+
+            if response.status_code >= 500:
+                raise TheTeamCowboyAPIException(f"{response.status_code}: {response.reason}")
+
+            if response.status_code >= 400:
+                self._logger.error(msg=f'url={response.url}, status_code={response.status_code}')
+            else:
+                rest = {}
+
+                try:
+                    yield from tc_stream.iterarray(response.iter_content(chunk_size), path, rest)
+
+                except requests.exceptions.RequestException as e:
+                    raise TheTeamCowboyAPIException('Request failed while reading response') from e
+
+                if rest.get('success') == False:
+                    error = Error(**rest['body'])
+
+                    if not 400 <= error.httpResponse <= 499:
+                        raise TheTeamCowboyAPIException(f"{error.httpResponse}: {error.message}")
+
+                    self._logger.error(msg=f'url={response.url}, status_code={error.httpResponse}, '
+                                            f'message={error.message}')
+
+        except TheTeamCowboyAPIDeadlineException:
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+
+        except TheTeamCowboyAPIException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        except GeneratorExit:
+            # Closed early by the caller, which says nothing about the api
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        finally:
+            if response is not None:
+                response.close()
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _send(self, httpmethod: str, endpoint: str, ep_params: Dict = None, data: Dict = None) -> TCResult:
+        """
+        Send a request to endpoint and return the parsed TCResult
+        """
+        logline_post = " ,".join((f'url={self.url + endpoint}', 'success={}, status_code={}, message={}, url={}'))
+        response = self._transmit(httpmethod, endpoint, ep_params=ep_params, data=data)
+
+        return self._parse(response, logline_post)
+
+    def _transmit(self, httpmethod: str, endpoint: str, ep_params: Dict = None,
+                    data: Dict = None, stream: bool = False) -> requests.Response:
+        """
+        Send a request to endpoint within the rate limit and deadline
+        """
         full_url = self.url + endpoint
         logline_pre = f'url={full_url}'
         logline_post = " ,".join((logline_pre, 'success={}, status_code={}, message={}, url={}'))
 
+        if self.ratelimiter is not None:
+            self.ratelimiter.acquire()
+
+        timeout = tc_deadline.clamp_timeout(self.timeout)
+
         try:
             self._logger.debug(logline_post)
-            response = requests.get(url=full_url, params=ep_params)
+            response = self._session.request(httpmethod, url=full_url, params=ep_params, data=data,
+                                                timeout=timeout, stream=stream)
+
+        except requests.exceptions.Timeout as e:
+            self._logger.error(msg=(str(e)))
+            deadline = tc_deadline.current()
+
+            if deadline is not None and deadline.expired:
+                raise TheTeamCowboyAPIDeadlineException('Deadline exceeded during request') from e
+
+            raise TheTeamCowboyAPIException('Request timed out') from e
 
         except requests.exceptions.RequestException as e:
             self._logger.error(msg=(str(e)))
             raise TheTeamCowboyAPIException('Request failed') from e
 
+        return response
+
+    def _parse(self, response: requests.Response, logline_post: str) -> TCResult:
+        """
+        Turn a Team Cowboy response into a TCResult
+        """
         try:
             data = response.json()
 
@@ -169,7 +518,7 @@ class TCDataAdapter:
             raise TheTeamCowboyAPIException('Bad JSON in response') from e
 
         # Responce code is OK
-        if response.status_code <= 200 and response.status_code <= 299:
+        if response.status_code >= 200 and response.status_code <= 299:
             self._logger.debug(msg=logline_post.format('success',
             response.status_code, response.reason, response.url))
 
@@ -177,21 +526,21 @@ class TCDataAdapter:
                 
                 errorobject = Error(**data["body"])
 
-                if errorobject.httpResponce >= 400 and errorobject.httpResponce <= 499:
+                if errorobject.httpResponse >= 400 and errorobject.httpResponse <= 499:
                     self._logger.error(msg=logline_post.format(errorobject.errorCode,
-                    errorobject.httpResponce, errorobject.message, response.url))
+                    errorobject.httpResponse, errorobject.message, response.url))
 
                     # return TCResult with 404 and empty data
-                    return TCResult(errorobject.httpResponce, message=errorobject.message, data={})
+                    return TCResult(errorobject.httpResponse, message=errorobject.message, data={})
 
-                elif errorobject.httpResponce >= 500 and errorobject.httpResponce <= 599:
+                elif errorobject.httpResponse >= 500 and errorobject.httpResponse <= 599:
                     self._logger.error(msg=logline_post.format(errorobject.errorCode, 
-                    errorobject.httpResponce, errorobject.message, response.url))
+                    errorobject.httpResponse, errorobject.message, response.url))
 
-                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponce}: {errorobject.message}")
+                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponse}: {errorobject.message}")
 
                 else:
-                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponce}: {errorobject.message}")
+                    raise TheTeamCowboyAPIException(f"{errorobject.httpResponse}: {errorobject.message}")
                 
             else:
                 # Everything is juicy, send the data over
@@ -201,7 +550,7 @@ class TCDataAdapter:
             self._logger.error(msg=logline_post.format('Invalid Request',
             response.status_code, response.reason, response.url))
 
-            # return MlbResult with 404 and empty data
+            # return TCResult with 404 and empty data
             return TCResult(response.status_code, message=response.reason, data={})
 
         elif response.status_code >= 500 and response.status_code <= 599:
@@ -0,0 +1,201 @@
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import concurrent.futures
+import contextvars
+import time
+
+from .exceptions import TheTeamCowboyAPIDeadlineException
+
+
+_current_deadline = contextvars.ContextVar('teamcowboyapi_deadline', default=None)
+
+
+class Deadline:
+    """
+    An end-to-end time budget for a block of Team Cowboy calls.
+
+    While the deadline is active every request made through a TCDataAdapter
+    has its connect and read timeouts clamped to the time remaining, and no
+    new request is started once the budget is spent. Nested deadlines never
+    extend an outer one.
+
+    >>> with Deadline(5.0):
+    ...     Teamcowboy.Team_GetEvents(teamid)
+
+    Attributes
+    ----------
+    seconds : float
+        Length of the time budget in seconds
+    expires : float
+        time.monotonic() value at which the deadline runs out
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = float(seconds)
+        self.expires = time.monotonic() + self.seconds
+        self._token = None
+
+    def remaining(self) -> float:
+        """
+        Return the number of seconds left before the deadline, never negative
+        """
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def __enter__(self) -> 'Deadline':
+        outer = _current_deadline.get()
+        effective = outer if outer is not None and outer.expires <= self.expires else self
+        self._token = _current_deadline.set(effective)
+        return effective
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_deadline.reset(self._token)
+        self._token = None
+
+
+def current() -> Optional[Deadline]:
+    """
+    Return the deadline active in the current context, if any
+    """
+    return _current_deadline.get()
+
+
+def clamp_timeout(timeout: Tuple[float, float]) -> Tuple[float, float]:
+    """
+    Clamp a (connect, read) timeout pair to the active deadline
+
+    Parameters
+    ----------
+    timeout : Tuple[float, float]
+        connect and read timeouts in seconds
+
+    Returns
+    -------
+    Tuple[float, float]
+
+    Raises
+    ------
+    TheTeamCowboyAPIDeadlineException
+        if the active deadline has already run out
+    """
+    deadline = _current_deadline.get()
+
+    if deadline is None:
+        return timeout
+
+    remaining = deadline.remaining()
+
+    if remaining <= 0:
+        raise TheTeamCowboyAPIDeadlineException('Deadline exceeded before request was sent')
+
+    connect, read = timeout
+    return (min(connect, remaining), min(read, remaining))
+
+
+def fanout(fn: Callable, items: Iterable, max_workers: int = 4,
+            return_exceptions: bool = False) -> List:
+    """
+    Call fn for every item on a thread pool and return the results in order.
+
+    The active deadline, if any, is carried into the worker threads. When it
+    runs out, work that has not started is cancelled and a
+    TheTeamCowboyAPIDeadlineException is raised holding the results that did
+    finish, keyed by item position.
+
+    Parameters
+    ----------
+    fn : Callable
+        function called with a single item
+    items : Iterable
+        items to fan out over
+    max_workers : int
+        size of the thread pool
+    return_exceptions : bool
+        if True, exceptions raised by fn are returned in place of a result
+        instead of being raised
+
+    Returns
+    -------
+    List
+        results of fn, in the same order as items
+    """
+    items = list(items)
+    results = {}
+
+    try:
+        for index, result in stream(fn, items, max_workers=max_workers, return_exceptions=return_exceptions):
+            results[index] = result
+
+    except TheTeamCowboyAPIDeadlineException as e:
+        raise TheTeamCowboyAPIDeadlineException(str(e), partial=results) from None
+
+    return [results[index] for index in range(len(items))]
+
+
+def stream(fn: Callable, items: Iterable, max_workers: int = 4,
+            return_exceptions: bool = False) -> Iterator[Tuple[int, object]]:
+    """
+    Like fanout, but yield (index, result) pairs as the calls complete.
+
+    Results are not kept once yielded, so a long stream only holds the calls
+    in flight. If the deadline runs out a TheTeamCowboyAPIDeadlineException
+    is raised; the caller already has every result that finished. Closing
+    the generator early cancels the calls that have not started.
+
+    Parameters
+    ----------
+    fn : Callable
+        function called with a single item
+    items : Iterable
+        items to fan out over
+    max_workers : int
+        size of the thread pool
+    return_exceptions : bool
+        if True, exceptions raised by fn are yielded in place of a result
+        instead of being raised
+
+    Yields
+    ------
+    Tuple[int, object]
+        position of the item in items and the result of fn
+    """
+    items = list(items)
+    deadline = _current_deadline.get()
+    completed = 0
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items) or 1)))
+
+    try:
+        futures = {executor.submit(contextvars.copy_context().run, fn, item): index
+                    for index, item in enumerate(items)}
+
+        timeout = deadline.remaining() if deadline is not None else None
+
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                index = futures[future]
+
+                try:
+                    result = future.result()
+
+                except TheTeamCowboyAPIDeadlineException:
+                    raise
+
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+
+                completed += 1
+                yield index, result
+
+        except (concurrent.futures.TimeoutError, TheTeamCowboyAPIDeadlineException):
+            for future in futures:
+                future.cancel()
+            raise TheTeamCowboyAPIDeadlineException(
+                f'Deadline exceeded with {completed} of {len(items)} calls complete') from None
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,313 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from array import array
+from dataclasses import dataclass, field
+import concurrent.futures
+import json
+import multiprocessing
+
+from teamcowboyapi import tc_deadline
+from teamcowboyapi.tc_aggregate import STATUSES
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.objects.attendances import Attendancelist
+from teamcowboyapi.objects.events import Event
+from teamcowboyapi.objects.messages import Message
+from teamcowboyapi.objects.users import User
+
+
+# Attendancebatch.status code of RSVP statuses missing from STATUSES
+UNKNOWN_STATUS = 255
+
+
+@dataclass
+class Eventbatch:
+    """
+    Columnar form of a list of events: one column per field, with ids in
+    array('q') so a batch pickles as a few flat buffers.
+
+    Attributes:
+    -----------
+    eventId : array
+        Event ids
+    teamId : array
+        Team ids
+    locationId : array
+        Location ids, 0 for events without a location
+    status : List[str]
+        Event status, e.g. active or canceled
+    title : List[str]
+        Full event titles
+    startDateTimeUtc : List[str]
+        Start date/times (UTC), None if not set
+    endDateTimeUtc : List[str]
+        End date/times (UTC), None if not set
+    dateLastUpdatedUtc : List[str]
+        When each event was last changed (UTC)
+    """
+    eventId: array = field(default_factory=lambda: array('q'))
+    teamId: array = field(default_factory=lambda: array('q'))
+    locationId: array = field(default_factory=lambda: array('q'))
+    status: List[str] = field(default_factory=list)
+    title: List[str] = field(default_factory=list)
+    startDateTimeUtc: List[Optional[str]] = field(default_factory=list)
+    endDateTimeUtc: List[Optional[str]] = field(default_factory=list)
+    dateLastUpdatedUtc: List[Optional[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.eventId)
+
+    def append(self, event: Dict) -> None:
+        info = event.get('dateTimeInfo') or {}
+        location = event.get('location') or {}
+
+        self.eventId.append(event['eventId'])
+        self.teamId.append(event['team']['teamId'])
+        self.locationId.append(location.get('locationId') or 0)
+        self.status.append(event.get('status'))
+        self.title.append(event.get('titleFull') or event.get('title'))
+        self.startDateTimeUtc.append(info.get('startDateTimeUtc') or None)
+        self.endDateTimeUtc.append(info.get('endDateTimeUtc') or None)
+        self.dateLastUpdatedUtc.append(event.get('dateLastUpdatedUtc'))
+
+
+@dataclass
+class Attendancebatch:
+    """
+    Columnar form of an event's attendance list, one row per user.
+
+    Attributes:
+    -----------
+    userId : array
+        User ids
+    status : array
+        RSVP status of each user as an index into STATUSES, UNKNOWN_STATUS
+        for statuses not in STATUSES
+    addlMale : array
+        Additional male attendees of each user
+    addlFemale : array
+        Additional female attendees of each user
+    gender : List[str]
+        Gender of each user
+    teamMemberType : List[str]
+        Team member type name of each user
+    """
+    userId: array = field(default_factory=lambda: array('q'))
+    status: array = field(default_factory=lambda: array('B'))
+    addlMale: array = field(default_factory=lambda: array('H'))
+    addlFemale: array = field(default_factory=lambda: array('H'))
+    gender: List[Optional[str]] = field(default_factory=list)
+    teamMemberType: List[Optional[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.userId)
+
+    def append(self, entry: Dict) -> None:
+        user, rsvp = entry['user'], entry['rsvpInfo']
+        membertype = (user.get('teamMeta') or {}).get('teamMemberType') or {}
+
+        self.userId.append(user['userId'])
+        self.status.append(STATUSES.index(rsvp['status']) if rsvp['status'] in STATUSES else UNKNOWN_STATUS)
+        self.addlMale.append(rsvp.get('addlMale') or 0)
+        self.addlFemale.append(rsvp.get('addlFemale') or 0)
+        self.gender.append(user.get('gender'))
+        self.teamMemberType.append(membertype.get('name'))
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of users by RSVP status
+        """
+        totals = [0] * len(STATUSES)
+
+        for code in self.status:
+            if code != UNKNOWN_STATUS:
+                totals[code] += 1
+
+        return dict(zip(STATUSES, totals))
+
+
+def _events(body: List[Dict]) -> List[Event]:
+    return [Event(**event) for event in body]
+
+
+def _eventbatch(body: List[Dict]) -> Eventbatch:
+    batch = Eventbatch()
+    for event in body:
+        batch.append(event)
+    return batch
+
+
+def _attendancebatch(body: Dict) -> Attendancebatch:
+    batch = Attendancebatch()
+    for entry in body['users']:
+        batch.append(entry)
+    return batch
+
+
+# Builds the same objects the Teamcowboy method returns from a response body
+MODELS: Dict[str, Callable] = {
+    'Event_Get': lambda body: Event(**body) if body.get('eventId') else None,
+    'Event_GetAttendanceList': lambda body: Attendancelist(**body) if body.get('users') else None,
+    'Team_GetEvents': _events,
+    'User_GetTeamEvents': _events,
+    'Team_GetMessages': lambda body: [Message(**msg) for msg in body],
+    'Team_GetRoster': lambda body: [User(**user) for user in body],
+}
+
+COLUMNS: Dict[str, Callable] = {
+    'Event_GetAttendanceList': _attendancebatch,
+    'Team_GetEvents': _eventbatch,
+    'User_GetTeamEvents': _eventbatch,
+}
+
+
+def decode(method: str, raw: bytes, columns: bool = False) -> Any:
+    """
+    Decode a raw Team Cowboy response body into the method's model objects
+
+    Runs in worker processes, so it only takes and returns picklable values.
+    Like the Teamcowboy methods, a 4xx error or an empty body gives None.
+
+    Parameters:
+    -----------
+    method : str
+        Team Cowboy method the body was returned by
+    raw : bytes
+        Response body from Teamcowboy.raw
+    columns : bool
+        Return an Eventbatch or Attendancebatch instead of model objects,
+        for the methods in COLUMNS
+
+    Returns:
+    --------
+    Model objects, a columnar batch or None
+    """
+    builders = COLUMNS if columns else MODELS
+
+    if method not in builders:
+        raise TheTeamCowboyAPIException(f"No {'columnar ' if columns else ''}decoder for {method}")
+
+    try:
+        data = json.loads(raw)
+
+    except ValueError as e:
+        raise TheTeamCowboyAPIException('Bad JSON in response') from e
+
+    if data.get('success') == False:
+        error = data.get('body') or {}
+        status = error.get('httpResponse') or 0
+
+        if 400 <= status <= 499:
+            return None
+
+        raise TheTeamCowboyAPIException(f"{status}: {error.get('message')}")
+
+    body = data.get('body')
+    return builders[method](body) if body else None
+
+
+class DecodePool:
+    """
+    Process pool that decodes raw responses off the calling process, so
+    decoding large responses uses more than one core.
+
+    Worker processes are started on first use with the forkserver method
+    where available (spawn elsewhere), which is safe while other threads
+    are making requests.
+
+    >>> with DecodePool() as pool:
+    ...     for index, events in fetch_decoded(Teamcowboy, calls, pool):
+    ...         ...
+
+    Attributes
+    ----------
+    max_workers : int
+        number of worker processes, defaults to the number of CPUs
+    """
+
+    def __init__(self, max_workers: int = None, mp_context=None):
+        self.max_workers = max_workers
+        self._mp_context = mp_context
+        self._executor = None
+
+    def __enter__(self) -> 'DecodePool':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, method: str, raw: bytes, columns: bool = False) -> concurrent.futures.Future:
+        """
+        Queue decode(method, raw, columns) in a worker process
+        """
+        if self._executor is None:
+            context = self._mp_context
+
+            if context is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers,
+                                                                    mp_context=context)
+
+        return self._executor.submit(decode, method, raw, columns)
+
+    def decode(self, method: str, raw: bytes, columns: bool = False) -> Any:
+        return self.submit(method, raw, columns).result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def fetch_decoded(tc, calls: Iterable[Tuple[str, Dict]], pool: DecodePool, columns: bool = False,
+                    max_workers: int = 4) -> Iterator[Tuple[int, Any]]:
+    """
+    Fetch raw responses on threads and decode them in a DecodePool, yielding
+    (index, result) as each call is decoded
+
+    Requests go through the client's adapter (rate limiter, breaker and
+    deadline apply) but skip its cache, and listeners are not called.
+
+    >>> calls = [('Event_GetAttendanceList', {'teamId': teamid, 'eventId': eventid}) for eventid in eventids]
+    >>> for index, batch in fetch_decoded(Teamcowboy, calls, pool, columns=True):
+    ...     batch.counts()
+
+    Parameters:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    calls : Iterable[Tuple[str, Dict]]
+        (method, params) of each GET call
+    pool : DecodePool
+        Pool the responses are decoded in
+    columns : bool
+        Decode into columnar batches, see decode
+    max_workers : int
+        Number of requests in flight at once
+
+    Yields:
+    -------
+    Tuple[int, Any]
+        position of the call in calls and its decoded result
+    """
+    calls = list(calls)
+    pending = {}
+
+    def fetch(call: Tuple[str, Dict]) -> bytes:
+        method, params = call
+        return tc.raw(method, **params)
+
+    for index, raw in tc_deadline.stream(fetch, calls, max_workers=max_workers):
+        pending[pool.submit(calls[index][0], raw, columns)] = index
+
+        for future in [future for future in pending if future.done()]:
+            yield pending.pop(future), future.result()
+
+    deadline = tc_deadline.current()
+
+    try:
+        for future in concurrent.futures.as_completed(pending, timeout=deadline.remaining() if deadline else None):
+            yield pending[future], future.result()
+
+    except concurrent.futures.TimeoutError:
+        raise TheTeamCowboyAPIDeadlineException('Deadline exceeded while decoding responses')
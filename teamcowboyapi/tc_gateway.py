@@ -0,0 +1,242 @@
+from typing import Dict, Iterable, Tuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+import concurrent.futures
+import json
+import logging
+import threading
+
+from . import tc_deadline
+from .exceptions import (TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException,
+                            TheTeamCowboyAPICircuitOpenException)
+from .tc_dataadapter import TCResult
+
+
+# Read methods served by default
+READ_METHODS = ('Event_Get', 'Event_GetAttendanceList', 'Message_Get', 'Team_Get', 'Team_GetEvents',
+                'Team_GetMessages', 'Team_GetRoster', 'Team_GetSeasons', 'User_Get',
+                'User_GetNextTeamEvent', 'User_GetTeamEvents', 'User_GetTeamMessages', 'User_GetTeams')
+
+# Params the gateway sets itself, callers may not pass them
+RESERVED_PARAMS = ('request_type', 'private_key', 'api_key', 'method', 'timestamp', 'nonce',
+                    'responce_type', 'userToken', 'sig')
+
+
+class Gateway:
+    """
+    Local HTTP gateway serving Team Cowboy read methods to other services
+    through one client.
+
+    A GET of /<method>?<params> is answered with the same JSON envelope as
+    the api, {"success": ..., "body": ...}. Every caller shares the client's
+    adapter, so its TCCache, RateLimiter and CircuitBreaker apply to the
+    whole fleet, and identical requests that arrive while one is in flight
+    wait for its answer instead of calling the api again. Errors the client
+    raises are answered with 502 (api failure), 503 (breaker open) or 504
+    (timeout).
+
+    The client's token is used for every request, so only expose the
+    gateway to services that may see everything that user can.
+
+    >>> tc = Teamcowboy(privatekey, publickey, username, password,
+    ...                 cache=TCCache(ttl=60, stale_while_revalidate=300),
+    ...                 ratelimiter=RateLimiter(rate=5, burst=10))
+    >>> with Gateway(tc, port=8080) as gateway:
+    ...     gateway.serve_forever()
+
+    $ curl 'http://127.0.0.1:8080/Team_GetEvents?teamId=123&qty=10'
+
+    Attributes:
+    ----------
+    tc : Teamcowboy
+        Authenticated client every request is sent with
+    methods : Iterable[str]
+        Team Cowboy methods that may be called, READ_METHODS by default
+    host : str
+        Address to listen on
+    port : int
+        Port to listen on, 0 picks a free one (see address)
+    timeout : float
+        Seconds each request may take, including time spent waiting for an
+        identical request in flight
+    logger : logging.Logger
+        logger
+    """
+
+    def __init__(self, tc, methods: Iterable[str] = READ_METHODS, host: str = '127.0.0.1', port: int = 8080,
+                    timeout: float = 30.0, logger: logging.Logger = None):
+        self.tc = tc
+        self.methods = frozenset(methods)
+        self.timeout = timeout
+        self._logger = logger or logging.getLogger(__name__)
+        self._inflight: Dict[Tuple, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._serving = False
+        self._closed = False
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.gateway = self
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        The (host, port) the gateway listens on
+        """
+        return self._server.server_address[:2]
+
+    def call(self, method: str, params: Dict[str, str]) -> TCResult:
+        """
+        Call method through the client, sharing the answer with identical
+        calls made while it is in flight
+
+        Parameters:
+        -----------
+        method : str
+            Team Cowboy method name
+        params : Dict[str, str]
+            The method's parameters
+
+        Returns:
+        --------
+        TCResult
+        """
+        key = (method, tuple(sorted(params.items())))
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+
+            if leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+
+        if not leader:
+            deadline = tc_deadline.current()
+
+            try:
+                return future.result(timeout=deadline.remaining() if deadline is not None else None)
+
+            except concurrent.futures.TimeoutError as e:
+                raise TheTeamCowboyAPIDeadlineException(f'Deadline exceeded waiting for {method}') from e
+
+        try:
+            result = self.tc.request(method, **params)
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        else:
+            future.set_result(result)
+            return result
+
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def serve_forever(self) -> None:
+        """
+        Handle requests until close is called from another thread
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._serving = True
+
+        self._logger.info(msg=f'Gateway listening on {self.address[0]}:{self.address[1]}')
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """
+        Handle requests on a background thread
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name='teamcowboyapi-gateway', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stop serving, wherever serve_forever runs, and close the listening 
+        socket. The client is left open.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            serving = self._serving
+
+        # shutdown waits for the serve_forever loop, so it is only called once
+        # one has started; a loop that has not started sees _closed instead
+        if serving:
+            self._server.shutdown()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._server.server_close()
+
+    def __enter__(self) -> 'Gateway':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'teamcowboyapi-gateway'
+
+    def do_GET(self) -> None:
+        gateway = self.server.gateway
+        url = urlsplit(self.path)
+        method = url.path.strip('/')
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+
+        if method not in gateway.methods:
+            return self._error(HTTPStatus.NOT_FOUND, f'Unknown method {method!r}')
+
+        reserved = sorted(set(params) & set(RESERVED_PARAMS))
+
+        if reserved:
+            return self._error(HTTPStatus.BAD_REQUEST, f'Reserved params {", ".join(reserved)}')
+
+        try:
+            with tc_deadline.Deadline(gateway.timeout):
+                result = gateway.call(method, params)
+
+        except TheTeamCowboyAPICircuitOpenException as e:
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+
+        except TheTeamCowboyAPIDeadlineException as e:
+            return self._error(HTTPStatus.GATEWAY_TIMEOUT, str(e))
+
+        except TheTeamCowboyAPIException as e:
+            return self._error(HTTPStatus.BAD_GATEWAY, str(e))
+
+        if 200 <= result.status_code <= 299:
+            return self._send(HTTPStatus.OK, {"success": True, "body": result.data})
+
+        try:
+            status = HTTPStatus(result.status_code)
+        except ValueError:
+            status = HTTPStatus.BAD_GATEWAY
+
+        self._error(status, result.message)
+
+    def _error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, {"success": False, "body": {"errorCode": status.phrase.replace(' ', ''),
+                                                        "httpResponse": status.value, "message": message}})
+
+    def _send(self, status: HTTPStatus, document: dict) -> None:
+        body = json.dumps(document).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        self.server.gateway._logger.debug(msg=f'{self.address_string()} {format % args}')
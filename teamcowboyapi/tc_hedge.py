@@ -0,0 +1,108 @@
+from typing import Dict, Iterable
+from collections import deque
+import math
+import threading
+
+
+class HedgePolicy:
+    """
+    Settings and bookkeeping for hedged GET requests.
+
+    When a hedged method has not answered within the delay, one duplicate
+    request (signed with a fresh nonce) is sent and whichever answer comes
+    back first is used. The delay is the given percentile of recent latencies
+    for that method, and hedges are paid for out of a budget so they can never
+    add more than roughly `budget` extra load.
+
+    Attributes
+    ----------
+    methods : Iterable[str]
+        Team Cowboy methods that may be hedged. Only idempotent GET methods
+        should be listed.
+    percentile : float
+        latency percentile (0 - 100) used as the hedge delay
+    budget : float
+        hedges allowed per request, e.g. 0.05 allows at most ~5% extra calls
+    burst : float
+        maximum number of unspent hedges that can be saved up
+    min_delay : float
+        lower bound for the hedge delay in seconds
+    max_delay : float
+        upper bound for the hedge delay in seconds, also used until enough
+        samples have been recorded
+    min_samples : int
+        latencies needed for a method before its percentile is trusted
+    sample_size : int
+        number of recent latencies kept per method
+    """
+
+    def __init__(self, methods: Iterable[str] = ('Event_GetAttendanceList', 'Team_GetRoster'),
+                    percentile: float = 95.0, budget: float = 0.05, burst: float = 5.0,
+                    min_delay: float = 0.05, max_delay: float = 2.0,
+                    min_samples: int = 20, sample_size: int = 200):
+        self.methods = frozenset(methods)
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.sample_size = sample_size
+
+        self._samples: Dict[str, deque] = {}
+        self._tokens = 0.0
+        self._hedges = 0
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def applies(self, method: str) -> bool:
+        return method in self.methods
+
+    def delay(self, method: str) -> float:
+        """
+        Return how long to wait for method before sending a hedge
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(method, ()))
+
+        if len(samples) < self.min_samples:
+            return self.max_delay
+
+        index = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return min(self.max_delay, max(self.min_delay, samples[index]))
+
+    def record(self, method: str, seconds: float) -> None:
+        """
+        Record the latency of a completed request for method
+        """
+        with self._lock:
+            if method not in self._samples:
+                self._samples[method] = deque(maxlen=self.sample_size)
+            self._samples[method].append(seconds)
+
+    def note_request(self) -> None:
+        """
+        Credit the hedge budget for one hedgeable request
+        """
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def try_hedge(self) -> bool:
+        """
+        Spend one hedge from the budget, returning False if none is left
+        """
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._hedges += 1
+                return True
+
+            return False
+
+    def metrics(self) -> Dict:
+        """
+        Return hedging counters as a flat dict of metrics
+        """
+        with self._lock:
+            return {"requests": self._requests, "hedges": self._hedges}
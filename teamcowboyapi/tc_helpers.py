@@ -1,4 +1,57 @@
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from datetime import datetime, timezone
 import hashlib
+import importlib
+import itertools
+import os
+import secrets
+import sys
+import threading
+import time
+
+# Digits of the random per-process nonce prefix, 64 bits of entropy so
+# unrelated processes practically never draw the same sequence
+NONCE_PREFIX_DIGITS = 20
+
+_nonce_lock = threading.Lock()
+_nonce_prefix = None
+_nonce_counter = None
+
+
+def _reset_nonce() -> None:
+    global _nonce_lock, _nonce_prefix, _nonce_counter
+
+    # A forked child must not continue its parent's sequence; the lock is
+    # replaced too in case another thread held it at the fork
+    _nonce_lock = threading.Lock()
+    _nonce_prefix = f"{secrets.randbits(64):0{NONCE_PREFIX_DIGITS}d}"
+    _nonce_counter = itertools.count(1)
+
+
+_reset_nonce()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_nonce)
+
+
+def createnonce() -> str:
+    """
+    Return a request nonce that is unique across threads and processes.
+
+    Nonces are a random 64 bit per-process prefix followed by a zero padded 
+    counter, so they increase within a process. A forked child draws a new 
+    prefix, and two processes share a sequence only if their prefixes 
+    collide, which is negligible even across billions of processes. Unlike 
+    a time.time() based nonce, any number of nonces can be made in the same 
+    instant.
+
+    Returns:
+    --------
+    str of 30 digits
+    """
+    with _nonce_lock:
+        return f"{_nonce_prefix}{next(_nonce_counter):010d}"
+
 
 def createrequestdata(requestparams: dict) -> dict:
     """
@@ -22,4 +75,111 @@ def createrequestdata(requestparams: dict) -> dict:
 
     requestparams["sig"] = sig
 
-    return requestparams
\ No newline at end of file
+    return requestparams
+
+def resignrequestdata(requestdata: dict, privatekey: str, requesttype: str = "GET") -> dict:
+    """
+    Return a copy of signed request data with a fresh timestamp, nonce and 
+    signature, so the same request can be sent again.
+
+    Parameters:
+    -----------
+    requestdata : dict
+        Request data as returned by createrequestdata
+    privatekey : str
+        Private api key the request was signed with
+    requesttype : str
+        GET or POST
+
+    Returns:
+    --------
+    dict
+    """
+    rdata = {key: value for key, value in requestdata.items() if key != "sig"}
+
+    rdata |= {
+        "request_type": requesttype,
+        "private_key": privatekey,
+        "timestamp": int(time.time()),
+        "nonce": createnonce(),
+    }
+
+    return createrequestdata(rdata)
+
+def paginate(fetch: Callable, qty: int = 10, **params) -> Iterator:
+    """
+    Yield every item from a paged Team Cowboy method, one page at a time.
+
+    Parameters:
+    -----------
+    fetch : Callable
+        A Teamcowboy method that takes offset and qty, e.g. 
+        functools.partial(Teamcowboy.Team_GetEvents, teamId)
+    qty : int
+        Page size
+    params : dict
+        Extra params passed to fetch on every page
+
+    Returns:
+    --------
+    Iterator over the items of every page
+    """
+    offset = 0
+
+    while True:
+        page = fetch(offset=offset, qty=qty, **params) or []
+
+        yield from page
+
+        if len(page) < qty:
+            return
+
+        offset += qty
+
+def parse_utc(value: str) -> Optional[datetime]:
+    """
+    Parse an api UTC date/time string (YYYY-MM-DD HH:MM:SS)
+    """
+    if not value:
+        return None
+
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+    except ValueError:
+        return None
+
+
+def lazyattributes(package: str, attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Return module level __getattr__ and __dir__ functions for a package 
+    whose attributes are imported on first use instead of with the package.
+
+    >>> __getattr__, __dir__ = lazyattributes(__name__, {'Event': '.event'})
+
+    Parameters:
+    -----------
+    package : str
+        __name__ of the package
+    attributes : Dict[str, str]
+        Module each attribute is imported from, relative to package
+
+    Returns:
+    --------
+    (__getattr__, __dir__)
+    """
+    module = sys.modules[package]
+
+    def __getattr__(name: str):
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(attributes[name], package), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(attributes))
+
+    return __getattr__, __dir__
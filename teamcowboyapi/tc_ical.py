@@ -0,0 +1,200 @@
+from typing import Iterable, Iterator, Optional, TextIO
+from collections import OrderedDict
+import threading
+
+from teamcowboyapi.objects.events import Event
+
+
+CRLF = '\r\n'
+
+# RFC 5545 limits content lines to 75 octets, excluding the line break
+MAX_LINE = 75
+
+PRODID = '-//TeamCowboyApi-Python//Team Schedule//EN'
+
+STATUSES = {'active': 'CONFIRMED', 'canceled': 'CANCELLED', 'postponed': 'TENTATIVE'}
+
+
+def escape(text: Optional[str]) -> str:
+    """
+    Escape a TEXT property value
+    """
+    if not text:
+        return ''
+
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def fold(line: str) -> str:
+    """
+    Fold a content line into 75 octet pieces joined by CRLF and a space,
+    never splitting a UTF-8 character
+    """
+    if len(line.encode('UTF-8')) <= MAX_LINE:
+        return line + CRLF
+
+    pieces = []
+    current = []
+    size = 0
+    limit = MAX_LINE
+
+    for char in line:
+        width = len(char.encode('UTF-8'))
+
+        if size + width > limit:
+            pieces.append(''.join(current))
+            current, size = [], 0
+            # Continuation lines spend one octet on the leading space
+            limit = MAX_LINE - 1
+
+        current.append(char)
+        size += width
+
+    pieces.append(''.join(current))
+    return (CRLF + ' ').join(pieces) + CRLF
+
+
+def utc(value: Optional[str]) -> Optional[str]:
+    """
+    Convert an api UTC date/time (YYYY-MM-DD HH:MM:SS) to iCalendar UTC form,
+    None if the api left it out
+    """
+    if not value:
+        return None
+
+    return value.replace('-', '').replace(':', '').replace(' ', 'T') + 'Z'
+
+
+def vevent(event: Event) -> str:
+    """
+    Render an Event as a folded VEVENT block
+    """
+    info = event.dateTimeInfo
+    updated = utc(event.dateLastUpdatedUtc)
+    start = utc(info.startDateTimeUtc)
+    end = utc(info.endDateTimeUtc)
+    lines = ['BEGIN:VEVENT', f'UID:{event.eventId}@teamcowboy.com']
+
+    if updated:
+        lines.extend((f'DTSTAMP:{updated}', f'LAST-MODIFIED:{updated}'))
+
+    if info.startTimeTBD or not start:
+        # Unknown start time, so the event is shown as an all-day entry
+        if info.startDateLocal:
+            lines.append(f'DTSTART;VALUE=DATE:{info.startDateLocal.replace("-", "")}')
+    else:
+        lines.append(f'DTSTART:{start}')
+
+        if end and not info.endTimeTBD:
+            lines.append(f'DTEND:{end}')
+
+    lines.append(f'SUMMARY:{escape(event.titleFull or event.title)}')
+
+    if event.location is not None:
+        address = event.location.address.displaySingleLine if event.location.address else ''
+        lines.append(f'LOCATION:{escape(", ".join(filter(None, (event.location.name, address))))}')
+
+    if event.comments:
+        lines.append(f'DESCRIPTION:{escape(event.comments)}')
+
+    lines.append(f'STATUS:{STATUSES.get(event.status, "CONFIRMED")}')
+    lines.append('END:VEVENT')
+
+    return ''.join(fold(line) for line in lines)
+
+
+class VEventCache:
+    """
+    Rendered VEVENT blocks by eventId, reused until the event's
+    dateLastUpdatedUtc changes.
+
+    Safe to share between threads writing different feeds, so an event that
+    appears in thousands of subscriber feeds is rendered once per change.
+
+    Attributes
+    ----------
+    max_entries : int
+        number of events kept, least recently used are evicted first
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, event: Event) -> str:
+        """
+        Return the VEVENT for event, rendering it only if it changed
+        """
+        with self._lock:
+            entry = self._entries.get(event.eventId)
+
+            if entry is not None and entry[0] == event.dateLastUpdatedUtc:
+                self._entries.move_to_end(event.eventId)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+
+        text = vevent(event)
+
+        with self._lock:
+            self._entries[event.eventId] = (event.dateLastUpdatedUtc, text)
+            self._entries.move_to_end(event.eventId)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return text
+
+
+def stream_calendar(events: Iterable[Event], name: str = None, cache: VEventCache = None) -> Iterator[str]:
+    """
+    Yield an iCalendar feed piece by piece
+
+    events is consumed lazily, so a generator such as tc_helpers.paginate
+    is fetched one page at a time while the feed is written and the feed is
+    never held in memory.
+
+    >>> fetch = functools.partial(Teamcowboy.Team_GetEvents, teamid)
+    >>> with open('team.ics', 'w', newline='') as f:
+    ...     write_calendar(f, tc_helpers.paginate(fetch, qty=50), name='Team', cache=cache)
+
+    Parameters:
+    -----------
+    events : Iterable[Event]
+        Events to export
+    name : str
+        Optional calendar name shown by clients
+    cache : VEventCache
+        Optional cache of rendered events
+
+    Returns:
+    --------
+    Iterator of str chunks that together form the .ics file
+    """
+    header = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{PRODID}', 'CALSCALE:GREGORIAN', 'METHOD:PUBLISH']
+
+    if name:
+        header.append(f'X-WR-CALNAME:{escape(name)}')
+
+    yield ''.join(fold(line) for line in header)
+
+    for event in events:
+        yield cache.render(event) if cache is not None else vevent(event)
+
+    yield fold('END:VCALENDAR')
+
+
+def write_calendar(fp: TextIO, events: Iterable[Event], name: str = None, cache: VEventCache = None) -> None:
+    """
+    Write an iCalendar feed to a text file opened with newline=''
+    """
+    for chunk in stream_calendar(events, name=name, cache=cache):
+        fp.write(chunk)
@@ -0,0 +1,451 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import requests
+
+from . import tc_deadline
+from .exceptions import TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.objects.photos import Profilephoto
+
+
+# Photo variants, smallest first, with their nominal longest edge in pixels.
+# None is the original upload.
+VARIANTS = (('thumbUrl', 64), ('smallUrl', 200), ('fullUrl', None))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_used ON blobs (used);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    lastModified TEXT,
+    checked REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_digest ON urls (digest);
+"""
+
+
+def pick(photo: Union[Profilephoto, dict], size: int = None) -> Optional[str]:
+    """
+    Return the URL of the smallest variant of photo at least size pixels
+    on its longest edge, or of the largest variant there is if none is
+    big enough
+
+    Parameters:
+    -----------
+    photo : Union[Profilephoto, dict]
+        e.g. User.profilePhoto or Team.teamPhoto
+    size : int
+        Pixels needed, None for the original
+
+    Returns:
+    --------
+    str, or None if photo has no URLs
+    """
+    if photo is None:
+        return None
+
+    if isinstance(photo, dict):
+        photo = Profilephoto(**photo)
+
+    available = [(getattr(photo, name), edge) for name, edge in VARIANTS if getattr(photo, name)]
+
+    for url, edge in available:
+        if edge is None or (size is not None and edge >= size):
+            return url
+
+    return available[-1][0] if available else None
+
+
+@dataclass
+class Cachedphoto:
+    """
+    A cached download of a photo URL.
+
+    Attributes:
+    -----------
+    url : str
+        URL the photo was downloaded from
+    digest : str
+        SHA-256 of the content, which names the file
+    path : Path
+        File holding the content
+    etag : str
+        ETag the server sent with it
+    lastModified : str
+        Last-Modified the server sent with it
+    checked : float
+        time.time() of the last download or revalidation
+    """
+    url: str
+    digest: str
+    path: Path
+    etag: Optional[str]
+    lastModified: Optional[str]
+    checked: float
+
+
+class PhotoCache:
+    """
+    Content-addressed, size-bounded disk cache of downloaded photos.
+
+    Each distinct content is stored once, in a file named by its SHA-256
+    digest, however many URLs serve it. An SQLite index maps URLs to
+    digests along with the validators needed for conditional requests. When
+    the files add up to more than max_bytes, the least recently used are
+    deleted together with the URLs pointing at them. Pinned files are never
+    deleted, so the cache may exceed max_bytes while they are pinned.
+
+    Attributes:
+    -----------
+    directory : str
+        Directory holding the files and the index, created if missing
+    max_bytes : int
+        Upper bound on the size of the stored files
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pins = Counter()
+        self._db = sqlite3.connect(str(self.directory / 'index.sqlite3'), check_same_thread=False)
+
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Total bytes of the stored files
+        """
+        with self._lock:
+            return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest
+
+    def lookup(self, url: str, pin: bool = False) -> Optional[Cachedphoto]:
+        """
+        Return the cached download of url, if its file is still there. With 
+        pin, its file is pinned until unpin is called.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT digest, etag, lastModified, checked FROM urls WHERE url = ?',
+                                    (url,)).fetchone()
+
+            if row is None or not self.path(row[0]).exists():
+                return None
+
+            if pin:
+                self._pins[row[0]] += 1
+
+        return Cachedphoto(url, row[0], self.path(row[0]), row[1], row[2], row[3])
+
+    def store(self, url: str, content: bytes, etag: str = None, lastModified: str = None,
+                pin: bool = False) -> Path:
+        """
+        Store content downloaded from url and return the file holding it. 
+        With pin, the file is pinned until unpin is called; otherwise it is 
+        only safe from eviction until the next store.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path(digest)
+        now = time.time()
+
+        if not path.exists():
+            self._write(path, content)
+
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO blobs (digest, size, used) VALUES (?, ?, ?)',
+                                (digest, len(content), now))
+            self._db.execute('INSERT OR REPLACE INTO urls (url, digest, etag, lastModified, checked) '
+                                'VALUES (?, ?, ?, ?, ?)', (url, digest, etag, lastModified, now))
+
+            # Another thread may have evicted the same content since it was written
+            if not path.exists():
+                self._write(path, content)
+
+            if pin:
+                self._pins[digest] += 1
+
+            self._evict(keep=digest)
+
+        return path
+
+    def unpin(self, digest: str) -> None:
+        """
+        Release one pin taken by lookup or store
+        """
+        with self._lock:
+            self._pins[digest] -= 1
+
+            if self._pins[digest] <= 0:
+                del self._pins[digest]
+
+    def touch(self, url: str) -> None:
+        """
+        Record that url was revalidated or served, keeping its file from eviction
+        """
+        now = time.time()
+
+        with self._lock, self._db:
+            self._db.execute('UPDATE urls SET checked = ? WHERE url = ?', (now, url))
+            self._db.execute('UPDATE blobs SET used = ? WHERE digest = (SELECT digest FROM urls WHERE url = ?)',
+                                (now, url))
+
+    def _write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(exist_ok=True)
+
+        # Written under a temporary name so readers never see part of a file
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(content)
+
+        os.replace(temp, path)
+
+    def _evict(self, keep: str) -> None:
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        for digest, size in self._db.execute('SELECT digest, size FROM blobs WHERE digest != ? ORDER BY used',
+                                                (keep,)).fetchall():
+            if digest in self._pins:
+                continue
+
+            self._db.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+            self._db.execute('DELETE FROM urls WHERE digest = ?', (digest,))
+
+            try:
+                self.path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+            if total <= self.max_bytes:
+                return
+
+
+class PhotoFetcher:
+    """
+    Downloads photos concurrently over pooled connections into a PhotoCache.
+
+    A URL already in the cache is revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged photo costs a 304 and no download.
+    Within max_age of the last check it is served without any request.
+
+    >>> fetcher = PhotoFetcher(PhotoCache('~/.cache/teamcowboy-photos'))
+    >>> paths = fetcher.photos([user.profilePhoto for user in Teamcowboy.Team_GetRoster(teamid)], size=150)
+
+    Attributes:
+    -----------
+    cache : PhotoCache
+        Where downloads are stored
+    max_workers : int
+        Photos downloaded at once, and connections kept open per host
+    timeout : Tuple[float, float]
+        connect and read timeouts in seconds, clamped to the active
+        tc_deadline.Deadline
+    max_age : float
+        Seconds after a download or revalidation during which a cached
+        photo is served without asking the server
+    logger : logging.Logger
+        logger
+    """
+
+    def __init__(self, cache: PhotoCache, max_workers: int = 8, timeout: Tuple[float, float] = (3.05, 30),
+                    max_age: float = 0.0, logger: logging.Logger = None):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_age = max_age
+        self._logger = logger or logging.getLogger(__name__)
+
+        self._session = requests.Session()
+        self._session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=max_workers))
+        self._session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=max_workers))
+
+    def close(self) -> None:
+        self._session.close()
+
+    def fetch(self, url: str) -> Optional[Path]:
+        """
+        Return the file holding the photo at url, downloading it only if it
+        is not cached or has changed. The file stays until a later store
+        evicts it; see fetch_many for photos used together.
+
+        Returns:
+        --------
+        Path, or None if the server answered with a 4xx error
+
+        Raises:
+        -------
+        TheTeamCowboyAPIException
+            if the request failed or the server answered with another error
+        """
+        pinned = self._fetch(url)
+
+        if pinned is None:
+            return None
+
+        self.cache.unpin(pinned[1])
+        return pinned[0]
+
+    def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[Path]]:
+        """
+        Fetch every URL at once. URLs that could not be fetched map to None
+        and the error is logged; an expired deadline is raised.
+
+        Files of the batch are pinned until all of it is fetched, so storing
+        one photo never evicts another of the same batch. A batch larger
+        than the cache's max_bytes is kept whole and trimmed by later
+        stores, so read the files before fetching more from other threads.
+
+        Returns:
+        --------
+        Dict of URL to Path
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        pinned = []
+        lock = threading.Lock()
+        done = False
+
+        def fetch(url: str) -> Optional[Path]:
+            result = self._fetch(url)
+
+            if result is None:
+                return None
+
+            with lock:
+                if not done:
+                    pinned.append(result[1])
+                    return result[0]
+
+            # Finished after the batch gave up at its deadline
+            self.cache.unpin(result[1])
+            return result[0]
+
+        try:
+            results = tc_deadline.fanout(fetch, urls, max_workers=self.max_workers, return_exceptions=True)
+
+        finally:
+            with lock:
+                done = True
+
+            for digest in pinned:
+                self.cache.unpin(digest)
+
+        paths = {}
+
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                self._logger.warning(msg=f'Photo {url} not fetched: {result}')
+                result = None
+
+            paths[url] = result
+
+        return paths
+
+    def _fetch(self, url: str) -> Optional[Tuple[Path, str]]:
+        """
+        fetch, returning the file and its digest with the file pinned
+        """
+        cached = self.cache.lookup(url, pin=True)
+        headers = {}
+
+        try:
+            if cached is not None:
+                if time.time() - cached.checked < self.max_age:
+                    self.cache.touch(url)
+                    return cached.path, cached.digest
+
+                if cached.etag:
+                    headers['If-None-Match'] = cached.etag
+                if cached.lastModified:
+                    headers['If-Modified-Since'] = cached.lastModified
+
+            response = self._get(url, headers)
+
+            if response.status_code == 304 and cached is not None:
+                self.cache.touch(url)
+                return cached.path, cached.digest
+
+        except BaseException:
+            if cached is not None:
+                self.cache.unpin(cached.digest)
+            raise
+
+        if cached is not None:
+            self.cache.unpin(cached.digest)
+
+        if 400 <= response.status_code <= 499:
+            self._logger.error(msg=f'url={url}, status_code={response.status_code}, message={response.reason}')
+            return None
+
+        if not 200 <= response.status_code <= 299:
+            raise TheTeamCowboyAPIException(f"{response.status_code}: {response.reason}")
+
+        path = self.cache.store(url, response.content, etag=response.headers.get('ETag'),
+                                lastModified=response.headers.get('Last-Modified'), pin=True)
+        return path, path.name
+
+    def _get(self, url: str, headers: Dict) -> requests.Response:
+        try:
+            return self._session.get(url, headers=headers, timeout=tc_deadline.clamp_timeout(self.timeout))
+
+        except requests.exceptions.Timeout as e:
+            deadline = tc_deadline.current()
+
+            if deadline is not None and deadline.expired:
+                raise TheTeamCowboyAPIDeadlineException('Deadline exceeded during request') from e
+
+            raise TheTeamCowboyAPIException(f'Request for {url} timed out') from e
+
+        except requests.exceptions.RequestException as e:
+            raise TheTeamCowboyAPIException(f'Request for {url} failed') from e
+
+    def photo(self, photo: Union[Profilephoto, dict], size: int = None) -> Optional[Path]:
+        """
+        Fetch the smallest variant of photo that is at least size pixels,
+        see pick
+        """
+        url = pick(photo, size)
+        return self.fetch(url) if url else None
+
+    def photos(self, photos: Iterable[Union[Profilephoto, dict]], size: int = None) -> List[Optional[Path]]:
+        """
+        Fetch the smallest variant of every photo that is at least size
+        pixels, concurrently
+
+        Returns:
+        --------
+        List of Path, None where there is no photo or it could not be fetched
+        """
+        urls = [pick(photo, size) for photo in photos]
+        paths = self.fetch_many(urls)
+
+        return [paths.get(url) if url else None for url in urls]
@@ -0,0 +1,263 @@
+from typing import Any, Callable, Hashable, Tuple
+from collections import deque
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import threading
+import time
+
+from . import tc_helpers
+from .exceptions import TheTeamCowboyAPIException
+from .tc_api import Teamcowboy
+from .tc_cache import TCCache
+from .tc_circuitbreaker import CircuitBreaker
+from .tc_dataadapter import TCDataAdapter
+from .tc_hedge import HedgePolicy
+from .tc_ratelimit import RateLimiter
+
+
+class ClientPool:
+    """
+    Teamcowboy clients for many user accounts behind one transport.
+
+    Every client sends through the same TCDataAdapter, so all accounts share
+    one connection pool, rate limiter, circuit breaker and cache. Cache
+    entries stay keyed by user token, so one account is never served what
+    another fetched (see TCCache.shared_methods to opt in). User tokens are
+    cached and renewed after token_ttl. Work submitted for an account is
+    queued per account and the workers take from the queues in turn, so an
+    account with a long backlog cannot starve the others.
+
+    >>> pool = ClientPool(privatekey, publickey)
+    >>> pool.add_account('coach-1', username, password)
+    >>> pool.call('coach-1', 'Team_GetRoster', teamid)
+    >>> future = pool.submit('coach-2', lambda tc: tc.Event_SaveRSVP(teamid, eventid, 'yes'))
+
+    Attributes:
+    ----------
+    privateapikey : str
+        Private API key shared by every account
+    publicapikey : str
+        Public API key shared by every account
+    hostname : str
+        hostname of api.teamcowboy.com
+    logger : logging.Logger
+        logger
+    timeout : Tuple[float, float]
+        connect and read timeouts in seconds for every request
+    breaker : CircuitBreaker
+        optional circuit breaker around the Team Cowboy endpoint
+    cache : TCCache
+        cache of read results. Defaults to a 60 second cache with no
+        entries shared between accounts.
+    hedge : HedgePolicy
+        optional hedging policy for slow idempotent GET methods
+    ratelimiter : RateLimiter
+        optional limit on how fast requests are sent across all accounts
+    token_ttl : float
+        seconds a user token is reused before authenticating again
+    max_workers : int
+        number of threads running submitted work
+    """
+
+    def __init__(self, privateapikey, publicapikey,
+                    hostname: str = 'api.teamcowboy.com',
+                    logger: logging.Logger = None,
+                    timeout: Tuple[float, float] = (3.05, 30),
+                    breaker: CircuitBreaker = None,
+                    cache: TCCache = None,
+                    hedge: HedgePolicy = None,
+                    ratelimiter: RateLimiter = None,
+                    token_ttl: float = 12 * 3600,
+                    max_workers: int = 8):
+        self.privatekey = privateapikey
+        self.publickey = publicapikey
+        self.token_ttl = token_ttl
+        self.max_workers = max_workers
+        self._logger = logger
+
+        if cache is None:
+            cache = TCCache(ttl=60)
+
+        self.adapter = TCDataAdapter(hostname, 'v1', logger, timeout=timeout, breaker=breaker,
+                                        cache=cache, hedge=hedge, ratelimiter=ratelimiter,
+                                        resign=functools.partial(tc_helpers.resignrequestdata,
+                                                                    privatekey=privateapikey))
+
+        self._accounts = {}
+        self._clients = {}
+        self._auth_locks = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+        self._queues = {}
+        self._ring = deque()
+        self._workers = []
+        self._closed = False
+        self._cond = threading.Condition(self._lock)
+
+    """
+    Accounts
+    """
+
+    def add_account(self, account: Hashable, username: str, password: str) -> None:
+        """
+        Register the credentials used to get a user token for account
+        """
+        with self._lock:
+            self._accounts[account] = (username, password)
+            self._auth_locks.setdefault(account, threading.Lock())
+            self._clients.pop(account, None)
+
+    def remove_account(self, account: Hashable) -> None:
+        with self._lock:
+            self._accounts.pop(account, None)
+            self._clients.pop(account, None)
+
+    def invalidate(self, account: Hashable) -> None:
+        """
+        Forget the cached token for account, e.g. after it was revoked
+        """
+        with self._lock:
+            self._clients.pop(account, None)
+
+    def client(self, account: Hashable) -> Teamcowboy:
+        """
+        Return a Teamcowboy for account, authenticating only if there is no
+        cached token or it is older than token_ttl
+        """
+        with self._lock:
+            if account not in self._accounts:
+                raise TheTeamCowboyAPIException(f'Unknown account {account!r}')
+
+            auth_lock = self._auth_locks[account]
+
+        # One login per account at a time; other accounts are not blocked
+        with auth_lock:
+            with self._lock:
+                cached = self._clients.get(account)
+
+                if cached is not None and time.monotonic() - cached[1] < self.token_ttl:
+                    return cached[0]
+
+                username, password = self._accounts[account]
+                listeners = list(self._listeners)
+
+            tc = Teamcowboy(self.privatekey, self.publickey, username, password,
+                            logger=self._logger, adapter=self.adapter)
+
+            for listener in listeners:
+                tc.add_listener(listener)
+
+            with self._lock:
+                self._clients[account] = (tc, time.monotonic())
+
+            return tc
+
+    def add_listener(self, listener: Callable) -> None:
+        """
+        Register a listener on every client of the pool, see
+        Teamcowboy.add_listener
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            clients = [tc for tc, _ in self._clients.values()]
+
+        for tc in clients:
+            tc.add_listener(listener)
+
+    def remove_listener(self, listener: Callable) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            clients = [tc for tc, _ in self._clients.values()]
+
+        for tc in clients:
+            tc.remove_listener(listener)
+
+    """
+    Scheduling
+    """
+
+    def submit(self, account: Hashable, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Queue fn(client, *args, **kwargs) to run with account's client
+
+        Returns:
+        --------
+        concurrent.futures.Future of the result
+        """
+        future = concurrent.futures.Future()
+        task = (future, contextvars.copy_context(), fn, args, kwargs)
+
+        with self._cond:
+            if self._closed:
+                raise TheTeamCowboyAPIException('ClientPool is closed')
+
+            if account not in self._queues:
+                self._queues[account] = deque()
+                self._ring.append(account)
+
+            self._queues[account].append(task)
+
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name='teamcowboyapi-pool', daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+            self._cond.notify()
+
+        return future
+
+    def call(self, account: Hashable, method: str, *args, **kwargs) -> Any:
+        """
+        Call a Teamcowboy method as account through the pool's queue and
+        wait for the result
+        """
+        return self.submit(account, lambda tc: getattr(tc, method)(*args, **kwargs)).result()
+
+    def close(self) -> None:
+        """
+        Finish queued work, stop the workers and close the shared transport
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            workers = list(self._workers)
+
+        for worker in workers:
+            worker.join()
+
+        self.adapter.close()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ring and not self._closed:
+                    self._cond.wait()
+
+                if not self._ring:
+                    return
+
+                # Round robin: take one task, then send the account to the back
+                account = self._ring.popleft()
+                queue = self._queues[account]
+                future, context, fn, args, kwargs = queue.popleft()
+
+                if queue:
+                    self._ring.append(account)
+                else:
+                    del self._queues[account]
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = context.run(lambda: fn(self.client(account), *args, **kwargs))
+
+            except BaseException as e:
+                future.set_exception(e)
+
+            else:
+                future.set_result(result)
@@ -0,0 +1,197 @@
+from typing import Callable, Iterable, Optional, Union
+from dataclasses import dataclass
+from pathlib import Path
+import cProfile
+import itertools
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+@dataclass
+class Sample:
+    """
+    Profile of one sampled Teamcowboy call.
+
+    Attributes:
+    -----------
+    index : int
+        Number of the call among the calls of method seen by the profiler
+    method : str
+        Team Cowboy method name
+    seconds : float
+        Wall time of the call
+    stats : pstats.Stats
+        CPU profile of the calling thread. Work done on other threads, e.g.
+        hedged requests, shows up as time spent waiting for them.
+    snapshot : tracemalloc.Snapshot
+        Allocations still alive when the call returned, if memory was
+        captured. tracemalloc traces every thread, so allocations made by
+        concurrent calls are included.
+    peak : int
+        Peak traced memory in bytes during the call, if memory was captured
+    failed : bool
+        True if the call raised
+    """
+    index: int
+    method: str
+    seconds: float
+    stats: pstats.Stats
+    snapshot: Optional[tracemalloc.Snapshot] = None
+    peak: Optional[int] = None
+    failed: bool = False
+
+
+class Profiler:
+    """
+    Profiles 1 in every calls of each Teamcowboy api method with cProfile
+    and, optionally, tracemalloc.
+
+    Calls are counted per method, so every method is sampled at the same
+    rate however calls interleave. Only one call is profiled at a time in
+    the process: a sampled call that starts while another thread's is being
+    profiled runs plainly. A call that is not sampled costs a counter
+    increment. Sampled calls are written to directory as
+    <method>-<index>.pstats (open with pstats or snakeviz) and
+    <method>-<index>.tracemalloc (tracemalloc.Snapshot.load), and/or handed
+    to callback.
+
+    >>> profiler = Profiler(every=50, directory='profiles', memory=True)
+    >>> Teamcowboy.profiler = profiler
+    >>> TeamSync(Teamcowboy, teamid).sync(start, end)
+
+    Attributes:
+    -----------
+    every : int
+        Sample one call of each method in this many, 1 profiles every call.
+        Must be at least 1.
+    directory : str
+        Optional directory to write samples to, created if missing
+    callback : Callable
+        Optional function called with each Sample
+    memory : bool
+        Also capture allocations with tracemalloc. This slows down every
+        thread while a sampled call runs.
+    frames : int
+        Stack frames tracemalloc keeps per allocation
+    methods : Iterable[str]
+        Only sample these methods, all by default
+    logger : logging.Logger
+        logger
+    """
+
+    def __init__(self, every: int = 100, directory: Union[str, Path] = None, callback: Callable = None,
+                    memory: bool = False, frames: int = 10, methods: Iterable[str] = None,
+                    logger: logging.Logger = None):
+        if every < 1:
+            raise ValueError(f'every must be at least 1, got {every}')
+
+        self.every = every
+        self.directory = Path(directory) if directory is not None else None
+        self.callback = callback
+        self.memory = memory
+        self.frames = frames
+        self.methods = frozenset(methods) if methods is not None else None
+        self._logger = logger or logging.getLogger(__name__)
+        self._counters = {}
+        self._active = False
+        self._tracing = 0
+        self._lock = threading.Lock()
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def call(self, method: str, func: Callable, *args, **kwargs):
+        """
+        Run func(*args, **kwargs), profiling it if this call is sampled
+        """
+        if self.methods is not None and method not in self.methods:
+            return func(*args, **kwargs)
+
+        counter = self._counters.get(method)
+
+        if counter is None:
+            counter = self._counters.setdefault(method, itertools.count())
+
+        index = next(counter)
+
+        if index % self.every:
+            return func(*args, **kwargs)
+
+        # From Python 3.12 cProfile uses the process-wide sys.monitoring and
+        # raises ValueError if a second profile is enabled on any thread, so
+        # nested calls and calls on other threads run plainly meanwhile
+        with self._lock:
+            busy = self._active
+            self._active = True
+
+        if busy:
+            return func(*args, **kwargs)
+
+        self._start_tracing()
+        profile = cProfile.Profile()
+        failed = False
+        started = time.perf_counter()
+
+        try:
+            return profile.runcall(func, *args, **kwargs)
+
+        except BaseException:
+            failed = True
+            raise
+
+        finally:
+            seconds = time.perf_counter() - started
+            snapshot, peak = self._stop_tracing()
+
+            with self._lock:
+                self._active = False
+
+            self._record(Sample(index, method, seconds, pstats.Stats(profile), snapshot, peak, failed))
+
+    def _start_tracing(self) -> None:
+        if not self.memory:
+            return
+
+        with self._lock:
+            if self._tracing == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._tracing = 1
+            elif self._tracing:
+                self._tracing += 1
+
+            tracemalloc.reset_peak()
+
+    def _stop_tracing(self):
+        if not self.memory or not tracemalloc.is_tracing():
+            return None, None
+
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+
+        with self._lock:
+            # Tracing started elsewhere is left running
+            if self._tracing:
+                self._tracing -= 1
+
+                if self._tracing == 0:
+                    tracemalloc.stop()
+
+        return snapshot, peak
+
+    def _record(self, sample: Sample) -> None:
+        try:
+            if self.directory is not None:
+                stem = self.directory / f'{sample.method}-{sample.index:08d}'
+                sample.stats.dump_stats(f'{stem}.pstats')
+
+                if sample.snapshot is not None:
+                    sample.snapshot.dump(f'{stem}.tracemalloc')
+
+            if self.callback is not None:
+                self.callback(sample)
+
+        except Exception as e:
+            self._logger.error(msg=f'Failed to record profile of {sample.method}: {e}')
@@ -0,0 +1,130 @@
+from typing import Dict, Iterator, List, Tuple, Union
+from datetime import date, timedelta
+import concurrent.futures
+import contextvars
+import functools
+
+from teamcowboyapi import tc_deadline, tc_helpers
+from teamcowboyapi.exceptions import TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.objects.events import Event
+
+
+def split(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """
+    Split the inclusive date range [start, end] into windows of at most days
+    """
+    windows = []
+
+    while start <= end:
+        last = min(start + timedelta(days=days - 1), end)
+        windows.append((start, last))
+        start = last + timedelta(days=1)
+
+    return windows
+
+
+def fetch_range(tc, start: Union[str, date], end: Union[str, date], teamId: int = None,
+                window_days: int = 30, page_size: int = 100, max_workers: int = 4,
+                **params) -> Iterator[Event]:
+    """
+    Yield every event starting between two local dates, fetching date
+    windows concurrently
+
+    The range is split into windows of window_days that are fetched at
+    once. A team window that comes back full (page_size events) is split in
+    half and fetched again; a full one day window is paged. Events are
+    yielded in local start order without duplicates as soon as every earlier
+    window is done, so a multi-year history streams instead of being
+    crawled page by page.
+
+    >>> for event in fetch_range(Teamcowboy, '2020-01-01', '2026-12-31', teamId=teamid):
+    ...     print(event.title)
+
+    Parameters:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    start : Union[str, date]
+        First local date (YYYY-MM-DD)
+    end : Union[str, date]
+        Last local date, inclusive
+    teamId : int
+        Team to fetch with Team_GetEvents. Without it User_GetTeamEvents
+        fetches events for all of the user's teams; that method is not
+        paged, so its windows are never split.
+    window_days : int
+        Days in each initial window
+    page_size : int
+        qty requested per Team_GetEvents call
+    max_workers : int
+        Number of windows fetched at once
+    params : dict
+        Extra params for every call, e.g. seasonId
+
+    Returns:
+    --------
+    Iterator of Event objects
+    """
+    start = date.fromisoformat(start) if isinstance(start, str) else start
+    end = date.fromisoformat(end) if isinstance(end, str) else end
+
+    def fetch(window: Tuple[date, date]) -> List[Event]:
+        first, last = window
+        bounds = {"startDateTime": f"{first.isoformat()} 00:00:00", "endDateTime": f"{last.isoformat()} 23:59:59"}
+
+        if teamId is None:
+            return tc.User_GetTeamEvents(**bounds, **params) or []
+
+        call = functools.partial(tc.Team_GetEvents, teamId, filter="specificDates", **bounds, **params)
+
+        if first == last:
+            return list(tc_helpers.paginate(call, qty=page_size))
+
+        return call(qty=page_size) or []
+
+    deadline = tc_deadline.current()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='teamcowboyapi')
+    futures = {}
+    finished: Dict[date, Tuple[date, List[Event]]] = {}
+    following = start
+    seen = set()
+
+    def submit(window: Tuple[date, date]) -> None:
+        futures[executor.submit(contextvars.copy_context().run, fetch, window)] = window
+
+    try:
+        for window in split(start, end, window_days):
+            submit(window)
+
+        while futures:
+            done, _ = concurrent.futures.wait(futures, timeout=deadline.remaining() if deadline is not None else None,
+                                                return_when=concurrent.futures.FIRST_COMPLETED)
+
+            if not done:
+                raise TheTeamCowboyAPIDeadlineException('Deadline exceeded fetching event range')
+
+            for future in done:
+                first, last = futures.pop(future)
+                events = future.result()
+
+                if teamId is not None and first != last and len(events) >= page_size:
+                    middle = first + (last - first) // 2
+                    submit((first, middle))
+                    submit((middle + timedelta(days=1), last))
+                else:
+                    finished[first] = (last, events)
+
+            # Windows are disjoint and cover the range, so a window can be
+            # yielded once the one ending just before it has been
+            while following in finished:
+                last, events = finished.pop(following)
+                following = last + timedelta(days=1)
+
+                for event in sorted(events, key=lambda event: (event.dateTimeInfo.startDateTimeLocal or '',
+                                                                event.eventId)):
+                    if event.eventId not in seen:
+                        seen.add(event.eventId)
+                        yield event
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from . import tc_deadline
+from .exceptions import TheTeamCowboyAPIDeadlineException
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how fast requests are sent to the api.
+
+    Shared by every thread using the same TCDataAdapter, so concurrent
+    helpers (bulk RSVPs, thread loading, fan-out fetches) stay within the
+    limit together.
+
+    Attributes
+    ----------
+    rate : float
+        requests allowed per second on average
+    burst : int
+        requests that may be sent back to back after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent
+
+        Raises
+        ------
+        TheTeamCowboyAPIDeadlineException
+            if the active deadline runs out before a token is available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            deadline = tc_deadline.current()
+
+            if deadline is not None and deadline.remaining() < wait:
+                raise TheTeamCowboyAPIDeadlineException('Deadline exceeded waiting for rate limit')
+
+            time.sleep(wait)
@@ -0,0 +1,295 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import bisect
+import hashlib
+import json
+import os
+import threading
+
+from teamcowboyapi.objects.users import User
+
+
+# User fields tracked by snapshots; teamMemberType comes from User.teamMeta
+FIELDS = ('firstName', 'lastName', 'fullName', 'displayName', 'emailAddress1', 'emailAddress2',
+            'phone1', 'phone2', 'gender', 'shirtNumber', 'shirtSize', 'pantsSize',
+            'teamMemberType', 'teamMemberTypeTitle')
+
+
+def record(user: User) -> Tuple:
+    """
+    Return the tracked fields of a User as a tuple ordered like FIELDS
+    """
+    membertype = user.teamMeta.teamMemberType if user.teamMeta else None
+
+    return (user.firstName, user.lastName, user.fullName, user.displayName, user.emailAddress1,
+            user.emailAddress2, user.phone1, user.phone2, user.gender, user.shirtNumber,
+            user.shirtSize, user.pantsSize,
+            membertype.name if membertype else None, membertype.title if membertype else None)
+
+
+def content_hash(values: Tuple) -> int:
+    return int.from_bytes(hashlib.blake2b(repr(values).encode('UTF-8'), digest_size=8).digest(), 'little')
+
+
+@dataclass
+class Rosterdiff:
+    """
+    Differences between two roster snapshots.
+
+    Attributes:
+    -----------
+    taken : str
+        When the newer snapshot was taken (UTC, YYYY-MM-DD HH:MM:SS)
+    added : Dict[int, Dict[str, Any]]
+        Tracked fields of users who joined, by userId
+    removed : Dict[int, Dict[str, Any]]
+        Last tracked fields of users who left, by userId
+    changed : Dict[int, Dict[str, Tuple[Any, Any]]]
+        (old, new) values of the fields that changed, by userId and field
+    """
+    taken: Optional[str] = None
+    added: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    removed: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    changed: Dict[int, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class RosterSnapshot:
+    """
+    Compact copy of a roster: one tuple of tracked fields and one 64-bit
+    content hash per userId. Diffing compares hashes first and only looks
+    at the fields of users whose hash changed.
+    """
+
+    def __init__(self, records: Dict[int, Tuple] = None, taken: str = None, hashes: Dict[int, int] = None):
+        self.taken = taken
+        self.records = records or {}
+        self.hashes = hashes if hashes is not None else {userId: content_hash(values)
+                                                            for userId, values in self.records.items()}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, userId: int) -> bool:
+        return userId in self.records
+
+    @classmethod
+    def from_users(cls, users: Iterable[User], taken: str = None) -> 'RosterSnapshot':
+        return cls({user.userId: record(user) for user in users}, taken=taken or _now())
+
+    def get(self, userId: int) -> Optional[Dict[str, Any]]:
+        values = self.records.get(userId)
+        return dict(zip(FIELDS, values)) if values is not None else None
+
+    def diff(self, newer: 'RosterSnapshot') -> Rosterdiff:
+        """
+        Return what changed from this snapshot to newer
+        """
+        diff = Rosterdiff(taken=newer.taken)
+
+        for userId, digest in newer.hashes.items():
+            old = self.hashes.get(userId)
+
+            if old is None:
+                diff.added[userId] = newer.get(userId)
+            elif old != digest:
+                diff.changed[userId] = {name: (before, after) for name, before, after
+                                        in zip(FIELDS, self.records[userId], newer.records[userId])
+                                        if before != after}
+
+        for userId in self.hashes.keys() - newer.hashes.keys():
+            diff.removed[userId] = self.get(userId)
+
+        return diff
+
+
+class RosterHistory:
+    """
+    History of a team's roster stored as a chain of deltas.
+
+    Only what changed between consecutive snapshots is kept, so a long
+    history costs about as much as the changes in it. Full rosters are
+    checkpointed every checkpoint_every deltas so rebuilding the roster at
+    any point replays at most that many deltas. With a path, deltas are
+    appended to a JSON lines file and replayed when the history is reopened.
+
+    >>> history = RosterHistory(teamid, path='roster.jsonl')
+    >>> history.attach(Teamcowboy)
+    >>> Teamcowboy.Team_GetRoster(teamid)
+    >>> history.snapshot('2026-05-01 00:00:00').get(userid)
+
+    Attributes:
+    -----------
+    teamId : int
+        Id of the team
+    path : str
+        Optional file the deltas are appended to
+    checkpoint_every : int
+        Number of deltas between full roster checkpoints
+    """
+
+    def __init__(self, teamId: int, path: str = None, checkpoint_every: int = 32):
+        self.teamId = teamId
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.deltas = []
+        self._times = []
+        self._checkpoints = {}
+        self._latest = RosterSnapshot()
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='UTF-8') as f:
+                for line in f:
+                    if line.strip():
+                        self._append(_load(json.loads(line)))
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    @property
+    def latest(self) -> RosterSnapshot:
+        return self._latest
+
+    def attach(self, tc) -> None:
+        """
+        Record every full roster fetched for this team through a Teamcowboy client
+        """
+        tc.add_listener(self.on_call)
+
+    def detach(self, tc) -> None:
+        tc.remove_listener(self.on_call)
+
+    def on_call(self, method: str, params: Dict, result: Any) -> None:
+        """
+        Teamcowboy listener that records full Team_GetRoster results
+        """
+        if (method == 'Team_GetRoster' and result is not None and 'userId' not in params
+                and int(params['teamId']) == self.teamId):
+            self.record(result)
+
+    def record(self, users: Iterable[User], taken: str = None) -> Rosterdiff:
+        """
+        Compare a fetched roster with the latest snapshot and store the delta
+
+        Returns:
+        --------
+        Rosterdiff, empty if nothing changed
+        """
+        snapshot = RosterSnapshot.from_users(users, taken=taken)
+
+        with self._lock:
+            diff = self._latest.diff(snapshot)
+
+            if diff:
+                self._append(diff)
+
+                if self.path is not None:
+                    with open(self.path, 'a', encoding='UTF-8') as f:
+                        f.write(json.dumps(_dump(diff)) + '\n')
+
+        return diff
+
+    def snapshot(self, at: Union[int, str, None] = None) -> RosterSnapshot:
+        """
+        Rebuild the roster after a delta
+
+        Parameters:
+        -----------
+        at : Union[int, str]
+            Delta index, or a UTC time (YYYY-MM-DD HH:MM:SS) to get the
+            roster as it was then. Defaults to the latest roster.
+
+        Returns:
+        --------
+        RosterSnapshot
+        """
+        if at is None:
+            return self._latest
+
+        index = bisect.bisect_right(self._times, at) - 1 if isinstance(at, str) else at
+
+        if index < 0:
+            return RosterSnapshot()
+
+        start = index - index % self.checkpoint_every
+        records = dict(self._checkpoints[start].records)
+
+        for delta in self.deltas[start + 1:index + 1]:
+            _apply(records, delta)
+
+        return RosterSnapshot(records, taken=self.deltas[index].taken)
+
+    def user_history(self, userId: int) -> List[Tuple[str, str, Dict]]:
+        """
+        Return (taken, kind, fields) for every delta touching a user, where
+        kind is added, removed or changed
+        """
+        history = []
+
+        for delta in self.deltas:
+            for kind in ('added', 'removed', 'changed'):
+                values = getattr(delta, kind).get(userId)
+
+                if values is not None:
+                    history.append((delta.taken, kind, values))
+
+        return history
+
+    def _append(self, diff: Rosterdiff) -> None:
+        for userId, values in diff.removed.items():
+            if values is None:
+                diff.removed[userId] = self._latest.get(userId)
+
+        records = dict(self._latest.records)
+        hashes = dict(self._latest.hashes)
+        _apply(records, diff)
+
+        # Only the users in the delta need their hash recomputed
+        for userId in diff.removed:
+            hashes.pop(userId, None)
+        for userId in (*diff.added, *diff.changed):
+            hashes[userId] = content_hash(records[userId])
+
+        self._latest = RosterSnapshot(records, taken=diff.taken, hashes=hashes)
+
+        self.deltas.append(diff)
+        self._times.append(diff.taken)
+
+        if (len(self.deltas) - 1) % self.checkpoint_every == 0:
+            self._checkpoints[len(self.deltas) - 1] = self._latest
+
+
+def _apply(records: Dict[int, Tuple], diff: Rosterdiff) -> None:
+    for userId in diff.removed:
+        records.pop(userId, None)
+
+    for userId, values in diff.added.items():
+        records[userId] = tuple(values[name] for name in FIELDS)
+
+    for userId, changes in diff.changed.items():
+        values = dict(zip(FIELDS, records[userId]))
+        values.update({name: new for name, (old, new) in changes.items()})
+        records[userId] = tuple(values[name] for name in FIELDS)
+
+
+def _dump(diff: Rosterdiff) -> Dict:
+    return {'taken': diff.taken, 'added': diff.added, 'removed': list(diff.removed),
+            'changed': {userId: {name: list(pair) for name, pair in changes.items()}
+                        for userId, changes in diff.changed.items()}}
+
+
+def _load(data: Dict) -> Rosterdiff:
+    # Removed users are stored by id only, _append fills in their last fields
+    return Rosterdiff(taken=data['taken'],
+                        added={int(userId): values for userId, values in data['added'].items()},
+                        removed={int(userId): None for userId in data['removed']},
+                        changed={int(userId): {name: tuple(pair) for name, pair in changes.items()}
+                                for userId, changes in data['changed'].items()})
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,361 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import random
+
+from teamcowboyapi.tc_helpers import parse_utc
+from teamcowboyapi.objects.events import Event
+
+
+class _Node:
+    __slots__ = ('start', 'end', 'key', 'value', 'priority', 'max_end', 'left', 'right')
+
+    def __init__(self, start: float, end: float, key: int, value: Any):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = random.random()
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+
+class IntervalTree:
+    """
+    Set of half-open [start, end) intervals that finds every interval
+    overlapping a query range in O(log n + matches).
+
+    A treap ordered by (start, key) where each node also stores the largest
+    end in its subtree, so whole subtrees that end before the query range
+    are skipped. Keys must be unique; inserting an existing key replaces it.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._index = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._index
+
+    def insert(self, start: float, end: float, key: int, value: Any = None) -> None:
+        self.remove(key)
+        self._root = _insert(self._root, _Node(start, end, key, value))
+        self._index[key] = start
+
+    def remove(self, key: int) -> bool:
+        start = self._index.pop(key, None)
+
+        if start is None:
+            return False
+
+        self._root = _delete(self._root, (start, key))
+        return True
+
+    def overlapping(self, start: float, end: float) -> Iterator[Tuple[float, float, int, Any]]:
+        """
+        Yield (start, end, key, value) for every interval overlapping [start, end)
+        """
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+
+            if node is None or node.max_end <= start:
+                continue
+
+            stack.append(node.left)
+
+            if node.start < end:
+                if node.end > start:
+                    yield node.start, node.end, node.key, node.value
+                stack.append(node.right)
+
+    def __iter__(self) -> Iterator[Tuple[float, float, int, Any]]:
+        stack, node = [], self._root
+
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+            node = stack.pop()
+            yield node.start, node.end, node.key, node.value
+            node = node.right
+
+
+def _update(node: _Node) -> None:
+    node.max_end = max(node.end,
+                        node.left.max_end if node.left else node.end,
+                        node.right.max_end if node.right else node.end)
+
+
+def _split(node: Optional[_Node], order: Tuple) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """
+    Split into nodes ordered before order and the rest
+    """
+    if node is None:
+        return None, None
+
+    if (node.start, node.key) < order:
+        node.right, right = _split(node.right, order)
+        _update(node)
+        return node, right
+
+    left, node.left = _split(node.left, order)
+    _update(node)
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None or right is None:
+        return left or right
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    if node is None:
+        return new
+
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, (new.start, new.key))
+        _update(new)
+        return new
+
+    if (new.start, new.key) < (node.start, node.key):
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+
+    _update(node)
+    return node
+
+
+def _delete(node: Optional[_Node], order: Tuple) -> Optional[_Node]:
+    if node is None:
+        return None
+
+    if (node.start, node.key) == order:
+        return _merge(node.left, node.right)
+
+    if order < (node.start, node.key):
+        node.left = _delete(node.left, order)
+    else:
+        node.right = _delete(node.right, order)
+
+    _update(node)
+    return node
+
+
+class ScheduleIndex:
+    """
+    Interval index over event start and end times for finding schedule
+    conflicts across teams.
+
+    Events are kept in one IntervalTree per team and one per location. A
+    user's conflicts are found by querying the trees of every team they are
+    on, so the cost follows the user's own schedule rather than every pair
+    of events. Attach the index to a Teamcowboy client and it follows every
+    event fetch, and learns team membership from User_GetTeams (for the
+    signed in user) and Team_GetRoster.
+
+    >>> schedule = ScheduleIndex()
+    >>> schedule.attach(Teamcowboy)
+    >>> Teamcowboy.User_GetTeamEvents()
+    >>> schedule.user_conflicts(Teamcowboy.userid)
+
+    Attributes:
+    -----------
+    default_duration : float
+        Length in seconds assumed for events without an end time
+    ignore_statuses : Iterable[str]
+        Event statuses that never conflict
+    """
+
+    def __init__(self, default_duration: float = 7200.0, ignore_statuses: Iterable[str] = ('canceled',)):
+        self.default_duration = default_duration
+        self.ignore_statuses = set(ignore_statuses)
+        self._events = {}
+        self._by_team = {}
+        self._by_location = {}
+        self._teams_of = {}
+        self._tc = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def attach(self, tc) -> None:
+        """
+        Index events and memberships from every call made through a Teamcowboy client
+        """
+        self._tc = tc
+        tc.add_listener(self.on_call)
+
+    def detach(self, tc) -> None:
+        tc.remove_listener(self.on_call)
+
+    def on_call(self, method: str, params: Dict, result: Any) -> None:
+        """
+        Teamcowboy listener that keeps the index up to date
+        """
+        if not result:
+            return
+
+        if method in ('Event_Get', 'Team_GetEvents', 'User_GetNextTeamEvent', 'User_GetTeamEvents'):
+            self.add_events(result if isinstance(result, list) else [result])
+
+        elif method == 'Team_GetRoster':
+            for user in result:
+                self.add_membership(user.userId, [int(params['teamId'])])
+
+        elif method == 'User_GetTeams' and getattr(self._tc, 'userid', None) is not None:
+            self.add_membership(self._tc.userid, [team.teamId for team in result])
+
+    """
+    Updates
+    """
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.add_event(event)
+
+    def add_event(self, event: Event) -> None:
+        """
+        Index an event, replacing any earlier version of it
+        """
+        self.remove_event(event.eventId)
+
+        if event.status in self.ignore_statuses:
+            return
+
+        span = self.span(event)
+
+        if span is None:
+            return
+
+        self._events[event.eventId] = event
+        self._by_team.setdefault(event.team.teamId, IntervalTree()).insert(*span, event.eventId, event)
+
+        if event.location is not None:
+            self._by_location.setdefault(event.location.locationId, IntervalTree()).insert(
+                *span, event.eventId, event)
+
+    def remove_event(self, eventId: int) -> None:
+        event = self._events.pop(eventId, None)
+
+        if event is None:
+            return
+
+        self._by_team[event.team.teamId].remove(eventId)
+
+        if event.location is not None:
+            self._by_location[event.location.locationId].remove(eventId)
+
+    def add_membership(self, userId: int, teamIds: Iterable[int]) -> None:
+        self._teams_of.setdefault(userId, set()).update(teamIds)
+
+    def remove_membership(self, userId: int, teamId: int) -> None:
+        self._teams_of.get(userId, set()).discard(teamId)
+
+    """
+    Queries
+    """
+
+    def span(self, event: Event) -> Optional[Tuple[float, float]]:
+        """
+        Return the event's [start, end) as UTC timestamps, None without a start
+        """
+        start = parse_utc(event.dateTimeInfo.startDateTimeUtc)
+
+        if start is None:
+            return None
+
+        end = parse_utc(event.dateTimeInfo.endDateTimeUtc)
+        start = start.timestamp()
+        end = end.timestamp() if end is not None else start + self.default_duration
+
+        return start, max(end, start + 1)
+
+    def overlapping(self, start: float, end: float, teamIds: Iterable[int] = None,
+                    locationId: int = None) -> List[Event]:
+        """
+        Return the events overlapping [start, end) on the given teams or location
+
+        Parameters:
+        -----------
+        start : float
+            UTC timestamp
+        end : float
+            UTC timestamp
+        teamIds : Iterable[int]
+            Teams to search, all teams if neither teamIds nor locationId is given
+        locationId : int
+            Location to search
+
+        Returns:
+        --------
+        List of Event objects ordered by start
+        """
+        trees = self._trees(teamIds, locationId)
+        found = {key: (begin, value) for tree in trees for begin, _, key, value in tree.overlapping(start, end)}
+
+        return [value for _, value in sorted(found.values(), key=lambda item: (item[0], item[1].eventId))]
+
+    def team_conflicts(self, teamIds: Iterable[int]) -> List[Tuple[Event, Event]]:
+        """
+        Return pairs of overlapping events across the given teams
+        """
+        return self._conflicts([self._by_team[teamId] for teamId in set(teamIds) if teamId in self._by_team])
+
+    def user_conflicts(self, userId: int) -> List[Tuple[Event, Event]]:
+        """
+        Return pairs of overlapping events on the teams a user is on
+        """
+        return self.team_conflicts(self._teams_of.get(userId, ()))
+
+    def location_conflicts(self, locationId: int = None) -> List[Tuple[Event, Event]]:
+        """
+        Return pairs of overlapping events booked at a location, or at any
+        location if locationId is None
+        """
+        if locationId is not None:
+            tree = self._by_location.get(locationId)
+            return self._conflicts([tree] if tree is not None else [])
+
+        return [pair for tree in self._by_location.values() for pair in self._conflicts([tree])]
+
+    def _trees(self, teamIds: Optional[Iterable[int]], locationId: Optional[int]) -> List[IntervalTree]:
+        if teamIds is None and locationId is None:
+            return list(self._by_team.values())
+
+        trees = [self._by_team[teamId] for teamId in set(teamIds or ()) if teamId in self._by_team]
+
+        if locationId is not None and locationId in self._by_location:
+            trees.append(self._by_location[locationId])
+
+        return trees
+
+    def _conflicts(self, trees: List[IntervalTree]) -> List[Tuple[Event, Event]]:
+        """
+        Return each overlapping pair of events in trees once, earlier event first
+        """
+        pairs = {}
+
+        for tree in trees:
+            for start, end, key, event in tree:
+                for other in trees:
+                    for otherstart, _, otherkey, otherevent in other.overlapping(start, end):
+                        if (otherstart, otherkey) > (start, key):
+                            pairs[(key, otherkey)] = (start, event, otherevent)
+
+        return [(first, second) for _, first, second in
+                sorted(pairs.values(), key=lambda pair: (pair[0], pair[1].eventId, pair[2].eventId))]
@@ -0,0 +1,574 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+import bisect
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException
+from teamcowboyapi.objects.messages import Message, Messagecomment
+
+
+TOKEN = re.compile(r'\w+')
+QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+MESSAGE = 0
+COMMENT = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Most terms a prefix query expands to
+MAX_EXPANSIONS = 64
+
+MAGIC = b'TCIX'
+VERSION = 1
+
+# magic, version, ndocs, nterms, names offset, postings offset
+HEADER = struct.Struct('<4sHIIQQ')
+# kind, commentId or messageId, messageId, teamId, length in tokens
+DOC = struct.Struct('<BqqqI')
+# name offset, name length, postings offset, postings length, document frequency
+TERM = struct.Struct('<IHQII')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase word tokens
+    """
+    return TOKEN.findall(text.lower()) if text else []
+
+
+@dataclass
+class Hit:
+    """
+    A search result.
+
+    Attributes:
+    -----------
+    score : float
+        BM25 relevance score
+    messageId : int
+        Id of the message, or of the message the comment belongs to
+    commentId : int
+        Id of the matching comment, None if the message itself matched
+    teamId : int
+        Id of the team the message belongs to
+    """
+    score: float
+    messageId: int
+    commentId: Optional[int] = None
+    teamId: Optional[int] = None
+
+
+class TCIndex:
+    """
+    In-process full-text index over team messages and their comments.
+
+    Message titles and bodies and comment text are indexed with term
+    positions, so queries can combine plain terms, prefix terms (shar*) and
+    quoted phrases ("game on saturday"); every clause must match and hits
+    are ranked with BM25. Attach the index to a Teamcowboy client and it
+    follows every message fetch, save and delete.
+
+    save writes a compact binary file. Opening it memory-maps the file and
+    only decodes the postings a query touches, so startup does not depend
+    on the size of the archive. Later changes are kept in memory on top of
+    the mapped file until the next save.
+
+    >>> index = TCIndex('messages.idx')
+    >>> index.attach(Teamcowboy)
+    >>> index.search('"practice moved" field*', teamId=teamid)
+
+    Attributes:
+    -----------
+    path : str
+        Optional file written by save to open
+    """
+
+    def __init__(self, path: str = None):
+        self._lock = threading.RLock()
+        self._segment = None
+        self._docs = {}
+        self._keys = {}
+        self._comments = {}
+        self._postings = {}
+        self._terms_of = {}
+        self._deleted = set()
+        self._sorted = None
+        self._total = 0
+        self._next = 0
+
+        if path is not None:
+            self._open(path)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def attach(self, tc) -> None:
+        """
+        Index messages from every call made through a Teamcowboy client
+        """
+        tc.add_listener(self.on_call)
+
+    def detach(self, tc) -> None:
+        tc.remove_listener(self.on_call)
+
+    def on_call(self, method: str, params: Dict, result: Any) -> None:
+        """
+        Teamcowboy listener that keeps the index in step with the api
+        """
+        if not result:
+            return
+
+        if method in ('Message_Get', 'Message_Save', 'Team_GetMessages', 'User_GetTeamMessages'):
+            for message in (result if isinstance(result, list) else [result]):
+                self.add_message(message)
+
+        elif method == 'Message_Delete':
+            self.remove_message(int(params['messageId']))
+
+        elif method == 'MessageComment_Add':
+            self.add_comment(result, teamId=int(params['teamId']), text=params.get('comment'))
+
+        elif method == 'MessageComment_Delete':
+            self.remove_comment(int(params['commentId']))
+
+    """
+    Updates
+    """
+
+    def add_message(self, message: Message) -> None:
+        """
+        Index a message, replacing any earlier version. Its comments are
+        replaced too if they were loaded.
+        """
+        teamId = message.team.teamId
+
+        with self._lock:
+            self._remove((MESSAGE, message.messageId))
+            self._add(MESSAGE, message.messageId, message.messageId, teamId,
+                        tokenize(message.title) + [None] + tokenize(message.bodyText))
+
+            if message.comments is not None:
+                for commentId in list(self._comments.get(message.messageId, ())):
+                    self.remove_comment(commentId)
+
+                for comment in message.comments:
+                    self.add_comment(comment, teamId=teamId)
+
+    def add_comment(self, comment: Messagecomment, teamId: int = None, text: str = None) -> None:
+        """
+        Index a comment, replacing any earlier version
+
+        Parameters:
+        -----------
+        comment : Messagecomment
+            Comment to index
+        teamId : int
+            Team of the comment, defaults to comment.teamId
+        text : str
+            Comment text, for responses that do not echo it back
+        """
+        with self._lock:
+            self._remove((COMMENT, comment.commentId))
+            self._add(COMMENT, comment.commentId, comment.messageId, teamId or comment.teamId,
+                        tokenize(comment.comment or text))
+            self._comments.setdefault(comment.messageId, set()).add(comment.commentId)
+
+    def remove_message(self, messageId: int) -> None:
+        """
+        Remove a message and its comments
+        """
+        with self._lock:
+            self._remove((MESSAGE, messageId))
+
+            for commentId in self._comments.pop(messageId, set()):
+                self._remove((COMMENT, commentId))
+
+    def remove_comment(self, commentId: int) -> None:
+        with self._lock:
+            docid = self._keys.get((COMMENT, commentId))
+
+            if docid is not None:
+                self._comments.get(self._docs[docid][2], set()).discard(commentId)
+                self._remove((COMMENT, commentId))
+
+    """
+    Queries
+    """
+
+    def search(self, query: str, teamId: int = None, limit: int = 10) -> List[Hit]:
+        """
+        Search messages and comments
+
+        Parameters:
+        -----------
+        query : str
+            Whitespace separated clauses that must all match. A clause is a
+            word, a word ending in * to match every word with that prefix, or
+            a quoted phrase.
+        teamId : int
+            Only return hits from this team
+        limit : int
+            Maximum number of hits
+
+        Returns:
+        --------
+        List of Hit objects, best first
+        """
+        with self._lock:
+            scores = None
+
+            for clause in _parse(query):
+                found = self._match(*clause)
+                scores = found if scores is None else {docid: score + found[docid]
+                                                        for docid, score in scores.items() if docid in found}
+                if not scores:
+                    return []
+
+            hits = []
+
+            for docid, score in (scores or {}).items():
+                kind, key, messageId, doc_teamId, length = self._docs[docid]
+
+                if teamId is None or doc_teamId == teamId:
+                    hits.append(Hit(score, messageId, key if kind == COMMENT else None, doc_teamId))
+
+        hits.sort(key=lambda hit: (-hit.score, hit.messageId, hit.commentId or 0))
+        return hits[:limit]
+
+    def _match(self, kind: str, value) -> Dict[int, float]:
+        if kind == 'term':
+            return self._score(value, self._lookup(value))
+
+        if kind == 'prefix':
+            scores = {}
+
+            for term in self._expand(value):
+                for docid, score in self._score(term, self._lookup(term)).items():
+                    scores[docid] = max(score, scores.get(docid, 0.0))
+
+            return scores
+
+        postings = [self._lookup(term) for term in value]
+        matches = {}
+
+        for docid in set.intersection(*(set(p) for p in postings)):
+            following = [set(p[docid]) for p in postings[1:]]
+            count = sum(1 for start in postings[0][docid]
+                        if all(start + offset in positions for offset, positions in enumerate(following, 1)))
+            if count:
+                matches[docid] = count
+
+        scores = {}
+
+        for term, termpostings in zip(value, postings):
+            idf = self._idf(len(termpostings))
+
+            for docid, count in matches.items():
+                scores[docid] = scores.get(docid, 0.0) + self._bm25(idf, count, docid)
+
+        return scores
+
+    def _score(self, term: str, postings: Dict[int, List[int]]) -> Dict[int, float]:
+        idf = self._idf(len(postings))
+        return {docid: self._bm25(idf, len(positions), docid) for docid, positions in postings.items()}
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (len(self._docs) - df + 0.5) / (df + 0.5))
+
+    def _bm25(self, idf: float, tf: int, docid: int) -> float:
+        average = self._total / len(self._docs) if self._docs else 1.0
+        norm = 1 - B + B * self._docs[docid][4] / (average or 1.0)
+        return idf * tf * (K1 + 1) / (tf + K1 * norm)
+
+    def _lookup(self, term: str) -> Dict[int, List[int]]:
+        """
+        Return the postings of term as {docid: positions}
+        """
+        postings = {}
+
+        if self._segment is not None:
+            index = self._segment.find(term)
+
+            if index >= 0:
+                postings = {docid: positions for docid, positions in self._segment.postings(index).items()
+                            if docid not in self._deleted}
+
+        postings.update(self._postings.get(term, {}))
+        return postings
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._sorted is None:
+            self._sorted = sorted(self._postings)
+
+        terms = set(_with_prefix(self._sorted, prefix))
+
+        if self._segment is not None:
+            terms.update(_with_prefix(self._segment.terms, prefix))
+
+        return sorted(terms)[:MAX_EXPANSIONS]
+
+    """
+    Persistence
+    """
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to path as a compact, memory-mappable file
+        """
+        with self._lock:
+            renumber = {docid: new for new, docid in enumerate(sorted(self._docs))}
+            terms = set(self._postings)
+
+            if self._segment is not None:
+                terms.update(self._segment.terms)
+
+            names = bytearray()
+            postings = bytearray()
+            table = bytearray()
+
+            for term in sorted(terms):
+                encoded = _encode({renumber[docid]: positions for docid, positions in self._lookup(term).items()})
+
+                if not encoded[1]:
+                    continue
+
+                name = term.encode('UTF-8')
+                table += TERM.pack(len(names), len(name), len(postings), len(encoded[0]), encoded[1])
+                names += name
+                postings += encoded[0]
+
+            docs = b''.join(DOC.pack(*self._docs[docid]) for docid in sorted(self._docs))
+            names_offset = HEADER.size + len(docs) + len(table)
+            header = HEADER.pack(MAGIC, VERSION, len(self._docs), len(table) // TERM.size,
+                                    names_offset, names_offset + len(names))
+
+        tmp = f'{path}.tmp'
+
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(docs)
+            f.write(table)
+            f.write(names)
+            f.write(postings)
+
+        os.replace(tmp, path)
+
+    def close(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+
+    def _open(self, path: str) -> None:
+        self._segment = _Segment(path)
+
+        for docid, doc in enumerate(self._segment.docs):
+            kind, key, messageId = doc[0], doc[1], doc[2]
+            self._docs[docid] = doc
+            self._keys[(kind, key)] = docid
+            self._total += doc[4]
+
+            if kind == COMMENT:
+                self._comments.setdefault(messageId, set()).add(key)
+
+        self._next = len(self._segment.docs)
+
+    """
+    Internals
+    """
+
+    def _add(self, kind: int, key: int, messageId: int, teamId: int, tokens: List[Optional[str]]) -> None:
+        docid = self._next
+        self._next += 1
+
+        # None marks a field boundary that phrases must not span
+        length = sum(1 for token in tokens if token is not None)
+        self._docs[docid] = (kind, key, messageId, teamId or 0, length)
+        self._keys[(kind, key)] = docid
+        self._total += length
+
+        for position, token in enumerate(tokens):
+            if token is None:
+                continue
+
+            if token not in self._postings:
+                self._postings[token] = {}
+                self._sorted = None
+
+            self._postings[token].setdefault(docid, []).append(position)
+
+        self._terms_of[docid] = {token for token in tokens if token is not None}
+
+    def _remove(self, key: Tuple[int, int]) -> None:
+        docid = self._keys.pop(key, None)
+
+        if docid is None:
+            return
+
+        self._total -= self._docs.pop(docid)[4]
+
+        if docid not in self._terms_of:
+            self._deleted.add(docid)
+            return
+
+        for term in self._terms_of.pop(docid):
+            postings = self._postings[term]
+            del postings[docid]
+
+            if not postings:
+                del self._postings[term]
+                self._sorted = None
+
+
+class _Segment:
+    """
+    Read-only view of a saved index through a memory map
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, ndocs, nterms, self._names, self._data = HEADER.unpack_from(self._map, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise TheTeamCowboyAPIException(f'{path} is not a TCIndex file')
+
+        self.docs = list(DOC.iter_unpack(self._map[HEADER.size:HEADER.size + ndocs * DOC.size]))
+        self._table = HEADER.size + ndocs * DOC.size
+        self.terms = _Terms(self, nterms)
+
+    def entry(self, index: int) -> Tuple[int, int, int, int, int]:
+        return TERM.unpack_from(self._map, self._table + index * TERM.size)
+
+    def term(self, index: int) -> str:
+        offset, length = self.entry(index)[:2]
+        return self._map[self._names + offset:self._names + offset + length].decode('UTF-8')
+
+    def find(self, term: str) -> int:
+        index = bisect.bisect_left(self.terms, term)
+        return index if index < len(self.terms) and self.terms[index] == term else -1
+
+    def postings(self, index: int) -> Dict[int, List[int]]:
+        _, _, offset, length, _ = self.entry(index)
+        return _decode(self._map[self._data + offset:self._data + offset + length])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class _Terms:
+    """
+    Sorted term list of a segment, decoded on access so bisect can search it
+    """
+
+    def __init__(self, segment: _Segment, count: int):
+        self._segment = segment
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._segment.term(index)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._segment.term(index) for index in range(self._count))
+
+
+def _parse(query: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (kind, value) clauses: ('term', str), ('prefix', str), ('phrase', [str])
+    """
+    for phrase, word in QUERY.findall(query):
+        tokens = tokenize(phrase or word)
+
+        if not tokens:
+            continue
+
+        if word.endswith('*') and len(tokens) == 1:
+            yield 'prefix', tokens[0]
+        elif len(tokens) == 1:
+            yield 'term', tokens[0]
+        else:
+            yield 'phrase', tokens
+
+
+def _with_prefix(terms, prefix: str) -> Iterator[str]:
+    for index in range(bisect.bisect_left(terms, prefix), len(terms)):
+        term = terms[index]
+
+        if not term.startswith(prefix):
+            return
+
+        yield term
+
+
+def _varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode(postings: Dict[int, List[int]]) -> Tuple[bytes, int]:
+    """
+    Delta and varint encode postings, returning the bytes and the doc count
+    """
+    out = bytearray()
+    previous = 0
+
+    for docid in sorted(postings):
+        positions = postings[docid]
+        _varint(docid - previous, out)
+        _varint(len(positions), out)
+        previous = docid
+        last = 0
+
+        for position in positions:
+            _varint(position - last, out)
+            last = position
+
+    return bytes(out), len(postings)
+
+
+def _decode(data: bytes) -> Dict[int, List[int]]:
+    values = []
+    value = shift = 0
+
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+
+    postings = {}
+    docid = 0
+    index = 0
+
+    while index < len(values):
+        docid += values[index]
+        count = values[index + 1]
+        index += 2
+        position = 0
+        positions = []
+
+        for delta in values[index:index + count]:
+            position += delta
+            positions.append(position)
+
+        postings[docid] = positions
+        index += count
+
+    return postings
@@ -0,0 +1,421 @@
+from typing import Any, Dict, Iterable, List, Optional
+from dataclasses import dataclass, asdict
+import json
+import sqlite3
+import threading
+
+from teamcowboyapi.objects.attendances import Attendancelist
+from teamcowboyapi.objects.events import Event
+from teamcowboyapi.objects.messages import Message
+from teamcowboyapi.objects.seasons import Season
+from teamcowboyapi.objects.teams import Team
+from teamcowboyapi.objects.users import User
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    teamId INTEGER PRIMARY KEY,
+    name TEXT,
+    dateLastUpdatedUtc TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    seasonId INTEGER PRIMARY KEY,
+    teamId INTEGER NOT NULL,
+    startDateUtc TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seasons_team ON seasons (teamId);
+CREATE TABLE IF NOT EXISTS events (
+    eventId INTEGER PRIMARY KEY,
+    teamId INTEGER NOT NULL,
+    seasonId INTEGER,
+    locationId INTEGER,
+    startDateTimeLocal TEXT,
+    startDateTimeUtc TEXT,
+    endDateTimeUtc TEXT,
+    dateLastUpdatedUtc TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_team_start ON events (teamId, startDateTimeLocal);
+CREATE INDEX IF NOT EXISTS events_location_start ON events (locationId, startDateTimeUtc);
+CREATE TABLE IF NOT EXISTS users (
+    userId INTEGER PRIMARY KEY,
+    dateLastUpdatedUtc TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roster (
+    teamId INTEGER NOT NULL,
+    userId INTEGER NOT NULL,
+    teamMemberType TEXT,
+    PRIMARY KEY (teamId, userId)
+);
+CREATE INDEX IF NOT EXISTS roster_user ON roster (userId);
+CREATE TABLE IF NOT EXISTS rsvps (
+    eventId INTEGER NOT NULL,
+    userId INTEGER NOT NULL,
+    teamId INTEGER NOT NULL,
+    status TEXT,
+    comments TEXT,
+    addlMale INTEGER,
+    addlFemale INTEGER,
+    dateLastUpdatedUtc TEXT,
+    PRIMARY KEY (eventId, userId)
+);
+CREATE INDEX IF NOT EXISTS rsvps_user ON rsvps (userId);
+CREATE TABLE IF NOT EXISTS messages (
+    messageId INTEGER PRIMARY KEY,
+    teamId INTEGER NOT NULL,
+    dateLastUpdatedUtc TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_team_updated ON messages (teamId, dateLastUpdatedUtc);
+"""
+
+
+@dataclass
+class Storedrsvp:
+    """
+    A user's RSVP for an event, as held in the local store.
+
+    Attributes:
+    -----------
+    eventId : int
+        Event Id
+    teamId : int
+        Team Id
+    userId : int
+        User Id
+    status : str
+        RSVP status
+    comments : str
+        RSVP comments
+    addlMale : int
+        Additional male attendees
+    addlFemale : int
+        Additional female attendees
+    dateLastUpdatedUtc : str
+        Date/time the RSVP was last updated (UTC)
+    startDateTimeLocal : str
+        Start of the event, if the event itself is stored
+    """
+    eventId: int
+    teamId: int
+    userId: int
+    status: str
+    comments: str
+    addlMale: int
+    addlFemale: int
+    dateLastUpdatedUtc: str
+    startDateTimeLocal: Optional[str] = None
+
+
+def _dumps(obj: Any) -> str:
+    # Anything json cannot encode (e.g. a bare type used as a dataclass
+    # default) is stored as null
+    return json.dumps(asdict(obj), separators=(',', ':'), default=lambda value: None)
+
+
+class TCStore:
+    """
+    Local SQLite replica of teams, seasons, events, rosters, RSVPs and
+    messages.
+
+    Objects are stored as JSON alongside indexed columns for the common
+    lookups, so reads are answered locally without calling the api. Attach
+    the store to a Teamcowboy client and every fetch keeps it up to date.
+
+    >>> store = TCStore('teamcowboy.db')
+    >>> store.attach(Teamcowboy)
+    >>> Teamcowboy.Team_GetEvents(teamid)
+    >>> store.events(teamid, '2026-05-01 00:00:00', '2026-05-31 23:59:59')
+
+    Attributes:
+    -----------
+    path : str
+        SQLite database path, ':memory:' for an in-memory store
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._tc = None
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._db:
+            if path != ':memory:':
+                self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    """
+    Keeping the store fresh
+    """
+
+    def attach(self, tc) -> None:
+        """
+        Update the store from every call made through a Teamcowboy client
+        """
+        self._tc = tc
+        tc.add_listener(self.on_call)
+
+    def detach(self, tc) -> None:
+        tc.remove_listener(self.on_call)
+
+    def on_call(self, method: str, params: Dict, result: Any) -> None:
+        """
+        Teamcowboy listener that writes fetched objects into the store
+        """
+        if not result:
+            return
+
+        if method in ('Team_Get', 'User_GetTeams'):
+            self.upsert_teams(result if isinstance(result, list) else [result])
+
+        elif method == 'Team_GetSeasons':
+            self.upsert_seasons(result)
+
+        elif method in ('Event_Get', 'Team_GetEvents', 'User_GetNextTeamEvent', 'User_GetTeamEvents'):
+            self.upsert_events(result if isinstance(result, list) else [result])
+
+        elif method == 'Team_GetRoster':
+            # A single-user lookup must not replace the whole roster
+            self.upsert_users(result, teamId=params['teamId'], replace_roster='userId' not in params)
+
+        elif method == 'User_Get':
+            self.upsert_users([result])
+
+        elif method == 'Event_GetAttendanceList':
+            self.upsert_attendance(params['teamId'], params['eventId'], result)
+
+        elif method in ('Message_Get', 'Message_Save', 'Team_GetMessages', 'User_GetTeamMessages'):
+            self.upsert_messages(result if isinstance(result, list) else [result])
+
+        elif method == 'Message_Delete':
+            self.delete_message(params['messageId'])
+
+        elif method == 'Event_SaveRSVP':
+            userId = params.get('rsvpAsUserId') or getattr(self._tc, 'userid', None)
+
+            if userId is not None:
+                self.update_rsvp(params['teamId'], params['eventId'], int(userId), params['status'],
+                                    comments=params.get('comments'))
+
+    """
+    Bulk upserts
+    """
+
+    def upsert_teams(self, teams: Iterable[Team]) -> None:
+        rows = [(team.teamId, team.name, team.dateLastUpdatedUtc, _dumps(team)) for team in teams]
+        self._executemany("""
+            INSERT INTO teams (teamId, name, dateLastUpdatedUtc, data) VALUES (?, ?, ?, ?)
+            ON CONFLICT (teamId) DO UPDATE SET name = excluded.name,
+                dateLastUpdatedUtc = excluded.dateLastUpdatedUtc, data = excluded.data
+            """, rows)
+
+    def upsert_seasons(self, seasons: Iterable[Season]) -> None:
+        rows = [(season.seasonId, season.teamId, season.startDateUtc, _dumps(season)) for season in seasons]
+        self._executemany("""
+            INSERT INTO seasons (seasonId, teamId, startDateUtc, data) VALUES (?, ?, ?, ?)
+            ON CONFLICT (seasonId) DO UPDATE SET teamId = excluded.teamId,
+                startDateUtc = excluded.startDateUtc, data = excluded.data
+            """, rows)
+
+    def upsert_events(self, events: Iterable[Event]) -> None:
+        rows = [(event.eventId, event.team.teamId, event.seasonId,
+                    event.location.locationId if event.location else None,
+                    event.dateTimeInfo.startDateTimeLocal, event.dateTimeInfo.startDateTimeUtc,
+                    event.dateTimeInfo.endDateTimeUtc, event.dateLastUpdatedUtc, _dumps(event))
+                for event in events]
+        self._executemany("""
+            INSERT INTO events (eventId, teamId, seasonId, locationId, startDateTimeLocal,
+                startDateTimeUtc, endDateTimeUtc, dateLastUpdatedUtc, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (eventId) DO UPDATE SET teamId = excluded.teamId,
+                seasonId = excluded.seasonId, locationId = excluded.locationId,
+                startDateTimeLocal = excluded.startDateTimeLocal,
+                startDateTimeUtc = excluded.startDateTimeUtc, endDateTimeUtc = excluded.endDateTimeUtc,
+                dateLastUpdatedUtc = excluded.dateLastUpdatedUtc, data = excluded.data
+            """, rows)
+
+    def upsert_users(self, users: Iterable[User], teamId: int = None, replace_roster: bool = False) -> None:
+        """
+        Store users, and their roster membership if teamId is given
+
+        Parameters:
+        -----------
+        users : Iterable[User]
+            Users to store
+        teamId : int
+            Team the users were fetched for
+        replace_roster : bool
+            Treat users as the team's complete roster, removing members that
+            are missing from it
+        """
+        users = list(users)
+        rows = [(user.userId, user.dateLastUpdatedUtc, _dumps(user)) for user in users]
+
+        with self._lock, self._db:
+            self._db.executemany("""
+                INSERT INTO users (userId, dateLastUpdatedUtc, data) VALUES (?, ?, ?)
+                ON CONFLICT (userId) DO UPDATE SET dateLastUpdatedUtc = excluded.dateLastUpdatedUtc,
+                    data = excluded.data
+                """, rows)
+
+            if teamId is not None:
+                if replace_roster:
+                    self._db.execute('DELETE FROM roster WHERE teamId = ?', (teamId,))
+
+                self._db.executemany("""
+                    INSERT OR REPLACE INTO roster (teamId, userId, teamMemberType) VALUES (?, ?, ?)
+                    """, [(teamId, user.userId, user.teamMeta.teamMemberType.name if user.teamMeta else None)
+                        for user in users])
+
+    def upsert_attendance(self, teamId: int, eventId: int, attendancelist: Attendancelist) -> None:
+        """
+        Store the RSVP of every user on an event's attendance list
+        """
+        rows = [(eventId, entry.user.userId, teamId, entry.rsvpInfo.status, entry.rsvpInfo.comments,
+                    entry.rsvpInfo.addlMale, entry.rsvpInfo.addlFemale, entry.rsvpInfo.dateLastUpdatedUtc)
+                for entry in attendancelist.users]
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM rsvps WHERE eventId = ?', (eventId,))
+            self._db.executemany("""
+                INSERT INTO rsvps (eventId, userId, teamId, status, comments, addlMale, addlFemale,
+                    dateLastUpdatedUtc) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+
+    def update_rsvp(self, teamId: int, eventId: int, userId: int, status: str, comments: str = None) -> None:
+        """
+        Record a single RSVP saved through the api
+        """
+        self._executemany("""
+            INSERT INTO rsvps (eventId, userId, teamId, status, comments) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (eventId, userId) DO UPDATE SET status = excluded.status,
+                comments = excluded.comments
+            """, [(eventId, userId, teamId, status, comments)])
+
+    def upsert_messages(self, messages: Iterable[Message]) -> None:
+        rows = [(message.messageId, message.team.teamId, message.dateLastUpdatedUtc, _dumps(message))
+                for message in messages]
+        self._executemany("""
+            INSERT INTO messages (messageId, teamId, dateLastUpdatedUtc, data) VALUES (?, ?, ?, ?)
+            ON CONFLICT (messageId) DO UPDATE SET teamId = excluded.teamId,
+                dateLastUpdatedUtc = excluded.dateLastUpdatedUtc, data = excluded.data
+            """, rows)
+
+    def delete_message(self, messageId: int) -> None:
+        self._executemany('DELETE FROM messages WHERE messageId = ?', [(messageId,)])
+
+    def delete_event(self, eventId: int) -> None:
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM events WHERE eventId = ?', (eventId,))
+            self._db.execute('DELETE FROM rsvps WHERE eventId = ?', (eventId,))
+
+    """
+    Queries
+    """
+
+    def team(self, teamId: int) -> Optional[Team]:
+        rows = self._query('SELECT data FROM teams WHERE teamId = ?', (teamId,))
+        return Team(**json.loads(rows[0][0])) if rows else None
+
+    def seasons(self, teamId: int) -> List[Season]:
+        rows = self._query('SELECT data FROM seasons WHERE teamId = ? ORDER BY startDateUtc', (teamId,))
+        return [Season(**json.loads(data)) for data, in rows]
+
+    def event(self, eventId: int) -> Optional[Event]:
+        rows = self._query('SELECT data FROM events WHERE eventId = ?', (eventId,))
+        return Event(**json.loads(rows[0][0])) if rows else None
+
+    def events(self, teamId: int, startDateTime: str = None, endDateTime: str = None) -> List[Event]:
+        """
+        Return a team's events, optionally bounded by start date/time
+
+        Parameters:
+        -----------
+        teamId : int
+            Team Id
+        startDateTime : str
+            Only events starting on or after this local date/time
+            (YYYY-MM-DD HH:MM:SS)
+        endDateTime : str
+            Only events starting on or before this local date/time
+            (YYYY-MM-DD HH:MM:SS)
+
+        Returns:
+        --------
+        List of Event objects ordered by start
+        """
+        rows = self._query("""
+            SELECT data FROM events WHERE teamId = ?
+                AND startDateTimeLocal >= ? AND startDateTimeLocal <= ?
+            ORDER BY startDateTimeLocal
+            """, (teamId, startDateTime or '', endDateTime or '9999-12-31 23:59:59'))
+        return [Event(**json.loads(data)) for data, in rows]
+
+    def roster(self, teamId: int) -> List[User]:
+        rows = self._query("""
+            SELECT users.data FROM roster JOIN users USING (userId) WHERE roster.teamId = ?
+            ORDER BY userId
+            """, (teamId,))
+        return [User(**json.loads(data)) for data, in rows]
+
+    def user(self, userId: int) -> Optional[User]:
+        rows = self._query('SELECT data FROM users WHERE userId = ?', (userId,))
+        return User(**json.loads(rows[0][0])) if rows else None
+
+    def rsvps_by_user(self, userId: int, teamId: int = None) -> List[Storedrsvp]:
+        """
+        Return a user's stored RSVPs, ordered by event start where known
+        """
+        rows = self._query("""
+            SELECT rsvps.eventId, rsvps.teamId, rsvps.userId, rsvps.status, rsvps.comments,
+                rsvps.addlMale, rsvps.addlFemale, rsvps.dateLastUpdatedUtc, events.startDateTimeLocal
+            FROM rsvps LEFT JOIN events USING (eventId)
+            WHERE rsvps.userId = ? AND (? IS NULL OR rsvps.teamId = ?)
+            ORDER BY events.startDateTimeLocal, rsvps.eventId
+            """, (userId, teamId, teamId))
+        return [Storedrsvp(*row) for row in rows]
+
+    def rsvps_by_event(self, eventId: int) -> List[Storedrsvp]:
+        rows = self._query("""
+            SELECT rsvps.eventId, rsvps.teamId, rsvps.userId, rsvps.status, rsvps.comments,
+                rsvps.addlMale, rsvps.addlFemale, rsvps.dateLastUpdatedUtc, events.startDateTimeLocal
+            FROM rsvps LEFT JOIN events USING (eventId)
+            WHERE rsvps.eventId = ? ORDER BY rsvps.userId
+            """, (eventId,))
+        return [Storedrsvp(*row) for row in rows]
+
+    def message(self, messageId: int) -> Optional[Message]:
+        rows = self._query('SELECT data FROM messages WHERE messageId = ?', (messageId,))
+        return Message(**json.loads(rows[0][0])) if rows else None
+
+    def messages(self, teamId: int, since: str = None) -> List[Message]:
+        """
+        Return a team's messages, newest update first
+
+        Parameters:
+        -----------
+        teamId : int
+            Team Id
+        since : str
+            Only messages updated after this UTC date/time
+        """
+        rows = self._query("""
+            SELECT data FROM messages WHERE teamId = ? AND dateLastUpdatedUtc > ?
+            ORDER BY dateLastUpdatedUtc DESC
+            """, (teamId, since or ''))
+        return [Message(**json.loads(data)) for data, in rows]
+
+    def _executemany(self, sql: str, rows: List) -> None:
+        with self._lock, self._db:
+            self._db.executemany(sql, rows)
+
+    def _query(self, sql: str, args: tuple) -> List:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
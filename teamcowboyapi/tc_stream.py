@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Sequence
+import codecs
+import json
+
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException
+
+# TCDataAdapter imports this module, so models are only loaded on first use
+from teamcowboyapi.objects import attendances, events, users
+
+if TYPE_CHECKING:
+    from teamcowboyapi.objects.attendances import Usersattendancelist
+    from teamcowboyapi.objects.events import Event
+    from teamcowboyapi.objects.users import User
+
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',:]}'
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """
+    Text buffer over a stream of byte chunks that only holds the part of the
+    document not parsed yet
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('UTF-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _more(self) -> bool:
+        if self._eof:
+            return False
+
+        # Drop what has been parsed so memory follows the item being read
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+
+            if text:
+                self._buf += text
+                return True
+
+        self._buf += self._utf8.decode(b'', final=True)
+        self._eof = True
+        return True
+
+    def peek(self) -> str:
+        """
+        Return the next character that is not whitespace, without consuming it
+        """
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+
+            if not self._more():
+                raise TheTeamCowboyAPIException('Unexpected end of JSON in response')
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise TheTeamCowboyAPIException(f'Bad JSON in response, expected {char!r}')
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value
+        """
+        self.peek()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+
+                # A number cut by the chunk boundary ("0." or "12") still
+                # decodes, so only accept values followed by a delimiter
+                if self._eof or (end < len(self._buf) and self._buf[end] in DELIMITERS):
+                    self._pos = end
+                    return value
+
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise TheTeamCowboyAPIException('Bad JSON in response') from e
+
+            self._more()
+
+
+def iterarray(chunks: Iterable[bytes], path: Sequence[str] = ('body',), rest: Dict = None) -> Iterator[Any]:
+    """
+    Yield the elements of the array at path in a JSON document as each one
+    is parsed, reading the document chunk by chunk
+
+    Only the element being parsed is held in memory, so a long list can be
+    processed while it downloads. Values that are not on path are decoded
+    and dropped, or kept in rest if it is given.
+
+    >>> list(iterarray([b'{"success": true, "body": [{"a"', b': 1}, {"a": 2}]}']))
+    [{'a': 1}, {'a': 2}]
+
+    Parameters:
+    -----------
+    chunks : Iterable[bytes]
+        The document, e.g. requests.Response.iter_content()
+    path : Sequence[str]
+        Keys of the nested objects leading to the array
+    rest : Dict
+        Optional dict that receives every other key passed on the way, by
+        key. A value found at path that is not an array is stored here too.
+
+    Returns:
+    --------
+    Iterator over the array's elements
+    """
+    reader = _Reader(chunks)
+    rest = rest if rest is not None else {}
+
+    yield from _object(reader, path, rest)
+
+    try:
+        reader.peek()
+    except TheTeamCowboyAPIException:
+        return
+
+    raise TheTeamCowboyAPIException('Bad JSON in response, trailing data')
+
+
+def _object(reader: _Reader, path: Sequence[str], rest: Dict) -> Iterator[Any]:
+    reader.expect('{')
+
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+
+        if key == path[0] and len(path) == 1 and reader.peek() == '[':
+            yield from _array(reader)
+        elif key == path[0] and len(path) > 1 and reader.peek() == '{':
+            yield from _object(reader, path[1:], rest)
+        else:
+            rest[key] = reader.value()
+
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+
+        reader.expect('}')
+        return
+
+
+def _array(reader: _Reader) -> Iterator[Any]:
+    reader.expect('[')
+
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+
+    while True:
+        yield reader.value()
+
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+
+        reader.expect(']')
+        return
+
+
+def iter_events(tc, teamId: int, **params) -> Iterator[Event]:
+    """
+    Yield the events of Teamcowboy.Team_GetEvents as the response arrives
+
+    >>> for event in iter_events(Teamcowboy, teamid, qty=500, filter='past'):
+    ...     print(event.title)
+    """
+    for event in tc.stream('Team_GetEvents', teamId=teamId, **params):
+        yield events.Event(**event)
+
+
+def iter_roster(tc, teamId: int, **params) -> Iterator[User]:
+    """
+    Yield the users of Teamcowboy.Team_GetRoster as the response arrives
+    """
+    for user in tc.stream('Team_GetRoster', teamId=teamId, **params):
+        yield users.User(**user)
+
+
+def iter_attendance(tc, teamId: int, eventId: int) -> Iterator[Usersattendancelist]:
+    """
+    Yield the users of an event's attendance list as the response arrives,
+    without the list's counts and meta information
+    """
+    for entry in tc.stream('Event_GetAttendanceList', path=('body', 'users'), teamId=teamId, eventId=eventId):
+        yield attendances.Usersattendancelist(**entry)
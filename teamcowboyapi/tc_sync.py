@@ -0,0 +1,246 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+import functools
+
+from teamcowboyapi import tc_helpers
+from teamcowboyapi.objects.events import Event
+from teamcowboyapi.objects.messages import Message
+from teamcowboyapi.objects.teams import Team
+from teamcowboyapi.objects.users import User
+
+
+@dataclass
+class Changeset:
+    """
+    Changes found by one sync pass.
+
+    Attributes:
+    -----------
+    inserted : list
+        Objects that were not in the replica before
+    updated : list
+        Objects whose dateLastUpdatedUtc changed
+    deleted : list
+        Objects that were removed from the replica
+    """
+    inserted: List = field(default_factory=list)
+    updated: List = field(default_factory=list)
+    deleted: List = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+@dataclass
+class TeamReplica:
+    """
+    Local copy of a team's data along with the sync watermarks.
+
+    Attributes:
+    -----------
+    teamId : int
+        Team Id
+    team : Team
+        Last synced Team object
+    events : Dict[int, Event]
+        Events by eventId
+    messages : Dict[int, Message]
+        Messages by messageId
+    roster : Dict[int, User]
+        Team members by userId
+    watermarks : Dict[str, str]
+        Newest dateLastUpdatedUtc seen per collection ("team", "events",
+        "messages", "roster"). Values are UTC strings in the api's
+        YYYY-MM-DD HH:MM:SS format, so they compare correctly as strings.
+    """
+    teamId: int
+    team: Optional[Team] = None
+    events: Dict[int, Event] = field(default_factory=dict)
+    messages: Dict[int, Message] = field(default_factory=dict)
+    roster: Dict[int, User] = field(default_factory=dict)
+    watermarks: Dict[str, str] = field(default_factory=dict)
+
+
+class TeamSync:
+    """
+    Incremental sync of one team into a TeamReplica.
+
+    Messages are requested newest-updated first and paging stops at the first
+    message older than the stored watermark, so a pass costs what changed
+    rather than the size of the board. Events can only be filtered by start
+    date, so they are synced one date window at a time; events in the window
+    that the api no longer returns are reported as deleted.
+
+    Attributes:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    teamId : int
+        Id of the team to sync
+    replica : TeamReplica
+        Replica to update. A new one is created if not provided.
+    page_size : int
+        Number of events or messages requested per page
+    """
+
+    def __init__(self, tc, teamId: int, replica: TeamReplica = None, page_size: int = 50):
+        self.tc = tc
+        self.teamId = teamId
+        self.replica = replica or TeamReplica(teamId=teamId)
+        self.page_size = page_size
+
+    def sync(self, startDateTime: str = None, endDateTime: str = None) -> Dict[str, Changeset]:
+        """
+        Sync the team, its roster and messages, and its events in a window
+
+        Parameters:
+        -----------
+        startDateTime : str
+            Start of the event window (YYYY-MM-DD HH:MM:SS). Events are
+            skipped if neither bound is given.
+        endDateTime : str
+            End of the event window (YYYY-MM-DD HH:MM:SS)
+
+        Returns:
+        --------
+        Dict of Changeset by collection name
+        """
+        changes = {
+            "team": self.sync_team(),
+            "roster": self.sync_roster(),
+            "messages": self.sync_messages(),
+        }
+
+        if startDateTime or endDateTime:
+            changes["events"] = self.sync_events(startDateTime, endDateTime)
+
+        return changes
+
+    def sync_team(self) -> Changeset:
+        """
+        Refresh the Team object if it changed
+        """
+        changes = Changeset()
+        team = self.tc.Team_Get(self.teamId)
+
+        if team is None:
+            return changes
+
+        if self.replica.team is None:
+            changes.inserted.append(team)
+        elif team.dateLastUpdatedUtc != self.replica.team.dateLastUpdatedUtc:
+            changes.updated.append(team)
+
+        self.replica.team = team
+        self._advance("team", team.dateLastUpdatedUtc)
+
+        return changes
+
+    def sync_roster(self) -> Changeset:
+        """
+        Refresh the roster, reporting joins, updates and leaves
+        """
+        users = self.tc.Team_GetRoster(self.teamId) or []
+        changes = self._merge(self.replica.roster, {user.userId: user for user in users})
+        self._advance("roster", *(user.dateLastUpdatedUtc for user in users))
+
+        return changes
+
+    def sync_messages(self, full: bool = False) -> Changeset:
+        """
+        Fetch messages updated since the watermark
+
+        Parameters:
+        -----------
+        full : bool
+            Page through every message instead of stopping at the watermark.
+            Deleted messages can only be detected on a full pass.
+
+        Returns:
+        --------
+        Changeset of Message objects
+        """
+        watermark = None if full else self.replica.watermarks.get("messages")
+        fetch = functools.partial(self.tc.Team_GetMessages, self.teamId)
+        seen = {}
+
+        for message in tc_helpers.paginate(fetch, qty=self.page_size,
+                                            sortBy="lastUpdated", sortDirection="DESC"):
+            if watermark is not None and message.dateLastUpdatedUtc < watermark:
+                break
+
+            seen[message.messageId] = message
+
+        changes = self._merge(self.replica.messages, seen, remove_missing=full)
+        self._advance("messages", *(message.dateLastUpdatedUtc for message in seen.values()))
+
+        return changes
+
+    def sync_events(self, startDateTime: str = None, endDateTime: str = None) -> Changeset:
+        """
+        Sync the events that start within a date window
+
+        Parameters:
+        -----------
+        startDateTime : str
+            Start of the window (YYYY-MM-DD HH:MM:SS), in the team's local time
+        endDateTime : str
+            End of the window (YYYY-MM-DD HH:MM:SS), in the team's local time
+
+        Returns:
+        --------
+        Changeset of Event objects
+        """
+        params = {"filter": "specificDates"}
+
+        if startDateTime:
+            params["startDateTime"] = startDateTime
+        if endDateTime:
+            params["endDateTime"] = endDateTime
+
+        fetch = functools.partial(self.tc.Team_GetEvents, self.teamId)
+        seen = {event.eventId: event for event in tc_helpers.paginate(fetch, qty=self.page_size, **params)}
+
+        def in_window(event: Event) -> bool:
+            start = event.dateTimeInfo.startDateTimeLocal
+            return ((not startDateTime or start >= startDateTime)
+                        and (not endDateTime or start <= endDateTime))
+
+        window = {eventId: event for eventId, event in self.replica.events.items() if in_window(event)}
+        changes = self._merge(window, seen, remove_missing=True)
+
+        for event in changes.deleted:
+            del self.replica.events[event.eventId]
+
+        self.replica.events.update(seen)
+        self._advance("events", *(event.dateLastUpdatedUtc for event in seen.values()))
+
+        return changes
+
+    def _merge(self, current: Dict, fetched: Dict, remove_missing: bool = True) -> Changeset:
+        """
+        Merge fetched objects into current in place and return the changes
+        """
+        changes = Changeset()
+
+        for key, obj in fetched.items():
+            old = current.get(key)
+
+            if old is None:
+                changes.inserted.append(obj)
+            elif old.dateLastUpdatedUtc != obj.dateLastUpdatedUtc:
+                changes.updated.append(obj)
+
+            current[key] = obj
+
+        if remove_missing:
+            for key in [key for key in current if key not in fetched]:
+                changes.deleted.append(current.pop(key))
+
+        return changes
+
+    def _advance(self, collection: str, *timestamps: str) -> None:
+        newest = max(filter(None, timestamps), default=None)
+
+        if newest and newest > self.replica.watermarks.get(collection, ""):
+            self.replica.watermarks[collection] = newest
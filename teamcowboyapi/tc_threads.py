@@ -0,0 +1,51 @@
+from typing import Iterator
+
+from teamcowboyapi import tc_deadline
+from teamcowboyapi.objects.messages import Message
+
+
+def load_threads(tc, teamId: int, max_workers: int = 4, **params) -> Iterator[Message]:
+    """
+    Fetch a page of a team's messages and load their comments concurrently
+
+    Messages without comments are yielded straight away. The others are
+    fetched with Message_Get(loadComments) on a thread pool that shares the
+    client's pooled connection, and each is yielded as soon as its comments
+    arrive, so threads come out in completion order rather than page order.
+    Closing the generator early cancels the loads that have not started.
+
+    >>> for message in load_threads(Teamcowboy, teamid, qty=20):
+    ...     print(message.title, len(message.comments))
+
+    Parameters:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    teamId : int
+        Id of the team to load messages for
+    max_workers : int
+        Number of comment loads in flight at once
+    params : dict
+        Team_GetMessages params, e.g. offset, qty, sortBy, sortDirection
+
+    Returns:
+    --------
+    Iterator of Message objects with comments loaded
+    """
+    messages = tc.Team_GetMessages(teamId, **params) or []
+    pending = []
+
+    for message in messages:
+        if message.commentCount:
+            pending.append(message)
+        else:
+            message.comments = []
+            yield message
+
+    def load(message: Message) -> Message:
+        return tc.Message_Get(teamId, message.messageId, loadComments="true")
+
+    for index, thread in tc_deadline.stream(load, pending, max_workers=max_workers):
+        # Message_Get returns None if the message was deleted in the meantime
+        if thread is not None:
+            yield thread
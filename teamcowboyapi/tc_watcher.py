@@ -0,0 +1,360 @@
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+
+from . import tc_decode
+from .tc_helpers import parse_utc
+from .tc_sync import Changeset
+from teamcowboyapi.objects.attendances.attendancelist import Attendancelistuserinfo, Usersattendancelist
+from teamcowboyapi.objects.events import Event
+
+
+# Envelope fields that change on every response, dropped before hashing
+VOLATILE = re.compile(rb'"requestSecs"\s*:\s*[-+.\deE]+\s*,?')
+
+
+@dataclass
+class Rsvpchange:
+    """
+    A change to one user's RSVP.
+
+    Attributes:
+    -----------
+    userId : int
+        User Id
+    old : Attendancelistuserinfo
+        RSVP information before the change
+    new : Attendancelistuserinfo
+        RSVP information after the change
+    """
+    userId: int
+    old: Attendancelistuserinfo
+    new: Attendancelistuserinfo
+
+
+@dataclass
+class Attendancedelta:
+    """
+    Changes to an event's attendance list between two polls.
+
+    Attributes:
+    -----------
+    teamId : int
+        Team Id
+    eventId : int
+        Event Id
+    added : List[Usersattendancelist]
+        Users that appeared on the attendance list
+    removed : List[Usersattendancelist]
+        Users that are no longer on the attendance list
+    changed : List[Rsvpchange]
+        Users whose RSVP information changed
+    """
+    teamId: int
+    eventId: int
+    added: List[Usersattendancelist] = field(default_factory=list)
+    removed: List[Usersattendancelist] = field(default_factory=list)
+    changed: List[Rsvpchange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class Eventsdelta:
+    """
+    Changes to a team's event list between two polls.
+
+    Attributes:
+    -----------
+    teamId : int
+        Team Id
+    changes : Changeset
+        Inserted, updated and deleted Event objects
+    """
+    teamId: int
+    changes: Changeset
+
+
+class Watch:
+    """
+    A single scheduled poll, returned by Watcher.watch_event and
+    Watcher.watch_team and used to unwatch it.
+    """
+
+    def __init__(self, kind: str, teamId: int, callback: Callable, eventId: int = None, params: Dict = None):
+        self.kind = kind
+        self.teamId = teamId
+        self.eventId = eventId
+        self.callback = callback
+        self.params = params or {}
+        self.digest = None
+        self.state = None
+        self.start = None
+        self.interval = None
+        self.active = True
+
+
+class Watcher:
+    """
+    Polls events and team schedules and calls subscribers with only what
+    changed.
+
+    Each poll's raw response body is hashed and an unchanged body is skipped
+    before any JSON is decoded or objects are built. Polls go through
+    Teamcowboy.raw, so they bypass the client's cache and listeners. Poll
+    intervals adapt to how close the watched event (or a team's next event)
+    is: interval = time until start * ratio, clamped between min_interval
+    and max_interval.
+
+    >>> watcher = Watcher(Teamcowboy)
+    >>> watcher.watch_event(teamid, eventid, print)
+    >>> watcher.start()
+
+    Attributes:
+    -----------
+    tc : Teamcowboy
+        Authenticated Teamcowboy client
+    min_interval : float
+        Shortest time between polls of one watch, in seconds
+    max_interval : float
+        Longest time between polls of one watch, in seconds
+    ratio : float
+        Share of the time left until the event start used as the interval
+    logger : logging.Logger
+        logger
+    """
+
+    def __init__(self, tc, min_interval: float = 30.0, max_interval: float = 3600.0,
+                    ratio: float = 0.05, logger: logging.Logger = None):
+        self.tc = tc
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ratio = ratio
+        self._logger = logger or logging.getLogger(__name__)
+
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def watch_event(self, teamId: int, eventId: int, callback: Callable) -> Watch:
+        """
+        Watch an event's attendance list
+
+        Parameters:
+        -----------
+        teamId : int
+            Id of the team that the event is associated with.
+        eventId : int
+            Id of the event to watch.
+        callback : Callable
+            Called with an Attendancedelta whenever RSVPs change. The first
+            poll reports every user as added.
+
+        Returns:
+        --------
+        Watch
+        """
+        return self._schedule(Watch('event', teamId, callback, eventId=eventId))
+
+    def watch_team(self, teamId: int, callback: Callable, **params) -> Watch:
+        """
+        Watch a team's event list
+
+        Parameters:
+        -----------
+        teamId : int
+            Id of the team to watch.
+        callback : Callable
+            Called with an Eventsdelta whenever events are added, updated or
+            removed. The first poll reports every event as inserted.
+        params : dict
+            Extra Team_GetEvents params, e.g. filter, qty
+
+        Returns:
+        --------
+        Watch
+        """
+        return self._schedule(Watch('team', teamId, callback, params=params))
+
+    def unwatch(self, watch: Watch) -> None:
+        watch.active = False
+
+    def start(self) -> None:
+        """
+        Poll in a background thread until stop is called
+        """
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='teamcowboyapi-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll_due(self) -> int:
+        """
+        Run every poll that is due now and return how many ran
+        """
+        count = 0
+
+        while True:
+            with self._lock:
+                if not self._queue or self._queue[0][0] > time.monotonic():
+                    return count
+                _, _, watch = heapq.heappop(self._queue)
+
+            if watch.active:
+                self.poll(watch)
+                self._push(watch)
+                count += 1
+
+    def poll(self, watch: Watch) -> None:
+        """
+        Poll a watch once, calling its callback if anything changed
+        """
+        try:
+            if watch.kind == 'event':
+                self._poll_event(watch)
+            else:
+                self._poll_team(watch)
+
+        except Exception as e:
+            self._logger.error(msg=f'Poll failed for team {watch.teamId} event {watch.eventId}: {e}')
+
+        watch.interval = self.interval_for(watch.start)
+
+    def interval_for(self, start: Optional[datetime]) -> float:
+        """
+        Return the poll interval for a watch whose next event starts at start
+        """
+        if start is None:
+            return self.max_interval
+
+        seconds = (start - datetime.now(timezone.utc)).total_seconds()
+
+        if seconds < 0:
+            return self.max_interval
+
+        return min(self.max_interval, max(self.min_interval, seconds * self.ratio))
+
+    def _poll_event(self, watch: Watch) -> None:
+        if watch.start is None:
+            event = self.tc.Event_Get(watch.teamId, watch.eventId)
+
+            if event is not None:
+                watch.start = parse_utc(event.dateTimeInfo.startDateTimeUtc)
+
+        raw = self.tc.raw('Event_GetAttendanceList', teamId=watch.teamId, eventId=watch.eventId)
+
+        digest = self._digest(raw)
+
+        if digest == watch.digest:
+            return
+
+        # An event nobody has answered decodes to None
+        attendancelist = tc_decode.decode('Event_GetAttendanceList', raw)
+        current = {entry.user.userId: entry for entry in attendancelist.users} if attendancelist else {}
+        delta = diff_attendance(watch.teamId, watch.eventId, watch.state or {}, current)
+        watch.state = current
+        watch.digest = digest
+
+        if delta:
+            watch.callback(delta)
+
+    def _poll_team(self, watch: Watch) -> None:
+        raw = self.tc.raw('Team_GetEvents', teamId=watch.teamId, **watch.params)
+
+        digest = self._digest(raw)
+
+        if digest != watch.digest:
+            self._diff_events(watch, tc_decode.decode('Team_GetEvents', raw) or [])
+            watch.digest = digest
+
+        # The next event moves on as time passes even if the list does not
+        starts = [parse_utc(event.dateTimeInfo.startDateTimeUtc) for event in (watch.state or {}).values()]
+        now = datetime.now(timezone.utc)
+        watch.start = min((start for start in starts if start and start >= now), default=None)
+
+    def _diff_events(self, watch: Watch, events: List[Event]) -> None:
+        previous = watch.state or {}
+        current = {event.eventId: event for event in events}
+        changes = Changeset()
+
+        for eventId, event in current.items():
+            if eventId not in previous:
+                changes.inserted.append(event)
+            elif previous[eventId].dateLastUpdatedUtc != event.dateLastUpdatedUtc:
+                changes.updated.append(event)
+
+        changes.deleted = [event for eventId, event in previous.items() if eventId not in current]
+        watch.state = current
+
+        if changes:
+            watch.callback(Eventsdelta(watch.teamId, changes))
+
+    @staticmethod
+    def _digest(raw: bytes) -> bytes:
+        # The digest is only saved on a watch once its body has been decoded
+        # and diffed, so a failed poll is retried instead of hidden
+        return hashlib.blake2b(VOLATILE.sub(b'', raw), digest_size=16).digest()
+
+    def _schedule(self, watch: Watch) -> Watch:
+        with self._lock:
+            heapq.heappush(self._queue, (time.monotonic(), next(self._seq), watch))
+
+        self._wakeup.set()
+        return watch
+
+    def _push(self, watch: Watch) -> None:
+        with self._lock:
+            heapq.heappush(self._queue, (time.monotonic() + watch.interval, next(self._seq), watch))
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            self.poll_due()
+
+            with self._lock:
+                wait = self._queue[0][0] - time.monotonic() if self._queue else None
+
+            self._wakeup.wait(timeout=None if wait is None else max(0.0, wait))
+
+
+def diff_attendance(teamId: int, eventId: int, previous: Dict[int, Usersattendancelist],
+                    current: Dict[int, Usersattendancelist]) -> Attendancedelta:
+    """
+    Diff two attendance lists keyed by userId
+
+    Returns:
+    --------
+    Attendancedelta
+    """
+    delta = Attendancedelta(teamId, eventId)
+
+    for userId, entry in current.items():
+        old = previous.get(userId)
+
+        if old is None:
+            delta.added.append(entry)
+        elif old.rsvpInfo != entry.rsvpInfo:
+            delta.changed.append(Rsvpchange(userId, old.rsvpInfo, entry.rsvpInfo))
+
+    delta.removed = [entry for userId, entry in previous.items() if userId not in current]
+
+    return delta
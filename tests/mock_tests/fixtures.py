@@ -0,0 +1,213 @@
+"""
+Canned Team Cowboy payloads and a small fake api for the mock tests.
+"""
+from urllib.parse import parse_qs, urlparse
+
+from teamcowboyapi import Teamcowboy
+
+
+URL = 'https://api.teamcowboy.com/v1/'
+
+
+def photo() -> dict:
+    return {"fullUrl": None, "smallUrl": None, "thumbUrl": None}
+
+
+def usermetainfo() -> dict:
+    return {"isTeamAdmin": False, "showOnDashboard": True}
+
+
+def location(locationId: int = 10, name: str = "Field 1") -> dict:
+    return {
+        "locationId": locationId, "name": name,
+        "surface": {"type": "grass", "typeDisplay": "Grass", "showType": True},
+        "lights": {"lights": "no", "lightsDisplay": "No", "hasLights": False},
+        "address": {"addressLine1": "1 Main St", "addressLine2": "", "city": "Seattle",
+                    "stateProvince": "WA", "postalCode": "98101", "partOfTown": "",
+                    "displayMultiLine": "1 Main St\nSeattle, WA", "displaySingleLine": "1 Main St, Seattle, WA",
+                    "googleMapsUrl": "", "googleMapsDirectionsUrl": ""},
+        "visibility": "public", "visibilityDisplay": "Public", "comments": "",
+    }
+
+
+def event(eventId: int, start: str = "2026-05-01 18:00:00", end: str = "2026-05-01 20:00:00",
+            updated: str = "2026-04-01 00:00:00", teamId: int = 1, title: str = "Sharks",
+            locationId: int = None) -> dict:
+    startdate, starttime = start.split(" ")
+    enddate, endtime = end.split(" ")
+
+    return {
+        "eventId": eventId,
+        "team": {"teamId": teamId, "name": "Team"},
+        "seasonId": 1, "seasonName": "Spring",
+        "eventType": "game", "eventTypeDisplay": "Game",
+        "status": "active", "statusDisplay": "Active",
+        "personNounSingular": "player", "personNounPlural": "players",
+        "title": title, "titleFull": f"Home vs. {title}", "titleLabel": "Opponent",
+        "homeAway": "home",
+        "result": {"scoreEntered": False, "outcome": None, "score1": 0, "score2": 0,
+                    "isWin": False, "isTie": False, "isLoss": False, "scoreDisplay": "",
+                    "dhScoreEntered": False, "dhOutcome": None, "dhScore1": 0, "dhScore2": 0,
+                    "dhIsWin": False, "dhIsTie": False, "dhIsLoss": False, "dhScoreDisplay": ""},
+        "comments": "Bring water", "options": [],
+        "oneLineDisplay": title, "oneLineDisplayShort": title,
+        "maleGenderDisplay": "Male", "femaleGenderDisplay": "Female", "otherGenderDisplay": "Other",
+        "dateTimeInfo": {
+            "timezoneId": "America/Los_Angeles",
+            "startDateLocal": startdate, "startTimeLocal": starttime, "startDateTimeLocal": start,
+            "startDateLocalDisplay": startdate, "startTimeLocalDisplay": starttime,
+            "startDateTimeLocalDisplay": start, "startDateTimeUtc": start, "startTimeTBD": False,
+            "endDateLocal": enddate, "endTimeLocal": endtime, "endDateTimeLocal": end,
+            "endDateLocalDisplay": enddate, "endTimeLocalDisplay": endtime,
+            "endDateTimeLocalDisplay": end, "endDateTimeUtc": end, "endTimeTBD": False,
+            "inPast": False, "inFuture": True,
+        },
+        "shirtColors": {"team1": None, "team2": None},
+        "userMetaInfo": usermetainfo(),
+        "dateCreatedUtc": "2026-01-01 00:00:00", "dateLastUpdatedUtc": updated,
+        "location": location(locationId) if locationId else None,
+    }
+
+
+def postedby(userId: int = 1) -> dict:
+    return {"userId": userId, "firstName": "Pat", "lastName": "Doe", "fullName": "Pat Doe",
+            "gender": "f", "genderDisplay": "Female", "profilePhoto": photo()}
+
+
+def comment(commentId: int, messageId: int, text: str = "Nice", teamId: int = 1) -> dict:
+    return {"commentId": commentId, "messageId": messageId, "teamId": teamId, "comment": text,
+            "timezoneId": "America/Los_Angeles", "postedBy": postedby(),
+            "dateCreatedLocal": "2026-01-01 00:00:00", "dateLastUpdatedLocal": "2026-01-01 00:00:00",
+            "dateCreatedUtc": "2026-01-01 00:00:00", "dateLastUpdatedUtc": "2026-01-01 00:00:00"}
+
+
+def message(messageId: int, updated: str = "2026-04-01 00:00:00", title: str = "Hello",
+            body: str = "Game on Saturday", teamId: int = 1, comments: list = None) -> dict:
+    msg = {
+        "messageId": messageId, "title": title, "bodyHtml": f"<p>{body}</p>", "bodyText": body,
+        "isPinned": False, "allowComments": True, "commentCount": len(comments or []),
+        "team": {"teamId": teamId, "name": "Team"}, "postedBy": postedby(),
+        "userMetaInfo": usermetainfo(),
+        "dateCreatedLocal": updated, "dateLastUpdatedLocal": updated,
+        "dateCreatedUtc": updated, "dateLastUpdatedUtc": updated,
+    }
+
+    if comments is not None:
+        msg["comments"] = comments
+
+    return msg
+
+
+def membertype(name: str = "player") -> dict:
+    return {"name": name, "title": name.title()}
+
+
+def user(userId: int, updated: str = "2026-04-01 00:00:00", firstName: str = "Pat",
+            gender: str = "f", teamMemberType: str = "player") -> dict:
+    return {
+        "userId": userId, "firstName": firstName, "lastName": "Doe",
+        "fullName": f"{firstName} Doe", "displayName": firstName,
+        "emailAddress1": "", "emailAddress2": "", "phone1": "", "phone2": "",
+        "gender": gender, "genderDisplay": gender.upper(), "profilePhoto": photo(),
+        "dateCreatedUtc": "2026-01-01 00:00:00", "dateLastUpdatedUtc": updated,
+        "dateLastSignInUtc": "2026-01-01 00:00:00",
+        "teamMeta": {"teamMemberType": membertype(teamMemberType)},
+    }
+
+
+def team(teamId: int = 1, updated: str = "2026-04-01 00:00:00") -> dict:
+    return {
+        "teamId": teamId, "name": "Team", "shortName": "T",
+        "type": {"name": "adult", "title": "Adult"},
+        "activity": {"activityId": 1, "name": "Softball"},
+        "timezoneId": "America/Los_Angeles", "city": "Seattle", "stateProvince": "Washington",
+        "stateProvinceAbbrev": "WA", "country": "United States", "countryIso3": "USA",
+        "postalCode": "98101", "locationDisplayShort": "Seattle, WA",
+        "locationDisplayLong": "Seattle, Washington",
+        "colorSwatches": {"home": None, "away": None, "alternate": None},
+        "options": {"misc": {"showRecord": True, "attendanceListSeparateGenders": False,
+                            "attendanceListMaleLabel": "M", "attendanceListFemaleLabel": "F",
+                            "attendanceListOtherGenderLabel": "O", "hideGenders": False}},
+        "dateCreatedUtc": "2026-01-01 00:00:00", "dateLastUpdatedUtc": updated,
+    }
+
+
+def season(seasonId: int = 1, teamId: int = 1) -> dict:
+    return {"seasonId": seasonId, "teamId": teamId, "name": "Spring",
+            "startDateLocal": "2026-03-01", "startDateUtc": "2026-03-01 08:00:00",
+            "startDateInFuture": False, "activity": {"activityId": 1, "name": "Softball"},
+            "league": {"leagueId": 1, "name": "League", "city": "Seattle", "stateProvince": "WA",
+                        "postalCode": "98101", "countryIso2": "US", "websiteUrl": ""},
+            "leagueDivision": "A"}
+
+
+def attendance(rsvps: list) -> dict:
+    """
+    rsvps is a list of (userId, status, gender, teamMemberType) tuples
+    """
+    statuses = ["yes", "maybe", "available", "no", "noresponse"]
+
+    return {
+        "countsByStatus": [{"status": status, "counts": {"byGender": {}, "byType": {},
+                            "total": sum(1 for r in rsvps if r[1] == status)}} for status in statuses],
+        "meta": {"teamMemberTypes": [membertype("player"), membertype("sub")],
+                "genders": [{"gender": "m", "genderDisplay": "Male"}, {"gender": "f", "genderDisplay": "Female"}],
+                "rsvpStatuses": [{"status": status, "statusDisplay": status.title()} for status in statuses],
+                "misc": {"genderLabel_male": "M", "genderLabel_female": "F", "genderLabel_other": "O",
+                        "groupBy": "none"}},
+        "userIdsByStatus": [],
+        "users": [{"user": user(userId, gender=gender, teamMemberType=typename),
+                    "rsvpInfo": {"status": status, "statusDisplay": status.title(), "comments": "",
+                                "canRSVP": True, "hasResponded": status != "noresponse",
+                                "addlMale": 0, "addlFemale": 0, "addlDisplay": "",
+                                "dateCreatedLocal": "", "dateLastUpdatedLocal": "",
+                                "dateCreatedUtc": "", "dateLastUpdatedUtc": ""}}
+                    for userId, status, gender, typename in rsvps],
+    }
+
+
+class FakeApi:
+    """
+    Routes mocked requests to handlers by Team Cowboy method name.
+
+    Handlers take the request params (a flat dict) and return the response
+    body. Every call is recorded in calls as (method, params).
+    """
+
+    def __init__(self, **handlers):
+        self.handlers = {"Auth_GetUserToken": lambda params: {"userId": 1, "token": "token"}}
+        self.handlers.update(handlers)
+        self.calls = []
+
+    def install(self, mocker) -> None:
+        mocker.get(URL, json=self._respond)
+        mocker.post(URL, json=self._respond)
+
+    def count(self, method: str) -> int:
+        return sum(1 for called, _ in self.calls if called == method)
+
+    def _respond(self, request, context):
+        params = {k: v[0] for k, v in parse_qs(urlparse(request.url).query, keep_blank_values=True).items()}
+
+        if request.body:
+            body = request.body if isinstance(request.body, str) else request.body.decode()
+            params.update({k: v[0] for k, v in parse_qs(body, keep_blank_values=True).items()})
+
+        method = params["method"]
+        self.calls.append((method, params))
+
+        handler = self.handlers.get(method)
+
+        if handler is None:
+            return {"success": False, "body": {"errorCode": "NotFound", "httpResponse": 404,
+                                                "message": "Not found"}}
+
+        return {"success": True, "body": handler(params)}
+
+
+def client(mocker, api: FakeApi, **kwargs) -> Teamcowboy:
+    """
+    Return a Teamcowboy wired to api through mocker
+    """
+    api.install(mocker)
+    return Teamcowboy("private", "public", "user", "password", **kwargs)
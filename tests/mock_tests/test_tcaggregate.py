@@ -0,0 +1,45 @@
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_aggregate import aggregate_season
+
+import fixtures
+
+
+class TestAggregate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rsvps = {
+            1: [(7, "yes", "f", "player"), (8, "no", "m", "player"), (9, "yes", "m", "sub")],
+            2: [(7, "yes", "f", "player"), (8, "yes", "m", "player")],
+            3: [(7, "maybe", "f", "player"), (8, "noresponse", "m", "player"), (9, "yes", "m", "sub")],
+        }
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=lambda params: [fixtures.event(eventId) for eventId in self.rsvps][int(params["offset"]):][:int(params["qty"])],
+            Event_GetAttendanceList=lambda params: fixtures.attendance(self.rsvps[int(params["eventId"])]),
+        )
+
+    def test_aggregate_season(self):
+        """
+        Tests per-user, per-event and per-group counts across a season
+        """
+        with requests_mock.Mocker() as m:
+            stats = aggregate_season(fixtures.client(m, self.api), 1, seasonId=1, page_size=2)
+
+        self.assertEqual(len(stats), 3)
+        self.assertAlmostEqual(stats.rate(7), 2 / 3)
+        self.assertEqual(stats.rate(9), 1.0)
+        self.assertEqual(stats.rate(10), 0.0)
+        self.assertEqual(stats.counts(8), {"yes": 1, "maybe": 0, "available": 0, "no": 1, "noresponse": 1})
+        self.assertEqual(stats.event(1)["yes"], 2)
+
+        self.assertEqual(stats.by_gender()["m"]["yes"], 3)
+        self.assertEqual(stats.by_member_type()["sub"], {"yes": 2, "maybe": 0, "available": 0, "no": 0,
+                                                            "noresponse": 0})
+        self.assertEqual(stats.totals()["yes"], 5)
+
+        params = [params for method, params in self.api.calls if method == "Team_GetEvents"]
+        self.assertTrue(all(p["seasonId"] == "1" and p["filter"] == "past" for p in params))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import requests_mock
+
+from teamcowboyapi import tc_deadline
+from teamcowboyapi.tc_batch import EventBatcher
+
+import fixtures
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.starts = {1: "2026-05-01 18:00:00", 2: "2026-05-03 18:00:00", 3: "2026-05-09 18:00:00",
+                        4: "2026-09-01 18:00:00", 5: "2026-05-05 18:00:00"}
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=self.team_events,
+            Event_Get=lambda params: fixtures.event(int(params["eventId"]), start=self.starts[int(params["eventId"])]),
+        )
+
+    def team_events(self, params: dict) -> list:
+        if params.get("filter") != "specificDates":
+            return [fixtures.event(eventId, start=start) for eventId, start in self.starts.items() if eventId != 5]
+
+        return [fixtures.event(eventId, start=start) for eventId, start in self.starts.items()
+                if params["startDateTime"] <= start <= params["endDateTime"]]
+
+    def test_concurrent_gets_share_a_range(self):
+        """
+        Tests that concurrent Event_Get calls become one range plus single calls
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            batcher = EventBatcher(tc, window=0.05)
+            batcher.attach(tc)
+            tc.Team_GetEvents(1)
+
+            # Event 3 moves out of the range it was learned in
+            self.starts[3] = "2026-06-20 18:00:00"
+            self.api.calls.clear()
+
+            events = tc_deadline.fanout(lambda eventId: batcher.get(1, eventId), [1, 2, 3, 4, 5], max_workers=5)
+
+        self.assertEqual([event.eventId for event in events], [1, 2, 3, 4, 5])
+        self.assertEqual(events[2].dateTimeInfo.startDateTimeUtc, "2026-06-20 18:00:00")
+
+        ranges = [params for method, params in self.api.calls if method == "Team_GetEvents"]
+        self.assertEqual([(p["startDateTime"], p["endDateTime"]) for p in ranges],
+                            [("2026-05-01 00:00:00", "2026-05-09 23:59:59")])
+        self.assertEqual(sorted(int(p["eventId"]) for method, p in self.api.calls if method == "Event_Get"),
+                            [3, 4, 5])
+
+    def test_plan(self):
+        """
+        Tests that ranges split on gaps and unknown events are fetched singly
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            batcher = EventBatcher(tc, max_gap_days=3)
+            batcher.learn(tc.Team_GetEvents(1))
+
+        plan = batcher.plan([(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 1)])
+
+        self.assertEqual([(f.teamId, f.eventIds, f.startDate, f.endDate) for f in plan],
+                            [(1, [1, 2], "2026-05-01", "2026-05-03"), (1, [3], None, None),
+                            (1, [4], None, None), (1, [5], None, None), (2, [1], None, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
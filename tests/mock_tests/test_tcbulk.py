@@ -0,0 +1,74 @@
+import unittest
+import requests_mock
+
+from teamcowboyapi import Deadline, RateLimiter, TCCache, TheTeamCowboyAPIDeadlineException
+from teamcowboyapi.tc_bulk import Rsvpentry, save_rsvps
+
+import fixtures
+
+
+class TestBulkRsvp(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = fixtures.FakeApi(
+            Event_GetAttendanceList=lambda params: fixtures.attendance(
+                [(1, "yes", "f", "player"), (8, "noresponse", "m", "player")]),
+            Event_SaveRSVP=lambda params: {"rsvpSaved": params["eventId"] != "3", "statusCode": ""},
+        )
+
+    def test_save_rsvps(self):
+        """
+        Tests that unchanged and replaced entries are skipped and failures are reported per entry
+        """
+        entries = [
+            Rsvpentry(1, 1, "yes"),
+            Rsvpentry(1, 2, "yes"),
+            Rsvpentry(1, 2, "no"),
+            Rsvpentry(1, 3, "maybe"),
+            Rsvpentry(1, 1, "no", {"rsvpAsUserId": 8}),
+        ]
+
+        with requests_mock.Mocker() as m:
+            results = save_rsvps(fixtures.client(m, self.api, ratelimiter=RateLimiter(100, burst=10)), entries)
+
+        self.assertEqual([result.skipped for result in results], [True, True, False, False, False])
+        self.assertTrue(results[2].response.rsvpSaved)
+        self.assertFalse(results[3].ok)
+        self.assertTrue(results[4].ok)
+
+        self.assertEqual(self.api.count("Event_GetAttendanceList"), 3)
+        saved = sorted((params["eventId"], params["status"]) for method, params in self.api.calls
+                        if method == "Event_SaveRSVP")
+        self.assertEqual(saved, [("1", "no"), ("2", "no"), ("3", "maybe")])
+
+    def test_checks_past_cache(self):
+        """
+        Tests that a cached attendance list does not cause a needed RSVP to be skipped
+        """
+        rsvps = [(1, "yes", "f", "player")]
+        self.api.handlers["Event_GetAttendanceList"] = lambda params: fixtures.attendance(rsvps)
+
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api, cache=TCCache(ttl=60))
+            tc.Event_GetAttendanceList(1, 1)
+
+            # Changed on the website after the list was cached
+            rsvps[0] = (1, "no", "f", "player")
+            results = save_rsvps(tc, [Rsvpentry(1, 1, "yes")])
+
+        self.assertFalse(results[0].skipped)
+        self.assertTrue(results[0].response.rsvpSaved)
+
+    def test_rate_limit_deadline(self):
+        """
+        Tests that waiting for the rate limiter stops at the deadline
+        """
+        limiter = RateLimiter(0.5)
+        limiter.acquire()
+
+        with Deadline(0.1):
+            with self.assertRaises(TheTeamCowboyAPIDeadlineException):
+                limiter.acquire()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,435 @@
+import unittest
+import requests_mock
+import requests
+import time
+
+from teamcowboyapi import TCDataAdapter, TCResult, Deadline, TCCache, CircuitBreaker, HedgePolicy
+from teamcowboyapi.exceptions import (TheTeamCowboyAPIException, TheTeamCowboyAPIDeadlineException,
+                                        TheTeamCowboyAPICircuitOpenException)
+from teamcowboyapi import tc_deadline
+
+
+URL = 'https://api.teamcowboy.com/v1/'
+
+
+class TestTCDataAdapter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.adapter = TCDataAdapter()
+
+    def test_get_success(self):
+        """
+        Tests that a successful response returns the body as data
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {"helloWorld": "hi"}})
+            result = self.adapter.get(endpoint='', ep_params={"method": "Test_GetRequest"})
+
+        self.assertIsInstance(result, TCResult)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.data, {"helloWorld": "hi"})
+
+    def test_get_api_error_4xx(self):
+        """
+        Tests that an api error body with a 4xx code returns empty data
+        """
+        body = {"errorCode": "NotFound", "httpResponse": 404, "message": "Not found"}
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": False, "body": body})
+            result = self.adapter.get(endpoint='', ep_params={"method": "Event_Get"})
+
+        self.assertEqual(result.status_code, 404)
+        self.assertEqual(result.data, {})
+
+    def test_get_server_error_raises(self):
+        """
+        Tests that a 5xx response raises
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, status_code=503, json={})
+            with self.assertRaises(TheTeamCowboyAPIException):
+                self.adapter.get(endpoint='', ep_params={"method": "Event_Get"})
+
+    def test_timeout_is_sent(self):
+        """
+        Tests that every request carries a connect and read timeout
+        """
+        adapter = TCDataAdapter(timeout=(1, 2))
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            adapter.get(endpoint='')
+
+        self.assertEqual(m.last_request.timeout, (1, 2))
+
+    def test_timeout_clamped_to_deadline(self):
+        """
+        Tests that an active deadline shortens the request timeouts
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            with Deadline(0.5):
+                self.adapter.get(endpoint='')
+
+        connect, read = m.last_request.timeout
+        self.assertLessEqual(connect, 0.5)
+        self.assertLessEqual(read, 0.5)
+
+    def test_expired_deadline_does_not_send(self):
+        """
+        Tests that no request is sent once the deadline has run out
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            with Deadline(0):
+                with self.assertRaises(TheTeamCowboyAPIDeadlineException):
+                    self.adapter.get(endpoint='')
+
+        self.assertFalse(m.called)
+
+    def test_timeout_under_deadline_raises_deadline(self):
+        """
+        Tests that a timeout caused by a spent deadline is reported as such
+        """
+        def timeout(request, context):
+            time.sleep(0.05)
+            raise requests.exceptions.ReadTimeout()
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=timeout)
+            with Deadline(0.01):
+                with self.assertRaises(TheTeamCowboyAPIDeadlineException):
+                    self.adapter.get(endpoint='')
+
+
+class TestDeadline(unittest.TestCase):
+    def test_nested_deadline_does_not_extend(self):
+        """
+        Tests that an inner deadline cannot outlive the outer one
+        """
+        with Deadline(0.1) as outer:
+            with Deadline(10) as inner:
+                self.assertIs(inner, outer)
+                self.assertIs(tc_deadline.current(), outer)
+
+        self.assertIsNone(tc_deadline.current())
+
+    def test_fanout_returns_in_order(self):
+        """
+        Tests that fanout returns results in submission order
+        """
+        results = tc_deadline.fanout(lambda x: x * 2, [3, 1, 2], max_workers=3)
+        self.assertEqual(results, [6, 2, 4])
+
+    def test_fanout_partial_results(self):
+        """
+        Tests that fanout stops at the deadline and reports finished work
+        """
+        def work(x):
+            if x:
+                time.sleep(1)
+            return x
+
+        with Deadline(0.2):
+            with self.assertRaises(TheTeamCowboyAPIDeadlineException) as cm:
+                tc_deadline.fanout(work, [0, 1], max_workers=2)
+
+        self.assertEqual(cm.exception.partial, {0: 0})
+
+    def test_fanout_carries_deadline(self):
+        """
+        Tests that worker threads see the caller's deadline
+        """
+        with Deadline(5) as deadline:
+            seen = tc_deadline.fanout(lambda _: tc_deadline.current(), [0, 1])
+
+        self.assertEqual(seen, [deadline, deadline])
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(failure_rate=0.5, minimum_calls=2, cooldown=0.05)
+        self.adapter = TCDataAdapter(breaker=self.breaker, cache=TCCache(ttl=0))
+
+    def test_opens_after_failures(self):
+        """
+        Tests that the breaker opens once the failure rate is reached
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, status_code=503, json={})
+            for _ in range(2):
+                with self.assertRaises(TheTeamCowboyAPIException):
+                    self.adapter.get(endpoint='', ep_params={"method": "Team_Get"})
+
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            self.assertEqual(self.breaker.metrics()["state_value"], 2)
+
+            with self.assertRaises(TheTeamCowboyAPICircuitOpenException):
+                self.adapter.get(endpoint='', ep_params={"method": "Team_Get"})
+
+            self.assertEqual(m.call_count, 2)
+
+    def test_serves_stale_while_open(self):
+        """
+        Tests that a cached read is served while the breaker is open
+        """
+        params = {"method": "Team_Get", "teamId": 1, "nonce": "1"}
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {"teamId": 1}})
+            self.adapter.get(endpoint='', ep_params=params)
+
+            m.get(URL, status_code=503, json={})
+            for _ in range(2):
+                with self.assertRaises(TheTeamCowboyAPIException):
+                    self.adapter.get(endpoint='', ep_params={"method": "Team_Get", "teamId": 2})
+
+            result = self.adapter.get(endpoint='', ep_params=dict(params, nonce="2"))
+
+        self.assertEqual(result.data, {"teamId": 1})
+
+    def test_half_open_closes_on_success(self):
+        """
+        Tests that a successful trial call after the cooldown closes the breaker
+        """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.06)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            self.adapter.get(endpoint='')
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_needs_every_trial(self):
+        """
+        Tests that a half-open breaker only closes after half_open_calls
+        successful trials
+        """
+        self.breaker.half_open_calls = 2
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        time.sleep(0.06)
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            self.adapter.get(endpoint='')
+            self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+            self.adapter.get(endpoint='')
+            self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_malformed_body_gives_back_trial(self):
+        """
+        Tests that a half-open trial whose body lacks success reopens the
+        breaker instead of holding its slot forever
+        """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        time.sleep(0.06)
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"body": {}})
+            with self.assertRaises(KeyError):
+                self.adapter.get(endpoint='')
+
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            time.sleep(0.06)
+
+            m.get(URL, json={"success": True, "body": {}})
+            self.adapter.get(endpoint='')
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestHedging(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hedge = HedgePolicy(methods=('Team_GetRoster',), budget=1.0, burst=1.0,
+                                    max_delay=0.05, min_samples=100)
+        self.adapter = TCDataAdapter(hedge=self.hedge,
+                                        resign=lambda params: dict(params, nonce="hedge"))
+
+    def test_slow_request_is_hedged(self):
+        """
+        Tests that a slow GET is duplicated with a fresh nonce and the fast answer wins
+        """
+        # requests_mock serialises requests behind a lock, so stub the send
+        # step to let the two requests overlap
+        def send(httpmethod, endpoint, ep_params=None, data=None):
+            if ep_params["nonce"] == "first":
+                time.sleep(0.5)
+            return TCResult(200, "OK", data=[{"from": ep_params["nonce"]}])
+
+        self.adapter._send = send
+        result = self.adapter.get(endpoint='', ep_params={"method": "Team_GetRoster", "nonce": "first"})
+
+        self.assertEqual(result.data, [{"from": "hedge"}])
+        self.assertEqual(self.hedge.metrics()["hedges"], 1)
+
+    def test_budget_caps_hedges(self):
+        """
+        Tests that no hedge is sent once the budget is spent
+        """
+        self.hedge.budget = 0.0
+
+        def respond(request, context):
+            time.sleep(0.1)
+            return {"success": True, "body": [{}]}
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=respond)
+            self.adapter.get(endpoint='', ep_params={"method": "Team_GetRoster", "nonce": "first"})
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.hedge.metrics()["hedges"], 0)
+
+    def test_other_methods_not_hedged(self):
+        """
+        Tests that methods outside the policy are sent once
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {}})
+            self.adapter.get(endpoint='', ep_params={"method": "Team_Get"})
+
+        self.assertEqual(self.hedge.metrics()["requests"], 0)
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = TCCache(ttl=0.05, stale_while_revalidate=0.3)
+        self.adapter = TCDataAdapter(cache=self.cache, resign=lambda params: dict(params, nonce="refresh"))
+        self.version = 1
+        self.sent = []
+
+        def send(httpmethod, endpoint, ep_params=None, data=None):
+            self.sent.append(ep_params["nonce"])
+            if ep_params["nonce"] == "refresh":
+                time.sleep(0.1)
+            return TCResult(200, "OK", data=[{"version": self.version}])
+
+        self.adapter._send = send
+
+    def get(self) -> TCResult:
+        return self.adapter.get(endpoint='', ep_params={"method": "Team_GetRoster", "nonce": "first"})
+
+    def test_stale_served_while_refreshing(self):
+        """
+        Tests that an expired entry is served at once and refreshed once in the background
+        """
+        self.get()
+        self.version = 2
+        time.sleep(0.06)
+
+        started = time.monotonic()
+        results = [self.get().data for _ in range(3)]
+
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertEqual(results, [[{"version": 1}]] * 3)
+
+        time.sleep(0.15)
+        self.assertEqual(self.get().data, [{"version": 2}])
+        self.assertEqual(self.sent, ["first", "refresh"])
+
+    def test_too_stale_blocks(self):
+        """
+        Tests that an entry past ttl + stale_while_revalidate is fetched in the call
+        """
+        self.get()
+        self.version = 2
+        time.sleep(0.4)
+
+        self.assertEqual(self.get().data, [{"version": 2}])
+        self.assertEqual(self.sent, ["first", "first"])
+
+
+class TestNegativeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.adapter = TCDataAdapter(cache=TCCache(ttl=60, negative_ttl=0.05))
+
+    def error(self, code: int) -> dict:
+        return {"success": False, "body": {"errorCode": "Error", "httpResponse": code, "message": "Error"}}
+
+    def test_not_found_is_cached(self):
+        """
+        Tests that a not-found answer is served from the cache until negative_ttl passes
+        """
+        params = {"method": "Event_Get", "eventId": 9}
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=self.error(404))
+            results = [self.adapter.get(endpoint='', ep_params=params) for _ in range(3)]
+            self.assertEqual(m.call_count, 1)
+
+            time.sleep(0.06)
+            self.adapter.get(endpoint='', ep_params=params)
+            self.assertEqual(m.call_count, 2)
+
+        self.assertEqual([result.status_code for result in results], [404] * 3)
+        self.assertEqual(results[-1].data, {})
+
+    def test_transient_errors_not_cached(self):
+        """
+        Tests that rate limit and auth errors are sent again
+        """
+        with requests_mock.Mocker() as m:
+            for code in (429, 401):
+                m.get(URL, json=self.error(code))
+                self.adapter.get(endpoint='', ep_params={"method": "Event_Get", "code": code})
+                self.adapter.get(endpoint='', ep_params={"method": "Event_Get", "code": code})
+
+            self.assertEqual(m.call_count, 4)
+
+
+class TestWriteInvalidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.adapter = TCDataAdapter(cache=TCCache(ttl=60))
+
+    def get(self, teamId: int) -> TCResult:
+        return self.adapter.get(endpoint='', ep_params={"method": "Event_GetAttendanceList", "teamId": teamId,
+                                                        "eventId": 5})
+
+    def test_write_drops_team_entries(self):
+        """
+        Tests that a saved RSVP drops the cached reads of its team only
+        """
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {"users": ["before"]}})
+            m.post(URL, json={"success": True, "body": {"rsvpSaved": True}})
+            self.get(1)
+            self.get(2)
+            self.adapter.post(endpoint='', data={"method": "Auth_GetUserToken"})
+            self.adapter.post(endpoint='', data={"method": "Event_SaveRSVP", "teamId": 1, "eventId": 5})
+
+            m.get(URL, json={"success": True, "body": {"users": ["after"]}})
+            results = [self.get(1).data, self.get(2).data]
+
+        self.assertEqual(results, [{"users": ["after"]}, {"users": ["before"]}])
+
+    def test_read_during_write_not_stored(self):
+        """
+        Tests that a read in flight while a write lands is not cached
+        """
+        send = self.adapter._send
+
+        def write_during_read(*args, **kwargs):
+            result = send(*args, **kwargs)
+            self.adapter.cache.invalidate_written({"method": "Event_SaveRSVP", "teamId": 1})
+            return result
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": True, "body": {"users": ["before"]}})
+            self.adapter._send = write_during_read
+            self.get(1)
+            self.adapter._send = send
+            self.get(1)
+            self.get(1)
+
+            self.assertEqual(m.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import pickle
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_decode import Attendancebatch, DecodePool, decode, fetch_decoded
+
+import fixtures
+
+
+class TestDecode(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rsvps = {
+            1: [(7, "yes", "f", "player"), (8, "no", "m", "player")],
+            2: [(7, "maybe", "f", "player"), (9, "late", "m", "sub")],
+        }
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=lambda params: [fixtures.event(eventId, locationId=10 if eventId == 2 else None)
+                                            for eventId in self.rsvps],
+            Event_GetAttendanceList=lambda params: fixtures.attendance(self.rsvps[int(params["eventId"])]),
+        )
+
+    def test_fetch_decoded(self):
+        """
+        Tests decoding raw responses in worker processes, as models and as columns
+        """
+        calls = [("Event_GetAttendanceList", {"teamId": 1, "eventId": eventId}) for eventId in self.rsvps]
+
+        with requests_mock.Mocker() as m, DecodePool(max_workers=1) as pool:
+            tc = fixtures.client(m, self.api)
+            batches = dict(fetch_decoded(tc, calls, pool, columns=True))
+            events = dict(fetch_decoded(tc, [("Team_GetEvents", {"teamId": 1})], pool))[0]
+            missing = pool.decode("Event_Get", tc.raw("Event_Get", teamId=1, eventId=3))
+
+        self.assertEqual(list(batches[0].userId), [7, 8])
+        self.assertEqual(batches[0].counts()["no"], 1)
+        self.assertEqual(batches[1].teamMemberType, ["player", "sub"])
+        self.assertEqual(batches[1].counts(), {"yes": 0, "maybe": 1, "available": 0, "no": 0, "noresponse": 0})
+
+        self.assertEqual([event.eventId for event in events], [1, 2])
+        self.assertEqual(events[1].location.locationId, 10)
+        self.assertIsNone(missing)
+
+    def test_matches_client(self):
+        """
+        Tests that decode gives what the Teamcowboy methods return, including None
+        """
+        self.rsvps[3] = []
+
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+
+            for eventId in self.rsvps:
+                with self.subTest(eventId=eventId):
+                    self.assertEqual(decode("Event_GetAttendanceList",
+                                            tc.raw("Event_GetAttendanceList", teamId=1, eventId=eventId)),
+                                        tc.Event_GetAttendanceList(1, eventId))
+
+            self.assertIsNone(tc.Event_GetAttendanceList(1, 3))
+            self.assertEqual(decode("Team_GetEvents", tc.raw("Team_GetEvents", teamId=1)), tc.Team_GetEvents(1))
+
+    def test_columns_pickle_small(self):
+        """
+        Tests that a columnar batch pickles smaller than the model objects
+        """
+        body = fixtures.attendance([(userId, "yes", "f", "player") for userId in range(200)])
+        raw = json.dumps({"success": True, "body": body}).encode()
+
+        batch = decode("Event_GetAttendanceList", raw, columns=True)
+        models = decode("Event_GetAttendanceList", raw)
+
+        self.assertIsInstance(batch, Attendancebatch)
+        self.assertEqual(len(batch), len(models.users))
+        self.assertLess(len(pickle.dumps(batch)) * 10, len(pickle.dumps(models)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+import requests_mock
+
+from teamcowboyapi import TCCache, tc_deadline
+from teamcowboyapi.tc_gateway import Gateway
+
+import fixtures
+
+
+def fetch(gateway: Gateway, path: str) -> tuple:
+    host, port = gateway.address
+
+    try:
+        with urllib.request.urlopen(f'http://{host}:{port}{path}', timeout=5) as response:
+            return response.status, json.loads(response.read())
+
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestGateway(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=self.team_events,
+            Team_Get=lambda params: fixtures.team(int(params["teamId"])),
+        )
+
+    def team_events(self, params: dict) -> list:
+        time.sleep(0.3)
+        return [fixtures.event(1), fixtures.event(2)]
+
+    def test_coalescing_and_shared_cache(self):
+        """
+        Tests that concurrent identical requests and later repeats make one upstream call
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api, cache=TCCache(ttl=60))
+
+            with Gateway(tc, port=0) as gateway:
+                gateway.start()
+                answers = tc_deadline.fanout(lambda _: fetch(gateway, '/Team_GetEvents?teamId=1&qty=2'),
+                                                range(5), max_workers=5)
+                answers.append(fetch(gateway, '/Team_GetEvents?qty=2&teamId=1'))
+                other = fetch(gateway, '/Team_Get?teamId=1')
+
+        self.assertEqual(self.api.count("Team_GetEvents"), 1)
+        self.assertTrue(all(status == 200 for status, _ in answers))
+        self.assertEqual([[event["eventId"] for event in document["body"]] for _, document in answers],
+                            [[1, 2]] * 6)
+        self.assertEqual(other[1]["body"]["teamId"], 1)
+
+    def test_close_stops_serve_forever(self):
+        """
+        Tests that close stops a serve_forever loop running in the caller's thread
+        """
+        with requests_mock.Mocker() as m:
+            gateway = Gateway(fixtures.client(m, self.api), port=0)
+            serving = threading.Thread(target=gateway.serve_forever, daemon=True)
+            serving.start()
+            status, _ = fetch(gateway, '/Team_Get?teamId=1')
+
+            gateway.close()
+            serving.join(timeout=2)
+
+        self.assertEqual(status, 200)
+        self.assertFalse(serving.is_alive())
+
+    def test_errors(self):
+        """
+        Tests the status codes of refused requests and upstream errors
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+
+            with Gateway(tc, port=0) as gateway:
+                gateway.start()
+                unknown = fetch(gateway, '/Event_SaveRSVP?teamId=1&eventId=2&status=yes')
+                reserved = fetch(gateway, '/Team_Get?teamId=1&userToken=other')
+                missing = fetch(gateway, '/Message_Get?teamId=1&messageId=3')
+                m.get(fixtures.URL, status_code=500)
+                failed = fetch(gateway, '/Team_Get?teamId=1')
+
+        self.assertEqual([status for status, _ in (unknown, reserved, missing, failed)], [404, 400, 404, 502])
+        self.assertEqual(missing[1], {"success": False, "body": {"errorCode": "NotFound", "httpResponse": 404,
+                                                                "message": "Not found"}})
+        self.assertEqual(self.api.count("Event_SaveRSVP"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
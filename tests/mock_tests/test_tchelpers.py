@@ -0,0 +1,51 @@
+import concurrent.futures
+import os
+import unittest
+
+from teamcowboyapi import tc_helpers
+
+
+class TestNonce(unittest.TestCase):
+    def test_unique_across_threads(self):
+        """
+        Tests that nonces made concurrently are unique and increase per thread
+        """
+        def make(_) -> list:
+            return [tc_helpers.createnonce() for _ in range(2000)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            batches = list(executor.map(make, range(8)))
+
+        nonces = [nonce for batch in batches for nonce in batch]
+        self.assertEqual(len(set(nonces)), len(nonces))
+        self.assertTrue(all(batch == sorted(batch) for batch in batches))
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_forked_child_gets_new_sequence(self):
+        """
+        Tests that a forked child draws a new nonce prefix
+        """
+        digits = tc_helpers.NONCE_PREFIX_DIGITS
+        before = tc_helpers.createnonce()
+        read, write = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            os.close(read)
+            os.write(write, tc_helpers.createnonce().encode())
+            os._exit(0)
+
+        os.close(write)
+        child = os.read(read, 64).decode()
+        os.close(read)
+        os.waitpid(pid, 0)
+
+        parent = tc_helpers.createnonce()
+        self.assertNotEqual(child[:digits], before[:digits])
+        self.assertEqual(parent[:digits], before[:digits])
+        self.assertEqual(len(child), len(parent))
+        self.assertEqual(len(parent), digits + 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
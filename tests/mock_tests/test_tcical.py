@@ -0,0 +1,72 @@
+import functools
+import io
+import unittest
+import requests_mock
+
+from teamcowboyapi import tc_helpers
+from teamcowboyapi.tc_ical import VEventCache, write_calendar
+
+import fixtures
+
+
+class TestIcal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events = [fixtures.event(eventId, locationId=10) for eventId in range(1, 6)]
+        self.events[0]["comments"] = "Bring water, sunscreen; and cleats\n" + "Ümlaut ☀ " * 20
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=lambda params: self.events[int(params["offset"]):int(params["offset"]) + int(params["qty"])],
+        )
+
+    def export(self, tc, cache: VEventCache) -> str:
+        out = io.StringIO(newline='')
+        write_calendar(out, tc_helpers.paginate(functools.partial(tc.Team_GetEvents, 1), qty=2),
+                        name="Team", cache=cache)
+        return out.getvalue()
+
+    def test_stream_and_cache(self):
+        """
+        Tests folding and escaping, paged export and that unchanged events are not re-rendered
+        """
+        cache = VEventCache()
+
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            feed = self.export(tc, cache)
+
+            self.events[1]["dateLastUpdatedUtc"] = "2026-04-02 00:00:00"
+            again = self.export(tc, cache)
+
+        lines = feed.split("\r\n")
+        self.assertTrue(all(len(line.encode("UTF-8")) <= 75 for line in lines))
+        self.assertEqual(feed.count("BEGIN:VEVENT"), 5)
+        self.assertEqual(self.api.count("Team_GetEvents"), 6)
+
+        unfolded = feed.replace("\r\n ", "")
+        self.assertIn("DESCRIPTION:Bring water\\, sunscreen\\; and cleats\\nÜmlaut ☀", unfolded)
+        self.assertIn("DTSTART:20260501T180000Z", unfolded)
+        self.assertIn("LOCATION:Field 1\\, 1 Main St\\, Seattle\\, WA", unfolded)
+
+        self.assertEqual((cache.misses, cache.hits), (6, 4))
+        self.assertIn("LAST-MODIFIED:20260402T000000Z", again)
+
+    def test_missing_times(self):
+        """
+        Tests that an event without an end time, or any UTC times, is
+        exported without them
+        """
+        self.events[0]["dateTimeInfo"]["endDateTimeUtc"] = None
+        self.events[1]["dateTimeInfo"].update(startDateTimeUtc=None, endDateTimeUtc=None)
+
+        with requests_mock.Mocker() as m:
+            feed = self.export(fixtures.client(m, self.api), None)
+
+        events = feed.split("BEGIN:VEVENT")[1:]
+        self.assertIn("DTSTART:20260501T180000Z", events[0])
+        self.assertNotIn("DTEND", events[0])
+        self.assertIn("DTSTART;VALUE=DATE:20260501", events[1])
+        self.assertNotIn("DTEND", events[1])
+        self.assertNotIn("None", feed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from typing import Set, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import time budgets in milliseconds, best of RUNS fresh interpreters.
+# Wall-clock timings vary with the machine, so test_budgets only runs when
+# TC_IMPORT_BUDGETS is set. Run this file directly to print the timings.
+BUDGETS = {
+    "import teamcowboyapi": 50,
+    "from teamcowboyapi import Teamcowboy": 400,
+    "from teamcowboyapi.objects.events import Event": 150,
+    "from teamcowboyapi.tc_ical import write_calendar": 150,
+}
+
+RUNS = 3
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+print(json.dumps([(time.perf_counter() - start) * 1000, sorted(sys.modules)]))
+"""
+
+
+def import_time(statement: str, runs: int = RUNS) -> Tuple[float, Set[str]]:
+    """
+    Return the best time in milliseconds to run statement in a fresh
+    interpreter, and the modules it left imported
+    """
+    best, modules = None, set()
+
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", SCRIPT.format(statement=statement)], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        elapsed, imported = json.loads(output)
+        best, modules = min(elapsed, best or elapsed), set(imported)
+
+    return best, modules
+
+
+class TestImport(unittest.TestCase):
+    def test_package_is_lazy(self):
+        """
+        Tests that importing the package loads neither requests nor the models
+        """
+        _, modules = import_time("import teamcowboyapi", runs=1)
+
+        self.assertNotIn("requests", modules)
+        self.assertFalse([name for name in modules if name.startswith("teamcowboyapi.objects.")])
+
+    def test_client_defers_models(self):
+        """
+        Tests that the client loads model modules only when a call returns them
+        """
+        _, modules = import_time("from teamcowboyapi import Teamcowboy", runs=1)
+
+        self.assertIn("requests", modules)
+        self.assertNotIn("teamcowboyapi.objects.events.event", modules)
+        self.assertNotIn("teamcowboyapi.objects.users.user", modules)
+
+    @unittest.skipUnless(os.environ.get("TC_IMPORT_BUDGETS"), "set TC_IMPORT_BUDGETS to check import times")
+    def test_budgets(self):
+        """
+        Tests import times against BUDGETS
+        """
+        for statement, budget in BUDGETS.items():
+            with self.subTest(statement=statement):
+                elapsed, _ = import_time(statement)
+                self.assertLess(elapsed, budget)
+
+
+if __name__ == '__main__':
+    for statement, budget in BUDGETS.items():
+        print(f"{import_time(statement)[0]:8.1f} ms  (budget {budget} ms)  {statement}")
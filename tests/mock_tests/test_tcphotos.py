@@ -0,0 +1,153 @@
+import hashlib
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from teamcowboyapi.tc_photos import PhotoCache, PhotoFetcher, pick
+
+
+class PhotoServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the photo host. Serves self.files by path with
+    ETags and records (path, status) for every request.
+    """
+
+    def __init__(self, files: dict):
+        super().__init__(('127.0.0.1', 0), PhotoHandler)
+        self.files = files
+        self.log = []
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}{path}'
+
+
+class PhotoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = self.server.files.get(self.path)
+        etag = f'"{hashlib.md5(content).hexdigest()}"' if content is not None else None
+
+        if content is None:
+            status = 404
+        elif self.headers.get('If-None-Match') == etag:
+            status = 304
+        else:
+            status = 200
+
+        with self.server.lock:
+            self.server.log.append((self.path, status))
+
+        self.send_response(status)
+
+        if etag:
+            self.send_header('ETag', etag)
+
+        self.send_header('Content-Length', str(len(content) if status == 200 else 0))
+        self.end_headers()
+
+        if status == 200:
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPhotos(unittest.TestCase):
+    def setUp(self) -> None:
+        self.files = {f'/u/{userId}/thumb.jpg': bytes([userId]) * 100 for userId in range(1, 9)}
+        self.files['/u/9/thumb.jpg'] = self.files['/u/1/thumb.jpg']
+        self.server = PhotoServer(self.files)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_fetch_and_revalidate(self):
+        """
+        Tests concurrent downloads, shared content, 304 revalidation and a missing photo
+        """
+        urls = [self.server.url(f'/u/{userId}/thumb.jpg') for userId in range(1, 10)]
+        missing = self.server.url('/u/10/thumb.jpg')
+        cache = PhotoCache(self.directory.name)
+        fetcher = PhotoFetcher(cache, max_workers=4)
+
+        first = fetcher.fetch_many(urls + [missing])
+        size = cache.size
+        self.files['/u/2/thumb.jpg'] = b'new' * 10
+        second = fetcher.fetch_many(urls)
+
+        self.assertIsNone(first[missing])
+        self.assertEqual(first[urls[0]], first[urls[8]])
+        self.assertEqual(first[urls[0]].read_bytes(), bytes([1]) * 100)
+        self.assertEqual(size, 800)
+
+        self.assertEqual(second[urls[1]].read_bytes(), b'new' * 10)
+        self.assertEqual({url: path for url, path in second.items() if url != urls[1]},
+                            {url: path for url, path in first.items() if url not in (urls[1], missing)})
+        self.assertEqual(sorted(status for _, status in self.server.log[10:]), [200] + [304] * 8)
+
+        fetcher.close()
+        cache.close()
+
+    def test_eviction_and_max_age(self):
+        """
+        Tests that the least recently used files are evicted and fresh entries are not rechecked
+        """
+        cache = PhotoCache(self.directory.name, max_bytes=350)
+        fetcher = PhotoFetcher(cache, max_age=60)
+        urls = [self.server.url(f'/u/{userId}/thumb.jpg') for userId in range(1, 5)]
+
+        paths = [fetcher.fetch(url) for url in urls[:3]]
+        fetcher.fetch(urls[0])
+        fetcher.fetch(urls[3])
+
+        self.assertEqual(len(self.server.log), 4)
+        self.assertLessEqual(cache.size, 350)
+        self.assertFalse(paths[1].exists())
+        self.assertTrue(paths[0].exists() and paths[2].exists())
+        self.assertIsNone(cache.lookup(urls[1]))
+
+        fetcher.close()
+        cache.close()
+
+    def test_batch_larger_than_cache(self):
+        """
+        Tests that a batch bigger than max_bytes does not evict its own files
+        """
+        for name in "abc":
+            self.files[f'/{name}.jpg'] = name.encode() * 600
+
+        cache = PhotoCache(self.directory.name, max_bytes=1300)
+        fetcher = PhotoFetcher(cache, max_workers=1)
+        urls = [self.server.url(f'/{name}.jpg') for name in "abc"]
+
+        paths = fetcher.fetch_many(urls)
+        self.assertEqual([paths[url].read_bytes()[:1] for url in urls], [b'a', b'b', b'c'])
+
+        # Unpinned once the batch is done, so the next store trims the cache
+        fetcher.fetch(self.server.url('/u/1/thumb.jpg'))
+        self.assertLessEqual(cache.size, 1300)
+
+        fetcher.close()
+        cache.close()
+
+    def test_pick(self):
+        """
+        Tests picking the smallest variant that is big enough
+        """
+        photo = {"fullUrl": "full", "smallUrl": "small", "thumbUrl": None}
+
+        self.assertEqual(pick(photo, 50), "small")
+        self.assertEqual(pick(photo, 150), "small")
+        self.assertEqual(pick(photo, 500), "full")
+        self.assertEqual(pick(photo), "full")
+        self.assertEqual(pick({"thumbUrl": "thumb"}, 500), "thumb")
+        self.assertIsNone(pick({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import unittest
+import requests_mock
+
+from teamcowboyapi import TCCache
+from teamcowboyapi.tc_pool import ClientPool
+
+import fixtures
+
+
+class TestClientPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = fixtures.FakeApi(
+            Auth_GetUserToken=lambda params: {"userId": int(params["username"][-1]),
+                                                "token": params["username"] + "-token"},
+            Team_Get=self.team,
+            Team_GetRoster=lambda params: [fixtures.user(7)],
+        )
+
+    def team(self, params: dict) -> dict:
+        # coach2 is not a member of team 1
+        if params["userToken"] == "coach2-token" and params["teamId"] == "1":
+            return {}
+
+        return fixtures.team(int(params["teamId"]))
+
+    def pool(self, m, **kwargs) -> ClientPool:
+        self.api.install(m)
+        pool = ClientPool("private", "public", **kwargs)
+        pool.add_account("a", "coach1", "password")
+        pool.add_account("b", "coach2", "password")
+        return pool
+
+    def test_shared_transport_and_cache(self):
+        """
+        Tests that tokens are reused and opted-in methods are shared between accounts
+        """
+        with requests_mock.Mocker() as m:
+            pool = self.pool(m, cache=TCCache(ttl=60, shared_methods=("Team_Get",)))
+
+            for account in ("a", "b", "a"):
+                pool.call(account, "Team_Get", 2)
+                pool.call(account, "Team_GetRoster", 1)
+
+            self.assertIs(pool.client("a")._tc_adapter_v1, pool.client("b")._tc_adapter_v1)
+            self.assertEqual(pool.client("b").userid, 2)
+            pool.close()
+
+        self.assertEqual(self.api.count("Auth_GetUserToken"), 2)
+        self.assertEqual(self.api.count("Team_Get"), 1)
+        self.assertEqual(self.api.count("Team_GetRoster"), 2)
+
+    def test_cache_not_shared_by_default(self):
+        """
+        Tests that a non-member is not served a member's cached Team_Get
+        """
+        with requests_mock.Mocker() as m:
+            pool = self.pool(m)
+            member = pool.call("a", "Team_Get", 1)
+            other = pool.call("b", "Team_Get", 1)
+            pool.close()
+
+        self.assertEqual(member.teamId, 1)
+        self.assertIsNone(other)
+        self.assertEqual(self.api.count("Team_Get"), 2)
+
+    def test_token_expiry(self):
+        """
+        Tests that expired tokens are renewed
+        """
+        with requests_mock.Mocker() as m:
+            pool = self.pool(m, token_ttl=0)
+            pool.client("a")
+            pool.client("a")
+
+        self.assertEqual(self.api.count("Auth_GetUserToken"), 2)
+
+    def test_round_robin(self):
+        """
+        Tests that queued work is taken from accounts in turn
+        """
+        order = []
+        started = threading.Event()
+        release = threading.Event()
+
+        with requests_mock.Mocker() as m:
+            pool = self.pool(m, max_workers=1)
+            pool.client("a"), pool.client("b")
+
+            pool.submit("a", lambda tc: started.set() or release.wait(5))
+            started.wait(5)
+            futures = [pool.submit("a", lambda tc, i=i: order.append(("a", i))) for i in range(4)]
+            futures += [pool.submit("b", lambda tc, i=i: order.append(("b", i))) for i in range(2)]
+            release.set()
+
+            for future in futures:
+                future.result(timeout=5)
+
+            pool.close()
+
+        self.assertEqual(order, [("a", 0), ("b", 0), ("a", 1), ("b", 1), ("a", 2), ("a", 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import pstats
+import tempfile
+import threading
+import tracemalloc
+import unittest
+import requests_mock
+
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException
+from teamcowboyapi.tc_profile import Profiler
+
+import fixtures
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = fixtures.FakeApi(
+            Team_Get=lambda params: fixtures.team(int(params["teamId"])),
+            Team_GetEvents=lambda params: [fixtures.event(eventId) for eventId in range(1, 21)],
+        )
+
+    def test_sampling_and_dump(self):
+        """
+        Tests that 1 in N calls of each method is profiled and written out
+        with its allocations
+        """
+        samples = []
+
+        with tempfile.TemporaryDirectory() as directory, requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api, profiler=Profiler(every=3, directory=directory,
+                                                                callback=samples.append, memory=True))
+
+            for _ in range(4):
+                tc.Team_GetEvents(1)
+                tc.Team_Get(1)
+
+            files = sorted(path.name for path in tc.profiler.directory.iterdir())
+            stats = pstats.Stats(str(tc.profiler.directory / files[0]))
+
+        self.assertEqual([(sample.index, sample.method) for sample in samples],
+                            [(0, "Team_GetEvents"), (0, "Team_Get"), (3, "Team_GetEvents"), (3, "Team_Get")])
+        self.assertEqual(files, [f"{method}-{index:08d}.{kind}" for method in ("Team_Get", "Team_GetEvents")
+                                    for index in (0, 3) for kind in ("pstats", "tracemalloc")])
+        self.assertTrue(any(name == "__post_init__" for _, _, name in stats.stats))
+        self.assertTrue(samples[0].peak > 0 and samples[0].snapshot.traces)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_method_filter_and_errors(self):
+        """
+        Tests that only listed methods are sampled and failing calls are recorded
+        """
+        samples = []
+
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            tc.profiler = Profiler(every=1, callback=samples.append, methods=("Team_Get",))
+            tc.Team_GetEvents(1)
+            m.get(fixtures.URL, status_code=500)
+
+            with self.assertRaises(TheTeamCowboyAPIException):
+                tc.Team_Get(1)
+
+            self.api.install(m)
+            tc.profiler = None
+            tc.Team_GetEvents(1)
+
+        self.assertEqual([(sample.method, sample.failed, sample.snapshot) for sample in samples],
+                            [("Team_Get", True, None)])
+
+    def test_filtered_method_sampled_between_others(self):
+        """
+        Tests that a listed method interleaved with other calls is sampled at
+        its own rate
+        """
+        samples = []
+        profiler = Profiler(every=2, callback=samples.append, methods=("B",))
+
+        for _ in range(4):
+            profiler.call("A", lambda: None)
+            profiler.call("B", lambda: None)
+
+        self.assertEqual([(sample.index, sample.method) for sample in samples], [(0, "B"), (2, "B")])
+
+    def test_one_profile_at_a_time(self):
+        """
+        Tests that a sampled call on another thread runs plainly while one is
+        being profiled
+        """
+        samples = []
+        results = []
+        profiler = Profiler(every=1, callback=samples.append)
+        entered, release = threading.Event(), threading.Event()
+
+        def slow():
+            entered.set()
+            release.wait(5)
+            return "slow"
+
+        thread = threading.Thread(target=lambda: results.append(profiler.call("A", slow)))
+        thread.start()
+        entered.wait(5)
+
+        try:
+            results.append(profiler.call("B", lambda: "fast"))
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(results, ["fast", "slow"])
+        self.assertEqual([sample.method for sample in samples], ["A"])
+
+        profiler.call("B", lambda: None)
+        self.assertEqual([sample.method for sample in samples], ["A", "B"])
+
+    def test_every_must_be_positive(self):
+        """
+        Tests that a sampling rate below 1 is refused
+        """
+        for every in (0, -1):
+            with self.subTest(every=every), self.assertRaises(ValueError):
+                Profiler(every=every)
+
+
+if __name__ == '__main__':
+    unittest.main()
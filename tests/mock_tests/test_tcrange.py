@@ -0,0 +1,69 @@
+import unittest
+from datetime import date, timedelta
+import requests_mock
+
+from teamcowboyapi.tc_range import fetch_range
+
+import fixtures
+
+
+class TestRange(unittest.TestCase):
+    def setUp(self) -> None:
+        day = date(2024, 1, 1)
+        self.starts = {}
+
+        # One event a week for two years, a busy week in March 2025 and a
+        # tournament day with more events than a page
+        for eventId in range(1, 105):
+            self.starts[eventId] = f"{day + timedelta(weeks=eventId - 1)} 18:00:00"
+        for eventId in range(200, 212):
+            self.starts[eventId] = f"2025-03-{3 + (eventId - 200) % 5:02d} 10:00:00"
+        for eventId in range(300, 309):
+            self.starts[eventId] = f"2025-06-14 {8 + eventId - 300:02d}:00:00"
+
+        self.api = fixtures.FakeApi(Team_GetEvents=self.team_events, User_GetTeamEvents=self.user_events)
+
+    def within(self, params: dict) -> list:
+        return sorted((start, eventId) for eventId, start in self.starts.items()
+                        if params["startDateTime"] <= start <= params["endDateTime"])
+
+    def team_events(self, params: dict) -> list:
+        offset, qty = int(params.get("offset", 0)), int(params["qty"])
+        return [fixtures.event(eventId, start=start) for start, eventId in self.within(params)[offset:offset + qty]]
+
+    def user_events(self, params: dict) -> list:
+        # The server also returns an event outside the window, which must not repeat
+        return [fixtures.event(eventId, start=start) for start, eventId in self.within(params)] + \
+                [fixtures.event(1, start=self.starts[1])]
+
+    def test_team_range(self):
+        """
+        Tests that full windows are split or paged and the merged stream is sorted
+        """
+        with requests_mock.Mocker() as m:
+            events = list(fetch_range(fixtures.client(m, self.api), "2024-01-01", "2025-12-31", teamId=1,
+                                        window_days=60, page_size=5))
+
+        expected = [eventId for _, eventId in sorted((start, eventId) for eventId, start in self.starts.items())]
+        self.assertEqual([event.eventId for event in events], expected)
+
+        windows = [(p["startDateTime"], p["endDateTime"]) for method, p in self.api.calls if method == "Team_GetEvents"]
+        self.assertIn(("2025-06-14 00:00:00", "2025-06-14 23:59:59"), windows)
+        self.assertTrue(all(params["filter"] == "specificDates" for method, params in self.api.calls
+                            if method == "Team_GetEvents"))
+
+    def test_user_range(self):
+        """
+        Tests the User_GetTeamEvents path and eventId dedupe
+        """
+        with requests_mock.Mocker() as m:
+            events = list(fetch_range(fixtures.client(m, self.api), date(2024, 1, 1), date(2024, 6, 30)))
+
+        eventIds = [event.eventId for event in events]
+        self.assertEqual(len(eventIds), len(set(eventIds)))
+        self.assertEqual(sorted(eventIds), [eventId for eventId, start in self.starts.items() if start < "2024-07"])
+        self.assertEqual(self.api.count("User_GetTeamEvents"), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_roster import RosterHistory
+
+import fixtures
+
+
+class TestRoster(unittest.TestCase):
+    def setUp(self) -> None:
+        self.users = [fixtures.user(7), fixtures.user(8, firstName="Sam", gender="m")]
+        self.api = fixtures.FakeApi(Team_GetRoster=lambda params: self.users)
+
+    def test_history(self):
+        """
+        Tests that joins, leaves and member type changes are recorded as deltas and replayed
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "roster.jsonl")
+            history = RosterHistory(1, path=path, checkpoint_every=2)
+
+            with requests_mock.Mocker() as m:
+                tc = fixtures.client(m, self.api)
+                history.attach(tc)
+
+                tc.Team_GetRoster(1)
+                tc.Team_GetRoster(1)
+                self.users = [fixtures.user(7, teamMemberType="sub"), fixtures.user(9, firstName="Lee")]
+                tc.Team_GetRoster(1)
+                self.users = [fixtures.user(7, teamMemberType="sub")]
+                tc.Team_GetRoster(1)
+                tc.Team_GetRoster(1, userId=7)
+
+            self.assertEqual(len(history), 3)
+
+            diff = history.deltas[1]
+            self.assertEqual(list(diff.added), [9])
+            self.assertEqual(diff.removed[8]["firstName"], "Sam")
+            self.assertEqual(diff.changed[7], {"teamMemberType": ("player", "sub"),
+                                                "teamMemberTypeTitle": ("Player", "Sub")})
+
+            reopened = RosterHistory(1, path=path, checkpoint_every=2)
+
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(sorted(reopened.snapshot(0).records), [7, 8])
+        self.assertEqual(sorted(reopened.snapshot(1).records), [7, 9])
+        self.assertEqual(sorted(reopened.latest.records), [7])
+        self.assertEqual(reopened.deltas[1].removed[8]["firstName"], "Sam")
+        self.assertEqual([kind for _, kind, _ in reopened.user_history(9)], ["added", "removed"])
+        self.assertEqual(len(reopened.snapshot("2000-01-01 00:00:00")), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
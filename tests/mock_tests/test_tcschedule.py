@@ -0,0 +1,97 @@
+import random
+import unittest
+import requests_mock
+
+from teamcowboyapi import Event
+from teamcowboyapi.tc_schedule import IntervalTree, ScheduleIndex
+
+import fixtures
+
+
+class TestIntervalTree(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """
+        Tests overlap queries against a linear scan through inserts and deletes
+        """
+        rng = random.Random(7)
+        tree = IntervalTree()
+        intervals = {}
+
+        for key in range(2000):
+            start = rng.uniform(0, 10000)
+            intervals[key] = (start, start + rng.uniform(1, 200))
+            tree.insert(*intervals[key], key)
+
+        for key in rng.sample(sorted(intervals), 700):
+            tree.remove(key)
+            del intervals[key]
+
+        for _ in range(200):
+            start = rng.uniform(0, 10000)
+            end = start + rng.uniform(1, 300)
+            expected = {key for key, (s, e) in intervals.items() if s < end and e > start}
+            self.assertEqual({key for _, _, key, _ in tree.overlapping(start, end)}, expected)
+
+        self.assertEqual(len(tree), 1300)
+
+
+class TestScheduleIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events = {
+            1: [fixtures.event(1, "2026-05-01 18:00:00", "2026-05-01 20:00:00", teamId=1, locationId=10),
+                fixtures.event(2, "2026-05-02 18:00:00", "2026-05-02 20:00:00", teamId=1, locationId=10)],
+            2: [fixtures.event(3, "2026-05-01 19:00:00", "2026-05-01 21:00:00", teamId=2, locationId=11),
+                fixtures.event(4, "2026-05-02 20:00:00", "2026-05-02 22:00:00", teamId=2, locationId=10)],
+            3: [fixtures.event(5, "2026-05-02 19:00:00", "2026-05-02 21:00:00", teamId=3, locationId=10)],
+        }
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=lambda params: self.events[int(params["teamId"])],
+            Team_GetRoster=lambda params: [fixtures.user(7)],
+        )
+
+    def build(self, m) -> ScheduleIndex:
+        schedule = ScheduleIndex()
+        tc = fixtures.client(m, self.api)
+        schedule.attach(tc)
+
+        for teamId in (1, 2, 3):
+            tc.Team_GetEvents(teamId)
+
+        tc.Team_GetRoster(1)
+        tc.Team_GetRoster(2)
+        return schedule
+
+    def ids(self, pairs) -> list:
+        return [(first.eventId, second.eventId) for first, second in pairs]
+
+    def test_user_and_location_conflicts(self):
+        """
+        Tests that conflicts are found per user across teams and per location
+        """
+        with requests_mock.Mocker() as m:
+            schedule = self.build(m)
+
+        self.assertEqual(self.ids(schedule.user_conflicts(7)), [(1, 3)])
+        self.assertEqual(self.ids(schedule.location_conflicts(10)), [(2, 5), (5, 4)])
+        self.assertEqual(self.ids(schedule.user_conflicts(8)), [])
+
+    def test_incremental_updates(self):
+        """
+        Tests that moved and canceled events are reindexed
+        """
+        with requests_mock.Mocker() as m:
+            schedule = self.build(m)
+
+        moved = fixtures.event(3, "2026-05-01 20:00:00", "2026-05-01 22:00:00", teamId=2, locationId=11)
+        schedule.add_event(Event(**moved))
+        self.assertEqual(self.ids(schedule.user_conflicts(7)), [])
+
+        canceled = fixtures.event(5, "2026-05-02 19:00:00", "2026-05-02 21:00:00", teamId=3, locationId=10)
+        canceled["status"] = "canceled"
+        schedule.add_event(Event(**canceled))
+        self.assertEqual(self.ids(schedule.location_conflicts()), [])
+        self.assertEqual(len(schedule), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
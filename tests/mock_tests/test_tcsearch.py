@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_search import TCIndex
+
+import fixtures
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.messages = [
+            fixtures.message(1, title="Practice moved", body="Practice is moved to the north field",
+                                comments=[fixtures.comment(11, 1, text="See you at the field")]),
+            fixtures.message(2, title="Sharks game", body="Game on Saturday against the Sharks"),
+            fixtures.message(3, title="Fees", body="Season fees are due", teamId=2),
+        ]
+        self.api = fixtures.FakeApi(
+            Team_GetMessages=lambda params: self.messages,
+            Message_Delete=lambda params: {"deleted": True},
+        )
+
+    def build(self, m) -> TCIndex:
+        index = TCIndex()
+        tc = fixtures.client(m, self.api)
+        index.attach(tc)
+        tc.Team_GetMessages(1)
+        return index
+
+    def ids(self, hits) -> list:
+        return [(hit.messageId, hit.commentId) for hit in hits]
+
+    def test_queries(self):
+        """
+        Tests term, prefix and phrase queries and the team filter
+        """
+        with requests_mock.Mocker() as m:
+            index = self.build(m)
+
+        self.assertEqual(self.ids(index.search("practice")), [(1, None)])
+        self.assertEqual(set(self.ids(index.search("field"))), {(1, None), (1, 11)})
+        self.assertEqual(self.ids(index.search("shar*")), [(2, None)])
+        self.assertEqual(self.ids(index.search('"game on saturday"')), [(2, None)])
+        self.assertEqual(self.ids(index.search('"saturday game"')), [])
+        self.assertEqual(self.ids(index.search("fees")), [(3, None)])
+        self.assertEqual(self.ids(index.search("fees", teamId=1)), [])
+
+    def test_phrase_does_not_span_fields(self):
+        """
+        Tests that a phrase does not match across the title and body
+        """
+        with requests_mock.Mocker() as m:
+            index = self.build(m)
+
+        self.assertEqual(self.ids(index.search('"moved practice"')), [])
+        self.assertEqual(self.ids(index.search('"moved to"')), [(1, None)])
+
+    def test_incremental_and_persisted(self):
+        """
+        Tests that deletes and updates apply to a saved and reopened index
+        """
+        with requests_mock.Mocker() as m:
+            index = self.build(m)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "messages.idx")
+                index.save(path)
+
+                reopened = TCIndex(path)
+                self.assertEqual(len(reopened), 4)
+                self.assertEqual(self.ids(reopened.search('"north field"')), [(1, None)])
+
+                tc = fixtures.client(m, self.api)
+                reopened.attach(tc)
+                tc.Message_Delete(1, 1)
+                self.messages = [fixtures.message(2, title="Sharks game", body="Game moved to Sunday")]
+                tc.Team_GetMessages(1)
+
+                self.assertEqual(self.ids(reopened.search("field")), [])
+                self.assertEqual(self.ids(reopened.search("saturday")), [])
+                self.assertEqual(self.ids(reopened.search("moved")), [(2, None)])
+                self.assertEqual(len(reopened), 2)
+
+                reopened.save(path)
+                reopened.close()
+
+                again = TCIndex(path)
+                self.assertEqual(self.ids(again.search("sun*")), [(2, None)])
+                again.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_store import TCStore
+from teamcowboyapi.objects.events import Event
+
+import fixtures
+
+
+class TestTCStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = TCStore()
+        self.api = fixtures.FakeApi(
+            Team_Get=lambda params: fixtures.team(),
+            Team_GetSeasons=lambda params: [fixtures.season()],
+            Team_GetEvents=lambda params: [fixtures.event(1, start="2026-05-01 18:00:00"),
+                                            fixtures.event(2, start="2026-06-01 18:00:00")],
+            Team_GetRoster=lambda params: [fixtures.user(7), fixtures.user(8)],
+            Event_GetAttendanceList=lambda params: fixtures.attendance([(7, "yes", "f", "player"),
+                                                                        (8, "no", "m", "sub")]),
+            Team_GetMessages=lambda params: [fixtures.message(5)],
+            Message_Delete=lambda params: True,
+            Event_SaveRSVP=lambda params: {"rsvpSaved": True, "statusCode": "ok"},
+        )
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_fetches_keep_store_fresh(self):
+        """
+        Tests that fetch methods write through to an attached store
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            self.store.attach(tc)
+
+            tc.Team_Get(1)
+            tc.Team_GetSeasons(1)
+            tc.Team_GetEvents(1)
+            tc.Team_GetRoster(1)
+            tc.Event_GetAttendanceList(1, 1)
+            tc.Team_GetMessages(1)
+
+        self.assertEqual(self.store.team(1).teamId, 1)
+        self.assertEqual([season.seasonId for season in self.store.seasons(1)], [1])
+        self.assertEqual([user.userId for user in self.store.roster(1)], [7, 8])
+        self.assertEqual([msg.messageId for msg in self.store.messages(1)], [5])
+
+        events = self.store.events(1, "2026-05-01 00:00:00", "2026-05-31 23:59:59")
+        self.assertEqual([event.eventId for event in events], [1])
+        self.assertIsInstance(events[0], Event)
+
+        rsvps = self.store.rsvps_by_user(8)
+        self.assertEqual([(rsvp.eventId, rsvp.status) for rsvp in rsvps], [(1, "no")])
+        self.assertEqual(rsvps[0].startDateTimeLocal, "2026-05-01 18:00:00")
+
+    def test_writes_and_deletes(self):
+        """
+        Tests that saved RSVPs and deleted messages update the store
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            self.store.attach(tc)
+
+            tc.Team_GetMessages(1)
+            tc.Message_Delete(1, 5)
+            tc.Event_SaveRSVP(1, 1, "maybe")
+
+        self.assertEqual(self.store.messages(1), [])
+        self.assertEqual([rsvp.status for rsvp in self.store.rsvps_by_user(1)], ["maybe"])
+
+    def test_upsert_replaces(self):
+        """
+        Tests that upserting an event twice keeps one, updated row
+        """
+        self.store.upsert_events([Event(**fixtures.event(1, updated="2026-04-01 00:00:00"))])
+        self.store.upsert_events([Event(**fixtures.event(1, updated="2026-04-02 00:00:00"))])
+
+        self.assertEqual(self.store.event(1).dateLastUpdatedUtc, "2026-04-02 00:00:00")
+        self.assertEqual(len(self.store.events(1)), 1)
@@ -0,0 +1,89 @@
+import json
+import unittest
+import requests_mock
+
+from teamcowboyapi import TCDataAdapter
+from teamcowboyapi.exceptions import TheTeamCowboyAPIException
+from teamcowboyapi.tc_stream import iter_attendance, iter_events, iterarray
+
+import fixtures
+
+
+URL = 'https://api.teamcowboy.com/v1/'
+
+
+def chunks(document: dict, size: int = 1) -> list:
+    data = json.dumps(document, ensure_ascii=False).encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArray(unittest.TestCase):
+    def test_split_anywhere(self):
+        """
+        Tests parsing a document fed one byte at a time, including split
+        multibyte characters and numbers
+        """
+        document = {"success": True, "requestSecs": 0.01234, "body": [{"title": "Café ☕", "n": 12345}, [], 7, 123456]}
+        rest = {}
+
+        self.assertEqual(list(iterarray(chunks(document), rest=rest)), document["body"])
+        self.assertEqual(rest, {"success": True, "requestSecs": 0.01234})
+
+    def test_nested_path(self):
+        """
+        Tests streaming a list nested inside the body
+        """
+        document = {"success": True, "body": {"meta": {"a": [1, 2]}, "users": [{"u": 1}, {"u": 2}], "x": None}}
+        rest = {}
+
+        self.assertEqual(list(iterarray(chunks(document, 5), path=("body", "users"), rest=rest)), [{"u": 1}, {"u": 2}])
+        self.assertEqual(rest["meta"], {"a": [1, 2]})
+
+    def test_truncated_raises(self):
+        """
+        Tests that a cut off document raises after the complete elements
+        """
+        data = json.dumps({"body": [{"a": 1}, {"a": 2}]}).encode()[:-8]
+        items = iterarray([data])
+
+        self.assertEqual(next(items), {"a": 1})
+        with self.assertRaises(TheTeamCowboyAPIException):
+            next(items)
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api = fixtures.FakeApi(
+            Team_GetEvents=lambda params: [fixtures.event(eventId) for eventId in range(1, 51)],
+            Event_GetAttendanceList=lambda params: fixtures.attendance([(7, "yes", "f", "player"),
+                                                                        (8, "no", "m", "sub")]),
+        )
+
+    def test_iter_models(self):
+        """
+        Tests building events and attendance entries from streamed responses
+        """
+        with requests_mock.Mocker() as m:
+            tc = fixtures.client(m, self.api)
+            events = list(iter_events(tc, 1, qty=50))
+            attendance = list(iter_attendance(tc, 1, 2))
+            missing = list(tc.stream("Message_Get", teamId=1, messageId=3))
+
+        self.assertEqual([event.eventId for event in events], list(range(1, 51)))
+        self.assertEqual([(entry.user.userId, entry.rsvpInfo.status) for entry in attendance], [(7, "yes"), (8, "no")])
+        self.assertEqual(missing, [])
+
+    def test_server_error_raises(self):
+        """
+        Tests that a 5xx error body raises once the response is read
+        """
+        adapter = TCDataAdapter()
+
+        with requests_mock.Mocker() as m:
+            m.get(URL, json={"success": False, "body": {"errorCode": "Error", "httpResponse": 500, "message": "Oops"}})
+            with self.assertRaises(TheTeamCowboyAPIException):
+                list(adapter.get_stream(endpoint='', ep_params={"method": "Team_GetEvents"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
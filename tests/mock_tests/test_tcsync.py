@@ -0,0 +1,94 @@
+import unittest
+import requests_mock
+
+from teamcowboyapi.tc_sync import TeamSync
+
+import fixtures
+
+
+class TestTeamSync(unittest.TestCase):
+    def setUp(self) -> None:
+        self.messages = [fixtures.message(3, updated="2026-04-03 00:00:00"),
+                            fixtures.message(2, updated="2026-04-02 00:00:00"),
+                            fixtures.message(1, updated="2026-04-01 00:00:00")]
+        self.events = [fixtures.event(1, start="2026-05-01 18:00:00"),
+                        fixtures.event(2, start="2026-05-08 18:00:00")]
+
+        def messages(params):
+            offset, qty = int(params["offset"]), int(params["qty"])
+            return self.messages[offset:offset + qty]
+
+        self.api = fixtures.FakeApi(Team_GetMessages=messages,
+                                    Team_GetEvents=lambda params: self.events,
+                                    Team_GetRoster=lambda params: [fixtures.user(7)],
+                                    Team_Get=lambda params: fixtures.team())
+
+    def test_messages_stop_at_watermark(self):
+        """
+        Tests that a second message sync only pages until the watermark
+        """
+        with requests_mock.Mocker() as m:
+            sync = TeamSync(fixtures.client(m, self.api), 1, page_size=1)
+
+            first = sync.sync_messages()
+            self.assertEqual(len(first.inserted), 3)
+            self.assertEqual(sync.replica.watermarks["messages"], "2026-04-03 00:00:00")
+
+            self.messages.insert(0, fixtures.message(4, updated="2026-04-04 00:00:00"))
+            self.api.calls.clear()
+            second = sync.sync_messages()
+
+        self.assertEqual([msg.messageId for msg in second.inserted], [4])
+        self.assertFalse(second.updated)
+        # pages: message 4, message 3 (at watermark), message 2 (older, stop)
+        self.assertEqual(self.api.count("Team_GetMessages"), 3)
+
+    def test_full_message_sync_finds_deletes(self):
+        """
+        Tests that a full pass reports messages that disappeared
+        """
+        with requests_mock.Mocker() as m:
+            sync = TeamSync(fixtures.client(m, self.api), 1)
+            sync.sync_messages()
+            del self.messages[1]
+            changes = sync.sync_messages(full=True)
+
+        self.assertEqual([msg.messageId for msg in changes.deleted], [2])
+        self.assertNotIn(2, sync.replica.messages)
+
+    def test_events_window(self):
+        """
+        Tests inserted, updated and deleted events within a date window
+        """
+        window = ("2026-05-01 00:00:00", "2026-05-31 23:59:59")
+
+        with requests_mock.Mocker() as m:
+            sync = TeamSync(fixtures.client(m, self.api), 1)
+            self.assertEqual(len(sync.sync_events(*window).inserted), 2)
+
+            self.events = [fixtures.event(2, start="2026-05-08 18:00:00", updated="2026-04-05 00:00:00"),
+                            fixtures.event(3, start="2026-05-15 18:00:00")]
+            changes = sync.sync_events(*window)
+
+            _, params = self.api.calls[-1]
+
+        self.assertEqual(params["filter"], "specificDates")
+        self.assertEqual([e.eventId for e in changes.inserted], [3])
+        self.assertEqual([e.eventId for e in changes.updated], [2])
+        self.assertEqual([e.eventId for e in changes.deleted], [1])
+        self.assertEqual(sorted(sync.replica.events), [2, 3])
+
+    def test_sync_team_and_roster(self):
+        """
+        Tests that unchanged team and roster data produce empty change sets
+        """
+        with requests_mock.Mocker() as m:
+            sync = TeamSync(fixtures.client(m, self.api), 1)
+            first = sync.sync()
+            second = sync.sync()
+
+        self.assertTrue(first["team"])
+        self.assertTrue(first["roster"])
+        self.assertFalse(second["team"])
+        self.assertFalse(second["roster"])
+        self.assertNotIn("events", second)
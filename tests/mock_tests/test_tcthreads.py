@@ -0,0 +1,52 @@
+import time
+import unittest
+import requests_mock
+
+from teamcowboyapi import tc_deadline
+from teamcowboyapi.tc_threads import load_threads
+
+import fixtures
+
+
+class TestThreads(unittest.TestCase):
+    def setUp(self) -> None:
+        self.comments = {1: [], 2: [fixtures.comment(1, 2)], 3: [fixtures.comment(2, 3), fixtures.comment(3, 3)]}
+        self.api = fixtures.FakeApi(
+            Team_GetMessages=lambda params: [self.summary(messageId) for messageId in self.comments],
+            Message_Get=lambda params: fixtures.message(int(params["messageId"]),
+                                                        comments=self.comments[int(params["messageId"])]),
+        )
+
+    def summary(self, messageId: int) -> dict:
+        message = fixtures.message(messageId, comments=self.comments[messageId])
+        del message["comments"]
+        return message
+
+    def test_load_threads(self):
+        """
+        Tests that comments are loaded only for messages that have them
+        """
+        with requests_mock.Mocker() as m:
+            threads = {message.messageId: message for message in load_threads(fixtures.client(m, self.api), 1)}
+
+        self.assertEqual({messageId: [comment.comment for comment in message.comments]
+                            for messageId, message in threads.items()},
+                            {1: [], 2: ["Nice"], 3: ["Nice", "Nice"]})
+        self.assertEqual(self.api.count("Message_Get"), 2)
+        self.assertTrue(all(params["loadComments"] == "true" for method, params in self.api.calls
+                            if method == "Message_Get"))
+
+    def test_stream_completion_order(self):
+        """
+        Tests that stream yields results as they complete
+        """
+        def work(delay):
+            time.sleep(delay)
+            return delay
+
+        self.assertEqual(list(tc_deadline.stream(work, [0.2, 0.0, 0.1], max_workers=3)),
+                            [(1, 0.0), (2, 0.1), (0, 0.2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+import requests_mock
+from datetime import datetime, timedelta, timezone
+
+from teamcowboyapi import tc_decode
+from teamcowboyapi.tc_watcher import Watcher
+
+import fixtures
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rsvps = [(7, "yes", "f", "player"), (8, "noresponse", "m", "player")]
+        self.events = [fixtures.event(1), fixtures.event(2)]
+        self.api = fixtures.FakeApi(
+            Event_Get=lambda params: fixtures.event(int(params["eventId"])),
+            Event_GetAttendanceList=lambda params: fixtures.attendance(self.rsvps),
+            Team_GetEvents=lambda params: self.events,
+        )
+
+    def test_event_deltas(self):
+        """
+        Tests that only changed RSVPs are reported and unchanged polls are not decoded
+        """
+        deltas = []
+
+        with requests_mock.Mocker() as m, mock.patch.object(tc_decode, "decode", wraps=tc_decode.decode) as decode:
+            watcher = Watcher(fixtures.client(m, self.api))
+            watch = watcher.watch_event(1, 1, deltas.append)
+
+            watcher.poll(watch)
+            watcher.poll(watch)
+
+            self.rsvps = [(7, "yes", "f", "player"), (8, "maybe", "m", "player"), (9, "no", "m", "sub")]
+            watcher.poll(watch)
+
+        self.assertEqual(decode.call_count, 2)
+
+        self.assertEqual(len(deltas), 2)
+        self.assertEqual(len(deltas[0].added), 2)
+
+        self.assertEqual([entry.user.userId for entry in deltas[1].added], [9])
+        self.assertEqual([(change.userId, change.old.status, change.new.status) for change in deltas[1].changed],
+                            [(8, "noresponse", "maybe")])
+        self.assertFalse(deltas[1].removed)
+        self.assertEqual(self.api.count("Event_Get"), 1)
+
+    def test_team_deltas(self):
+        """
+        Tests that added, updated and removed events are reported
+        """
+        deltas = []
+
+        with requests_mock.Mocker() as m:
+            watcher = Watcher(fixtures.client(m, self.api))
+            watch = watcher.watch_team(1, deltas.append)
+
+            watcher.poll(watch)
+            self.events = [fixtures.event(2, updated="2026-04-02 00:00:00"), fixtures.event(3)]
+            watcher.poll(watch)
+
+        changes = deltas[1].changes
+        self.assertEqual([event.eventId for event in changes.inserted], [3])
+        self.assertEqual([event.eventId for event in changes.updated], [2])
+        self.assertEqual([event.eventId for event in changes.deleted], [1])
+
+    def test_digest_ignores_request_time(self):
+        """
+        Tests that bodies differing only in requestSecs count as unchanged
+        """
+        digest = Watcher._digest(b'{"success": true, "requestSecs": 0.012, "body": []}')
+
+        self.assertEqual(Watcher._digest(b'{"success": true, "requestSecs": 1.5e-3, "body": []}'), digest)
+        self.assertNotEqual(Watcher._digest(b'{"success": true, "requestSecs": 0.012, "body": [1]}'), digest)
+
+    def test_last_rsvps_removed(self):
+        """
+        Tests that going from some users to none is reported, and that a body
+        that failed to decode is decoded again on the next poll
+        """
+        deltas = []
+
+        with requests_mock.Mocker() as m:
+            watcher = Watcher(fixtures.client(m, self.api))
+            watch = watcher.watch_event(1, 1, deltas.append)
+            watcher.poll(watch)
+
+            self.rsvps = []
+
+            with mock.patch.object(tc_decode, "decode", side_effect=ValueError("bad body")):
+                with self.assertRaises(ValueError):
+                    watcher._poll_event(watch)
+
+            watcher.poll(watch)
+            watcher.poll(watch)
+
+        self.assertEqual(len(deltas), 2)
+        self.assertEqual(sorted(entry.user.userId for entry in deltas[1].removed), [7, 8])
+        self.assertFalse(deltas[1].added or deltas[1].changed)
+        self.assertEqual(watch.state, {})
+
+    def test_interval_adapts_to_start(self):
+        """
+        Tests that polls get more frequent as the event start approaches
+        """
+        watcher = Watcher(None, min_interval=30, max_interval=3600, ratio=0.05)
+        now = datetime.now(timezone.utc)
+
+        self.assertEqual(watcher.interval_for(None), 3600)
+        self.assertEqual(watcher.interval_for(now + timedelta(days=3)), 3600)
+        self.assertAlmostEqual(watcher.interval_for(now + timedelta(hours=2)), 360, delta=1)
+        self.assertEqual(watcher.interval_for(now + timedelta(minutes=5)), 30)
+        self.assertEqual(watcher.interval_for(now - timedelta(hours=1)), 3600)